@@ -0,0 +1,86 @@
+"""
+Benchmark of request body compression: bytes on the wire and scan latency
+across payload sizes, uncompressed and with every available encoding.
+
+Scans are sent to a local Apex emulator, so the loopback latency only shows the
+cost of compressing and decompressing. The transfer time of the bytes on the
+wire over slower links is estimated on top of it.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_compression.py
+"""
+
+import random
+import statistics
+import time
+from typing import List, Optional
+
+from acuvity import Acuvity, RequestCompression, Security
+from acuvity.compression import compress
+from acuvity.emulator import ApexEmulator, EmulatorConfig
+
+ROUNDS = 20
+
+PAYLOAD_SIZES = [1 << 10, 16 << 10, 256 << 10, 1 << 20, 4 << 20]
+
+# link speeds in Mbit/s to estimate the transfer time over
+LINKS = [10, 100]
+
+WORDS = ["the", "user", "asked", "about", "invoice", "number", "payment", "account", "please", "summarize", "report", "quarter"]
+
+RESPONSE = {"principal": {"type": "App"}, "decision": "Allow", "extractions": [{"data": "ok"}]}
+
+
+def conversation(size: int) -> List[str]:
+    rng = random.Random(0)
+    text = " ".join(rng.choice(WORDS) for _ in range(size // 5))[:size]
+    return [text[i:i + 4096] for i in range(0, len(text), 4096)]
+
+
+def available_encodings() -> List[Optional[str]]:
+    encodings: List[Optional[str]] = [None, "gzip"]
+    try:
+        compress(b"", "zstd")
+        encodings.append("zstd")
+    except ImportError:
+        pass
+    return encodings
+
+
+def wire_bytes(client: Acuvity, messages: List[str], encoding: Optional[str]) -> int:
+    build = client.apex._ApexExtended__build_scan_request # pylint: disable=protected-access
+    body = build(*messages).model_dump_json(by_alias=True, exclude_none=True).encode()
+    return len(compress(body, encoding)) if encoding else len(body)
+
+
+def main() -> None:
+    header = f"{'payload':>9} {'encoding':>9} {'wire bytes':>11} {'ratio':>6} {'loopback p50':>13}"
+    header += "".join(f" {f'{link} Mbit/s':>12}" for link in LINKS)
+    print(header)
+
+    with ApexEmulator(EmulatorConfig(responses=[RESPONSE])) as apex:
+        for size in PAYLOAD_SIZES:
+            messages = conversation(size)
+            raw = None
+            for encoding in available_encodings():
+                compression = RequestCompression(encoding, threshold=0) if encoding else None
+                client = Acuvity(security=Security(token="token"), server_url=apex.url, retry_config=None, request_compression=compression)
+                client.apex.scan(*messages, guard_config=[])
+
+                latencies = []
+                for _ in range(ROUNDS):
+                    start = time.perf_counter()
+                    client.apex.scan(*messages, guard_config=[])
+                    latencies.append(time.perf_counter() - start)
+                p50 = statistics.median(latencies)
+
+                wire = wire_bytes(client, messages, encoding)
+                raw = raw or wire
+                line = f"{size >> 10:>6}KiB {encoding or 'none':>9} {wire:>11} {wire / raw:>6.2f} {p50 * 1e3:>10.2f} ms"
+                line += "".join(f" {(p50 + wire * 8 / (link * 1e6)) * 1e3:>9.2f} ms" for link in LINKS)
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark of the debug logging on the request path: time of a scan with a large
+file, and peak of the memory allocated on the request path, from the serialized
+request to the parsed response. It is measured with the no-op logger, whose log
+arguments are not built anymore, and with a logger taking debug messages, for
+which they are built as they used to be for every logger.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_debug_logging.py
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import httpx
+
+from acuvity import Acuvity, Security
+from acuvity._hooks.types import BeforeRequestHook
+from acuvity.utils.logger import NoOpLogger
+
+ROUNDS = 5
+
+FILE_SIZES = [1 << 20, 8 << 20, 32 << 20]
+
+RESPONSE = {"principal": {"type": "App"}, "decision": "Allow", "extractions": [{"data": "ok"}]}
+
+
+class ResetPeakHook(BeforeRequestHook):
+    """Starts measuring the peak allocations when the request is about to be sent"""
+
+    def __init__(self):
+        self.baseline = 0
+
+    def before_request(self, hook_ctx, request):
+        tracemalloc.reset_peak()
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        return request
+
+
+class DiscardingLogger:
+    def debug(self, msg, *args, **kwargs):
+        pass
+
+
+def make_client(logger) -> Acuvity:
+    return Acuvity(
+        security=Security(token="token"),
+        server_url="https://apex.bench",
+        client=httpx.Client(transport=httpx.MockTransport(lambda _: httpx.Response(200, json=RESPONSE))),
+        retry_config=None,
+        debug_logger=logger,
+    )
+
+
+def measure(client: Acuvity, path: str):
+    client.apex.scan(files=path, guard_config=[])
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        client.apex.scan(files=path, guard_config=[])
+    elapsed = (time.perf_counter() - start) / ROUNDS
+
+    hook = ResetPeakHook()
+    client.sdk_configuration.get_hooks().register_before_request_hook(hook)
+    tracemalloc.start()
+    client.apex.scan(files=path, guard_config=[])
+    peak = tracemalloc.get_traced_memory()[1] - hook.baseline
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    print(f"{'file':>8} {'logger':>8} {'time':>10} {'request path peak':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in FILE_SIZES:
+            path = os.path.join(tmp, f"{size}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(size))
+            for name, logger in (("debug", DiscardingLogger()), ("noop", NoOpLogger())):
+                elapsed, peak = measure(make_client(logger), path)
+                print(f"{size >> 20:>5}MiB {name:>8} {elapsed * 1e3:>7.1f} ms {peak / (1 << 20):>14.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark for ResponseProcessor.matches() on large synthetic extractions.
+
+Compares the previous linear scan of all detections for every (guard, match)
+pair against the per-extraction ExtractionIndex.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_response_processor.py
+"""
+
+import random
+import timeit
+from typing import Dict, List, Optional, Union
+
+from acuvity.guard.config import Guard, GuardConfig, Match
+from acuvity.guard.constants import GuardName
+from acuvity.guard.threshold import Threshold
+from acuvity.models.extraction import Extraction
+from acuvity.models.principal import Principal, PrincipalType
+from acuvity.models.scanresponse import Scanresponse
+from acuvity.models.textualdetection import Textualdetection, TextualdetectionType
+from acuvity.response.helper import ResponseHelper
+from acuvity.response.index import ExtractionIndex
+from acuvity.response.processor import ResponseProcessor
+
+ROUNDS = 5
+PII_NAMES = [f"pii_{i}" for i in range(30)]
+
+
+def legacy_get_text_detections(
+    lookup: Union[Dict[str, float], None],
+    guard: Guard,
+    detection_type: TextualdetectionType,
+    index: Optional[ExtractionIndex],
+    match_name: Optional[str],
+):
+    """The previous implementation: a scan of all detections per match."""
+    if match_name:
+        detections = index.extraction.detections if index is not None else None
+        if not detections:
+            return False, 0, 0, []
+        text_matches = [
+            d.score for d in detections
+            if d.type == detection_type and d.name == match_name and d.score is not None and guard.threshold.compare(d.score)
+        ]
+        count = len(text_matches)
+        if count == 0 and lookup and match_name in lookup:
+            return True, lookup[match_name], 1, [match_name]
+        if count == 0:
+            return False, 0, 0, []
+        return True, max(text_matches), count, [match_name]
+
+    exists = bool(lookup)
+    count = len(lookup) if lookup else 0
+    return exists, 1.0 if exists else 0.0, count, list(lookup.keys()) if lookup else []
+
+
+def scan_response(extractions: int, detections: int) -> Scanresponse:
+    rng = random.Random(0)
+    exts: List[Extraction] = []
+    for _ in range(extractions):
+        dets = [
+            Textualdetection(
+                type=rng.choice([TextualdetectionType.PII, TextualdetectionType.SECRET, TextualdetectionType.KEYWORD]),
+                name=rng.choice(PII_NAMES),
+                score=rng.random(),
+            )
+            for _ in range(detections)
+        ]
+        exts.append(Extraction(
+            data="synthetic",
+            detections=dets,
+            pi_is={name: 0.9 for name in PII_NAMES},
+            exploits={"prompt_injection": 0.2},
+        ))
+    return Scanresponse(principal=Principal(type=PrincipalType.APP), extractions=exts)
+
+
+def guard_config() -> GuardConfig:
+    return GuardConfig([
+        Guard(
+            name=GuardName.PII_DETECTOR,
+            threshold=Threshold(">= 0.5"),
+            matches={name: Match(threshold=Threshold(">= 0.5"), count_threshold=1) for name in PII_NAMES},
+        ),
+        Guard(name=GuardName.PROMPT_INJECTION, threshold=Threshold(">= 0.5"), matches={}),
+    ])
+
+
+def measure(response: Scanresponse, gconfig: GuardConfig, number: int) -> float:
+    """Returns the best per-call time in milliseconds."""
+    def run():
+        ResponseProcessor(response, gconfig).matches()
+    return min(timeit.repeat(run, number=number, repeat=ROUNDS)) / number * 1e3
+
+
+def main() -> None:
+    gconfig = guard_config()
+    indexed = ResponseHelper._get_text_detections # pylint: disable=protected-access
+
+    print(f"{'case':<40} {'before':>12} {'after':>12} {'speedup':>8}")
+    for extractions, detections in ((1, 100), (1, 1000), (1, 10000), (8, 2000)):
+        response = scan_response(extractions, detections)
+        number = max(3, 20000 // (extractions * detections))
+
+        ResponseHelper._get_text_detections = staticmethod(legacy_get_text_detections) # pylint: disable=protected-access
+        before = measure(response, gconfig, number)
+        ResponseHelper._get_text_detections = staticmethod(indexed) # pylint: disable=protected-access
+        after = measure(response, gconfig, number)
+
+        print(f"{f'matches {extractions} x {detections} detections':<40} {before:>10.2f}ms {after:>10.2f}ms {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Microbenchmark for utils.marshal_json / utils.unmarshal_json.
+
+Compares the previous implementation (a pydantic model created with
+create_model() on every call, followed by from_json() and a second validation
+pass) against the cached TypeAdapter path.
+
+Run with:
+
+    PYTHONPATH=src python benchmarks/bench_serializers.py
+"""
+
+import json
+import timeit
+from typing import Any, Callable, List, Optional
+
+from pydantic import ConfigDict, create_model
+from pydantic_core import from_json
+
+from acuvity import models, utils
+
+ROUNDS = 5
+
+
+def legacy_unmarshal_json(raw, typ: Any) -> Any:
+    unmarshaller = create_model(
+        "Unmarshaller",
+        body=(typ, ...),
+        __config__=ConfigDict(populate_by_name=True, arbitrary_types_allowed=True),
+    )
+    return unmarshaller(body=from_json(raw)).body  # type: ignore
+
+
+def legacy_marshal_json(val, typ) -> str:
+    marshaller = create_model(
+        "Marshaller",
+        body=(typ, ...),
+        __config__=ConfigDict(populate_by_name=True, arbitrary_types_allowed=True),
+    )
+    d = marshaller(body=val).model_dump(by_alias=True, mode="json", exclude_none=True)
+    if len(d) == 0:
+        return ""
+    return json.dumps(d[next(iter(d))], separators=(",", ":"))
+
+
+def scan_response_payload(extractions: int, detections: int) -> str:
+    return json.dumps({
+        "ID": "bench",
+        "principal": {"type": "App", "authType": "Token"},
+        "decision": "Allow",
+        "extractions": [
+            {
+                "data": f"message {i} " * 16,
+                "exploits": {"prompt_injection": 0.1, "jailbreak": 0.2},
+                "malcontents": {"toxic": 0.3},
+                "PIIs": {"email": 0.9},
+                "detections": [
+                    {"type": "PII", "name": "email", "score": 0.9, "start": j, "end": j + 5}
+                    for j in range(detections)
+                ],
+            }
+            for i in range(extractions)
+        ],
+    })
+
+
+def scan_request(messages: int) -> models.Scanrequest:
+    return models.Scanrequest(
+        messages=[f"message {i} " * 16 for i in range(messages)],
+        type=models.Type.INPUT,
+        annotations={"team": "bench"},
+    )
+
+
+def measure(func: Callable[[], Any], number: int) -> float:
+    """Returns the best per-call time in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=ROUNDS)) / number * 1e6
+
+
+def report(name: str, before: float, after: float) -> None:
+    print(f"{name:<40} {before:>10.1f}us {after:>10.1f}us {before / after:>7.1f}x")
+
+
+def main() -> None:
+    print(f"{'case':<40} {'before':>12} {'after':>12} {'speedup':>8}")
+
+    for extractions, detections in ((1, 0), (4, 10), (16, 100)):
+        raw = scan_response_payload(extractions, detections)
+        number = max(20, 2000 // (extractions * (detections + 1)))
+        report(
+            f"unmarshal_json Scanresponse {extractions}x{detections}",
+            measure(lambda: legacy_unmarshal_json(raw, models.Scanresponse), number),
+            measure(lambda: utils.unmarshal_json(raw, models.Scanresponse), number),
+        )
+
+    raw_analyzers = json.dumps([{"ID": str(i), "name": f"analyzer-{i}"} for i in range(20)])
+    report(
+        "unmarshal_json List[Analyzer]",
+        measure(lambda: legacy_unmarshal_json(raw_analyzers, List[models.Analyzer]), 500),
+        measure(lambda: utils.unmarshal_json(raw_analyzers, List[models.Analyzer]), 500),
+    )
+
+    for messages in (1, 16):
+        request = scan_request(messages)
+        report(
+            f"marshal_json Scanrequest {messages} msgs",
+            measure(lambda: legacy_marshal_json(request, Optional[models.Scanrequest]), 500),
+            measure(lambda: utils.marshal_json(request, Optional[models.Scanrequest]), 500),
+        )
+
+
+if __name__ == "__main__":
+    main()
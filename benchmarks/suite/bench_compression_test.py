@@ -0,0 +1,44 @@
+import base64
+import random
+
+import httpx
+import pytest
+
+from acuvity.compression import RequestCompression
+from acuvity.models import Extractionrequest, Scanrequest
+from acuvity.utils import serialize_request_body
+
+PAYLOAD_SIZES = {"1KiB": 1 << 10, "64KiB": 64 << 10, "1MiB": 1 << 20}
+
+WORDS = ["the", "user", "asked", "about", "invoice", "number", "payment", "account", "please", "summarize", "report", "quarter"]
+
+
+def scan_request_body(size: int, kind: str) -> bytes:
+    """A serialized scan request: a conversation, or a base64 encoded text file"""
+    rng = random.Random(0)
+    text = " ".join(rng.choice(WORDS) for _ in range(size // 5))[:size]
+    if kind == "messages":
+        request = Scanrequest(messages=[text[i:i + 4096] for i in range(0, len(text), 4096)])
+    else:
+        request = Scanrequest(extractions=[Extractionrequest(data=base64.b64encode(text.encode()).decode())])
+    return serialize_request_body(request, False, False, "json", Scanrequest).content.encode()
+
+
+@pytest.mark.parametrize("kind", ["messages", "file"])
+@pytest.mark.parametrize("payload_size", list(PAYLOAD_SIZES), ids=list(PAYLOAD_SIZES))
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_compress_scan_request(benchmark, encoding, payload_size, kind):
+    """Time to compress a scan request body, with the bytes on the wire in extra_info"""
+    try:
+        compression = RequestCompression(encoding, threshold=0)
+    except ImportError:
+        pytest.skip("no zstd implementation")
+    body = scan_request_body(PAYLOAD_SIZES[payload_size], kind)
+
+    def run():
+        request = httpx.Request("POST", "https://apex.bench/_acuvity/scan", content=body)
+        return compression.before_request(None, request) # type: ignore[arg-type]
+
+    compressed = benchmark(run)
+    benchmark.extra_info["raw_bytes"] = len(body)
+    benchmark.extra_info["wire_bytes"] = len(compressed.content)
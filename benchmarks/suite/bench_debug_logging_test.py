@@ -0,0 +1,31 @@
+import json
+
+import httpx
+import pytest
+from conftest import SIZES, scan_response_payload, stub_handler
+
+from acuvity import Acuvity, Security
+from acuvity.utils.logger import NoOpLogger
+
+
+class DiscardingLogger:
+    """Logger taking debug messages and dropping them: their arguments are built, as they used to be for every logger"""
+
+    def debug(self, msg, *args, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize("logger", [NoOpLogger(), DiscardingLogger()], ids=["noop", "debug"])
+def test_scan_large_file(benchmark, tmp_path, logger):
+    """Scan of a 8MiB file, with and without building the debug log arguments"""
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"a" * (8 << 20))
+    s = Acuvity(
+        security=Security(token="token"),
+        server_url="https://apex.bench",
+        client=httpx.Client(transport=httpx.MockTransport(stub_handler(json.dumps(scan_response_payload(*SIZES["large"]))))),
+        retry_config=None,
+        debug_logger=logger,
+    )
+
+    benchmark(s.apex.scan, files=str(path), guard_config=[])
@@ -0,0 +1,19 @@
+import yaml
+from conftest import GUARD_CONFIG_PATH
+
+from acuvity.guard.config import GuardConfig
+
+
+def test_parse_yaml_file(benchmark):
+    benchmark(GuardConfig, GUARD_CONFIG_PATH)
+
+
+def test_parse_dict(benchmark):
+    with open(GUARD_CONFIG_PATH, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    benchmark(GuardConfig, config)
+
+
+def test_load_memoized(benchmark):
+    GuardConfig.load(GUARD_CONFIG_PATH)
+    benchmark(GuardConfig.load, GUARD_CONFIG_PATH)
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = str(Path(__file__).parents[2] / "src")
+
+
+def test_import_acuvity(benchmark):
+    """A fresh interpreter importing the package, interpreter startup included"""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    benchmark.pedantic(
+        subprocess.run, args=([sys.executable, "-c", "import acuvity"],), kwargs={"env": env, "check": True}, rounds=10,
+    )
@@ -0,0 +1,21 @@
+from conftest import GUARD_CONFIG_PATH
+
+from acuvity.guard.config import GuardConfig
+from acuvity.guard.constants import GuardName
+from acuvity.response.match import ScanResponseMatch
+from acuvity.response.processor import ResponseProcessor
+
+
+def test_response_processor_matches(benchmark, scan_response):
+    gconfig = GuardConfig.load(GUARD_CONFIG_PATH)
+    benchmark(lambda: ResponseProcessor(scan_response, gconfig).matches())
+
+
+def test_scan_response_match(benchmark, scan_response):
+    gconfig = GuardConfig.load(GUARD_CONFIG_PATH)
+    benchmark(ScanResponseMatch, scan_response, gconfig)
+
+
+def test_guard_match(benchmark, scan_response):
+    match = ScanResponseMatch(scan_response, GuardConfig.load(GUARD_CONFIG_PATH))
+    benchmark(match.guard_match, GuardName.PII_DETECTOR)
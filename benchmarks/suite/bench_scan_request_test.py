@@ -0,0 +1,19 @@
+import pytest
+
+from acuvity.guard.config import GuardConfig
+
+
+@pytest.mark.parametrize("file_size", [1 << 10, 1 << 20, 8 << 20], ids=["1KiB", "1MiB", "8MiB"])
+def test_build_scan_request_with_file(benchmark, acuvity, tmp_path, file_size):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"a" * file_size)
+    build = acuvity.apex._ApexExtended__build_scan_request # pylint: disable=protected-access
+
+    benchmark(build, "message", files=str(path))
+
+
+def test_build_scan_request_with_guard_config(benchmark, acuvity):
+    gconfig = GuardConfig.load(None)
+    build = acuvity.apex._ApexExtended__build_scan_request # pylint: disable=protected-access
+
+    benchmark(build, *[f"message {i}" for i in range(16)], guard_config=gconfig)
@@ -0,0 +1,20 @@
+import asyncio
+
+from conftest import GUARD_CONFIG_PATH
+
+
+def test_scan(benchmark, stub_acuvity):
+    benchmark(stub_acuvity.apex.scan, "message", guard_config=GUARD_CONFIG_PATH)
+
+
+def test_scan_async(benchmark, stub_acuvity):
+    loop = asyncio.new_event_loop()
+    try:
+        benchmark(lambda: loop.run_until_complete(stub_acuvity.apex.scan_async("message", guard_config=GUARD_CONFIG_PATH)))
+    finally:
+        loop.close()
+
+
+def test_scan_many(benchmark, stub_acuvity):
+    messages = [f"message {i}" for i in range(8)]
+    benchmark(lambda: list(stub_acuvity.apex.scan_many(messages, guard_config=GUARD_CONFIG_PATH)))
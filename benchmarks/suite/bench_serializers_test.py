@@ -0,0 +1,31 @@
+from acuvity import models, utils
+from acuvity.response.lazy import LazyScanresponse
+
+
+def test_unmarshal_scan_response(benchmark, scan_response_json):
+    benchmark(utils.unmarshal_json, scan_response_json, models.Scanresponse)
+
+
+def test_marshal_scan_response(benchmark, scan_response):
+    benchmark(utils.marshal_json, scan_response, models.Scanresponse)
+
+
+def test_marshal_scan_request(benchmark):
+    request = models.Scanrequest(
+        messages=[f"message {i} " * 16 for i in range(16)],
+        type=models.Type.INPUT,
+        annotations={"team": "bench"},
+    )
+    benchmark(utils.marshal_json, request, models.Scanrequest)
+
+
+def test_unmarshal_scan_response_lazy(benchmark, scan_response_json):
+    benchmark(LazyScanresponse.from_json, scan_response_json)
+
+
+def test_read_exploits_eager(benchmark, scan_response_json):
+    benchmark(lambda: models.Scanresponse.model_validate_json(scan_response_json).extractions[0].exploits)
+
+
+def test_read_exploits_lazy(benchmark, scan_response_json):
+    benchmark(lambda: LazyScanresponse.from_json(scan_response_json).extractions[0].exploits)
@@ -0,0 +1,105 @@
+"""
+Fixtures of the benchmark suite: synthetic scan responses of varying size and
+an SDK instance talking to an in-process stub of the Apex.
+"""
+
+import json
+import os
+import random
+from typing import Any, Callable, Dict
+
+import httpx
+import pytest
+
+from acuvity import Acuvity, Security, models
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+GUARD_CONFIG_PATH = os.path.join(EXAMPLES, "configs", "complete_guard_config.yaml")
+
+# (extractions, detections per extraction)
+SIZES = {
+    "small": (1, 5),
+    "medium": (8, 100),
+    "large": (32, 1000),
+}
+
+PII_NAMES = ["email_address", "ssn", "person", "credit_card", "phone_number", "address"]
+
+
+def scan_response_payload(extractions: int, detections: int, seed: int = 0) -> Dict[str, Any]:
+    """Returns a synthetic scan response with the given number of extractions and detections"""
+    rng = random.Random(seed)
+    return {
+        "ID": "bench",
+        "principal": {"type": "App", "authType": "Token"},
+        "decision": "Allow",
+        "extractions": [
+            {
+                "data": f"message {i} " * 32,
+                "exploits": {"prompt_injection": rng.random(), "jailbreak": rng.random()},
+                "malcontents": {"toxic": rng.random(), "biased": rng.random()},
+                "languages": {"english": 0.99},
+                "PIIs": {name: rng.random() for name in PII_NAMES},
+                "secrets": {"aws_secret_key": rng.random()},
+                "detections": [
+                    {
+                        "type": rng.choice(["PII", "Secret", "Keyword"]),
+                        "name": rng.choice(PII_NAMES),
+                        "score": rng.random(),
+                        "start": j * 10,
+                        "end": j * 10 + 8,
+                    }
+                    for j in range(detections)
+                ],
+            }
+            for i in range(extractions)
+        ],
+    }
+
+
+@pytest.fixture(params=list(SIZES), ids=list(SIZES))
+def size(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def scan_response_json(size) -> str:
+    return json.dumps(scan_response_payload(*SIZES[size]))
+
+
+@pytest.fixture
+def scan_response(scan_response_json) -> models.Scanresponse:
+    return models.Scanresponse.model_validate_json(scan_response_json)
+
+
+def stub_handler(payload: str) -> Callable[[httpx.Request], httpx.Response]:
+    """Apex stub answering every scan with the same payload"""
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=payload, headers={"content-type": "application/json"})
+    return handler
+
+
+def make_stub_acuvity(payload: str) -> Acuvity:
+    """Returns an SDK instance talking to an in-process Apex stub, without any network I/O"""
+    async def async_handler(request: httpx.Request) -> httpx.Response:
+        return stub_handler(payload)(request)
+
+    return Acuvity(
+        security=Security(token="token"),
+        server_url="https://apex.bench",
+        client=httpx.Client(transport=httpx.MockTransport(stub_handler(payload))),
+        async_client=httpx.AsyncClient(transport=httpx.MockTransport(async_handler)),
+        retry_config=None,
+    )
+
+
+@pytest.fixture
+def stub_acuvity(scan_response_json) -> Acuvity:
+    """SDK instance whose stub answers with the scan response of the benchmarked size"""
+    return make_stub_acuvity(scan_response_json)
+
+
+@pytest.fixture
+def acuvity() -> Acuvity:
+    """SDK instance for benchmarks that don't depend on the response size"""
+    return make_stub_acuvity(json.dumps(scan_response_payload(*SIZES["small"])))
@@ -1,17 +1,111 @@
 """Code originally generated by Speakeasy (https://speakeasy.com)."""
 
-# pylint: disable=unused-import
-import acuvity.apexextend
-
-# pylint: disable=unused-import
-import acuvity.sdkextend
-from acuvity.guard import *
-from acuvity.guard import Threshold
-from acuvity.response import *
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from ._version import __title__, __version__
-from .models import *
-from .sdk import *
-from .sdkconfiguration import *
+
+if TYPE_CHECKING:
+    from acuvity.guard import *
+    from acuvity.response import *
+
+    from .apexdiscovery import ApexDiscoveryCache
+    from .catalog import AnalyzerCatalog, AnalyzerCatalogCache
+    from .coalescer import ScanCoalescer
+    from .compression import RequestCompression
+    from .connection import ConnectionConfig
+    from .models import *
+    from .scancache import InMemoryScanCache, ScanCacheBackend, ScanCacheStats
+    from .sdk import *
+    from .sdkconfiguration import *
+    from .timing import OpenTelemetryScanExporter, ScanTimingHook, ScanTimings
+    from .utils.ratelimit import AdaptiveRateLimiter
+    from .utils.retries import CircuitBreaker, CircuitOpenError, RetryBudget
 
 VERSION: str = __version__
+
+# Everything is imported on first access, so that importing the package is fast:
+# public names, by the module they are imported from
+_lazy_imports: Dict[str, str] = {
+    "Acuvity": "acuvity.sdk",
+    "SDKConfiguration": "acuvity.sdkconfiguration",
+    "ApexDiscoveryCache": "acuvity.apexdiscovery",
+    "AnalyzerCatalog": "acuvity.catalog",
+    "AnalyzerCatalogCache": "acuvity.catalog",
+    "ScanCoalescer": "acuvity.coalescer",
+    "RequestCompression": "acuvity.compression",
+    "ConnectionConfig": "acuvity.connection",
+    "InMemoryScanCache": "acuvity.scancache",
+    "ScanCacheBackend": "acuvity.scancache",
+    "ScanCacheStats": "acuvity.scancache",
+    "OpenTelemetryScanExporter": "acuvity.timing",
+    "ScanTimingHook": "acuvity.timing",
+    "ScanTimings": "acuvity.timing",
+    "CircuitBreaker": "acuvity.utils.retries",
+    "CircuitOpenError": "acuvity.utils.retries",
+    "RetryBudget": "acuvity.utils.retries",
+    "AdaptiveRateLimiter": "acuvity.utils.ratelimit",
+    "Guard": "acuvity.guard",
+    "GuardConfig": "acuvity.guard",
+    "GuardName": "acuvity.guard",
+    "Match": "acuvity.guard",
+    "Threshold": "acuvity.guard",
+    "ResponseMatch": "acuvity.response",
+    "GuardMatch": "acuvity.response",
+    "Matches": "acuvity.response",
+    "ScanResponseMatch": "acuvity.response",
+    "ScanBatchResult": "acuvity.response",
+    "StreamScan": "acuvity.response",
+    "AsyncStreamScan": "acuvity.response",
+    "StreamScanResult": "acuvity.response",
+    "LazyScanresponse": "acuvity.response",
+    "LazyExtraction": "acuvity.response",
+}
+
+# modules whose other public names used to be re-exported with star imports
+_star_modules = (
+    "acuvity.models",
+    "acuvity.sdk",
+    "acuvity.sdkconfiguration",
+    "acuvity.guard",
+    "acuvity.response",
+)
+
+
+def _models() -> List[str]:
+    from . import models # pylint: disable=import-outside-toplevel
+    return list(models.__all__)
+
+
+_lazy_imports.update(dict.fromkeys(_models(), "acuvity.models"))
+
+__all__ = ["VERSION", *_lazy_imports]
+
+
+def __getattr__(name: str) -> Any:
+    if name.startswith("_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name = _lazy_imports.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(module_name), name)
+    else:
+        try:
+            value = importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            for module_name in _star_modules:
+                module = importlib.import_module(module_name)
+                if hasattr(module, name):
+                    value = getattr(module, name)
+                    break
+            else:
+                raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_lazy_imports))
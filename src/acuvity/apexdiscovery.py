@@ -1,33 +1,185 @@
-from typing import Any, Callable, Optional, Tuple, Union
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from urllib.parse import urlparse
 
-import jwt
+import httpx
 from pydantic import BaseModel
 
 from acuvity import models
 from acuvity.utils import get_security_from_env
 
-from .httpclient import HttpClient
+from ._hooks.types import AfterErrorContext, AfterErrorHook
+from .httpclient import AsyncHttpClient, HttpClient
 
+APEX_DISCOVERY_CACHE_ENV = "ACUVITY_APEX_DISCOVERY_CACHE"
 
-def discover_apex(
-    client: HttpClient,
-    server_url: Optional[str] = None,
+
+class ApexDiscoveryCache:
+    """
+    Thread-safe cache for the results of the well-known Apex discovery.
+
+    Entries are keyed by the token issuer and a SHA-256 fingerprint of the token, so the
+    token itself is never stored. Entries expire after `ttl` seconds, or when the token
+    expires if that is earlier. If a `path` is given, the entries are also persisted to
+    that JSON file and shared by all processes using it, which lets short-lived workers
+    skip the discovery request entirely.
+    """
+
+    def __init__(self, ttl: float = 3600.0, path: Optional[str] = None):
+        """
+        Args:
+            ttl: Time to live of a discovery result in seconds
+            path: Optional file to persist the discovery results to
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+        self.ttl = ttl
+        self.path = path
+        self._entries: Dict[str, Tuple[str, str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(issuer: str, token: str) -> str:
+        """
+        Returns the cache key for a token issued by the given issuer.
+        """
+        return f"{issuer}#{hashlib.sha256(token.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """
+        Returns the cached (domain, port), or None if there is no valid entry for the key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.path is not None:
+                self._entries.update(self._read())
+                entry = self._entries.get(key)
+            if entry is None:
+                return None
+            domain, port, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return domain, port
+
+    def set(self, key: str, domain: str, port: str, expires_at: Optional[float] = None) -> None:
+        """
+        Stores a discovery result, expiring after the TTL or at `expires_at` if that is earlier.
+        """
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._entries[key] = (domain, port, deadline)
+            self._persist()
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drops the entry for the key, the next construction will run the discovery again.
+        """
+        with self._lock:
+            if self.path is not None:
+                self._entries.update(self._read())
+            if self._entries.pop(key, None) is not None:
+                self._persist()
+
+    def clear(self) -> None:
+        """
+        Drops all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._persist()
+
+    def _read(self) -> Dict[str, Tuple[str, str, float]]:
+        # the disk cache is best effort: a missing or corrupt file is an empty cache
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {key: (str(domain), str(port), float(expires_at)) for key, (domain, port, expires_at) in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def _persist(self) -> None:
+        if self.path is None:
+            return
+        now = time.time()
+        entries = {key: list(entry) for key, entry in self._entries.items() if entry[2] > now}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            # write to a temporary file first so that readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".apex-discovery-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            pass
+
+
+_default_cache: Optional[ApexDiscoveryCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def default_apex_discovery_cache() -> ApexDiscoveryCache:
+    """
+    Returns the process-wide discovery cache used when no cache is given to the SDK.
+    It is persisted to the file named by the ACUVITY_APEX_DISCOVERY_CACHE environment variable if set.
+    """
+    global _default_cache # pylint: disable=global-statement
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ApexDiscoveryCache(path=os.getenv(APEX_DISCOVERY_CACHE_ENV) or None)
+        return _default_cache
+
+
+class ApexDiscoveryInvalidationHook(AfterErrorHook):
+    """
+    Drops the cached discovery result of the token when the Apex cannot be connected to,
+    so that a moved Apex is discovered again by the next SDK construction.
+    """
+
+    def __init__(
+        self,
+        cache: ApexDiscoveryCache,
+        security: Optional[Union[models.Security, Callable[[], models.Security]]] = None,
+    ):
+        self.cache = cache
+        self.security = security
+
+    def after_error(
+        self,
+        hook_ctx: AfterErrorContext,
+        response: Optional[httpx.Response],
+        error: Optional[Exception],
+    ) -> Union[Tuple[Optional[httpx.Response], Optional[Exception]], Exception]:
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+            try:
+                import jwt # pylint: disable=import-outside-toplevel
+                token = _get_token(self.security)
+                issuer = jwt.decode(token, options={"verify_signature": False})["iss"]
+                self.cache.invalidate(ApexDiscoveryCache.key(issuer, token))
+            except Exception: # pylint: disable=broad-exception-caught
+                pass
+        return response, error
+
+
+def _get_token(
     security: Optional[
         Union[models.Security, Callable[[], models.Security]]
     ] = None,
-    apex_domain: Optional[str] = None,
-    apex_port: Optional[str] = None,
-) -> Tuple[Optional[str], Optional[str]]:
-    # pylint: disable=too-many-return-statements
-    """
-    Discovers the apex domain and port from the encoded token or by calling the backend API if the server_url is not provided.
-    This will raise exceptions if there is no token or the token is empty or invalid.
-    """
-    # if there is no token, then we can't perform discovery
-    # however, a token is in general needed to perform any API calls as there are no unauthenticated endpoints
-    # so we strictly check if there is a token and fail otherwise
-    token: str = ""
+) -> str:
     sec: Optional[BaseModel] = get_security_from_env(security, models.Security)
     if sec is None:
         raise ValueError("No security object provided, or ACUVITY_TOKEN environment variable is not set or empty")
@@ -36,6 +188,86 @@ def discover_apex(
     token = sec.token if sec.token is not None else sec.cookie if sec.cookie is not None else ""
     if token == "":
         raise ValueError("No token provided")
+    return token
+
+
+class _WellKnownDiscovery:
+    """
+    Pending lookup of the Apex on the well-known endpoint of the token issuer.
+    """
+
+    def __init__(self, token: str, api_url: str, decoded_token: dict, cache: Optional[ApexDiscoveryCache]):
+        self.token = token
+        self.url = f"{api_url}/.well-known/acuvity/my-apex.json"
+        self.decoded_token = decoded_token
+        self.cache = cache
+        self.cache_key = ApexDiscoveryCache.key(api_url, token)
+
+    def build_request(self, client: Union[HttpClient, AsyncHttpClient], url: str) -> httpx.Request:
+        return client.build_request("GET", url, headers={"Authorization": f"Bearer {self.token}"})
+
+    @staticmethod
+    def next_url(resp: httpx.Response, iteration: int) -> Optional[str]:
+        """
+        Returns the location to follow for a redirect, or None if the response is final.
+        """
+        if resp.status_code == 401:
+            raise ValueError("Unauthorized: Invalid token or insufficient permissions")
+        if not resp.is_redirect:
+            return None
+        if iteration + 1 == 3:
+            raise ValueError("Too many redirects")
+        return resp.headers["Location"]
+
+    def complete(self, apex_info: Any) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extracts the domain and port from the well-known response and caches them.
+        """
+        try:
+            # extract the information from the response
+            apex_url: str = apex_info["url"]
+            if apex_url == "":
+                raise ValueError("Apex Info: no URL in response")
+            port = f"{apex_info['portNoMTLS']}"
+            if port == "":
+                raise ValueError("Apex Info: no portNoMTLS in response")
+            if apex_url.startswith(("http://", "https://")):
+                # parse the URL to extract the domain
+                # use hostname as opposed to netloc because we *only* want the domain, and not the domain:port notation
+                parsed_url = urlparse(apex_url)
+                domain = parsed_url.hostname
+            else:
+                domain = apex_url
+            if domain == "":
+                raise ValueError(f"Apex Info: no domain in URL: f{apex_url}")
+        except Exception as e:
+            raise ValueError("Failed to extract apex info from response") from e
+
+        if self.cache is not None and domain is not None:
+            expires_at = self.decoded_token.get("exp")
+            self.cache.set(self.cache_key, domain, port, float(expires_at) if isinstance(expires_at, (int, float)) else None)
+
+        return domain, port
+
+
+def _prepare_discovery(
+    server_url: Optional[str],
+    security: Optional[
+        Union[models.Security, Callable[[], models.Security]]
+    ],
+    apex_domain: Optional[str],
+    apex_port: Optional[str],
+    cache: Optional[ApexDiscoveryCache],
+) -> Union[Tuple[Optional[str], Optional[str]], _WellKnownDiscovery]:
+    # pylint: disable=too-many-return-statements
+    """
+    Resolves the apex domain and port without any network I/O if possible,
+    otherwise returns the well-known lookup to perform.
+    """
+    # if there is no token, then we can't perform discovery
+    # however, a token is in general needed to perform any API calls as there are no unauthenticated endpoints
+    # so we strictly check if there is a token and fail otherwise
+    token: str = _get_token(security)
 
     # if a server_url was given, then we don't need to perform discovery at all
     # and we know already that we have a token, so we can return immediately
@@ -48,6 +280,7 @@ def discover_apex(
         return apex_domain, apex_port
 
     # decode the token but don't verify the signature
+    import jwt # pylint: disable=import-outside-toplevel
     try:
         decoded_token = jwt.decode(token, options={"verify_signature": False})
         if "iss" not in decoded_token:
@@ -89,41 +322,78 @@ def discover_apex(
     if api_url == "":
         raise ValueError("'iss' field value of token is empty, but should have been the API URL")
 
-    def well_known_apex_info(client: HttpClient, token: str, url: str, iteration: int = 0) -> Any:
-        if iteration == 3:
-            raise ValueError("Too many redirects")
-        req = client.build_request("GET", url, headers={"Authorization": f"Bearer {token}"})
-        resp = client.send(req, follow_redirects=False) # following redirects automatically will remove the token from the call as headers are not going to be sent anymore
+    lookup = _WellKnownDiscovery(token, api_url, decoded_token, cache)
 
-        if resp.status_code == 401:
-            raise ValueError("Unauthorized: Invalid token or insufficient permissions")
+    # a previous discovery for the same token saves the round trip to the well-known endpoint
+    if cache is not None:
+        cached = cache.get(lookup.cache_key)
+        if cached is not None:
+            return cached
+
+    return lookup
 
-        if resp.is_redirect:
-            return well_known_apex_info(client, token, resp.headers["Location"], iteration + 1)
+
+def discover_apex(
+    client: HttpClient,
+    server_url: Optional[str] = None,
+    security: Optional[
+        Union[models.Security, Callable[[], models.Security]]
+    ] = None,
+    apex_domain: Optional[str] = None,
+    apex_port: Optional[str] = None,
+    cache: Optional[ApexDiscoveryCache] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Discovers the apex domain and port from the encoded token or by calling the backend API if the server_url is not provided.
+    This will raise exceptions if there is no token or the token is empty or invalid.
+    If a cache is given, results of the well-known endpoint are looked up and stored there.
+    """
+    lookup = _prepare_discovery(server_url, security, apex_domain, apex_port, cache)
+    if not isinstance(lookup, _WellKnownDiscovery):
+        return lookup
+
+    def well_known_apex_info(url: str, iteration: int = 0) -> Any:
+        # following redirects automatically will remove the token from the call as headers are not going to be sent anymore
+        resp = client.send(lookup.build_request(client, url), follow_redirects=False)
+        next_url = lookup.next_url(resp, iteration)
+        if next_url is not None:
+            return well_known_apex_info(next_url, iteration + 1)
         return resp.json()
     try:
-        apex_info = well_known_apex_info(client, token, f"{api_url}/.well-known/acuvity/my-apex.json")
+        apex_info = well_known_apex_info(lookup.url)
     except Exception as e:
         raise ValueError(f"Failed to get apex info from well-known endpoint: {str(e)}") from e
 
+    return lookup.complete(apex_info)
+
+
+async def discover_apex_async(
+    client: AsyncHttpClient,
+    server_url: Optional[str] = None,
+    security: Optional[
+        Union[models.Security, Callable[[], models.Security]]
+    ] = None,
+    apex_domain: Optional[str] = None,
+    apex_port: Optional[str] = None,
+    cache: Optional[ApexDiscoveryCache] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Same as discover_apex, but calls the backend API with an async client.
+    """
+    lookup = _prepare_discovery(server_url, security, apex_domain, apex_port, cache)
+    if not isinstance(lookup, _WellKnownDiscovery):
+        return lookup
+
+    async def well_known_apex_info(url: str, iteration: int = 0) -> Any:
+        # following redirects automatically will remove the token from the call as headers are not going to be sent anymore
+        resp = await client.send(lookup.build_request(client, url), follow_redirects=False)
+        next_url = lookup.next_url(resp, iteration)
+        if next_url is not None:
+            return await well_known_apex_info(next_url, iteration + 1)
+        return resp.json()
     try:
-        # extract the information from the response
-        apex_url: str = apex_info["url"]
-        if apex_url == "":
-            raise ValueError("Apex Info: no URL in response")
-        port = f"{apex_info['portNoMTLS']}"
-        if port == "":
-            raise ValueError("Apex Info: no portNoMTLS in response")
-        if apex_url.startswith(("http://", "https://")):
-            # parse the URL to extract the domain
-            # use hostname as opposed to netloc because we *only* want the domain, and not the domain:port notation
-            parsed_url = urlparse(apex_url)
-            domain = parsed_url.hostname
-        else:
-            domain = apex_url
-        if domain == "":
-            raise ValueError(f"Apex Info: no domain in URL: f{apex_url}")
+        apex_info = await well_known_apex_info(lookup.url)
     except Exception as e:
-        raise ValueError("Failed to extract apex info from response") from e
+        raise ValueError(f"Failed to get apex info from well-known endpoint: {str(e)}") from e
 
-    return domain, port
+    return lookup.complete(apex_info)
@@ -1,21 +1,53 @@
 # pylint: disable=protected-access
 
+import asyncio
 import base64
+import contextlib
+import contextvars
 import os
+import threading
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Union
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from acuvity.catalog import AnalyzerCatalog, default_analyzer_catalog_cache
+from acuvity.coalescer import ScanCoalescer
+from acuvity.fileupload import FileStreamingHook
 from acuvity.guard.config import Guard, GuardConfig, GuardName
 from acuvity.models import (
-    Analyzer,
     Anonymization,
     Extractionrequest,
     Scanrequest,
+    ScanrequestTypedDict,
+    Scanresponse,
+    Security,
     Type,
 )
+from acuvity.response.batch import ScanBatchResult, ScanItem
+from acuvity.response.chunk import ChunkedScan
+from acuvity.response.lazy import lazy_scan_responses
 from acuvity.response.match import ScanResponseMatch
+from acuvity.response.stream import AsyncStreamScan, StreamScan, TextWindower
+from acuvity.scancache import ScanCacheBackend, scan_cache_scope, scan_request_key
 from acuvity.sdkconfiguration import SDKConfiguration
+from acuvity.timing import ScanTimingHook
+from acuvity.types import UNSET, OptionalNullable
 from acuvity.utils.logger import get_default_logger
+from acuvity.utils.security import get_security_from_env
+from acuvity.utils.retries import RetryConfig
 
 from .apex import Apex
 
@@ -25,9 +57,39 @@ logger = get_default_logger()
 
 
 class ApexExtended(Apex):
-    def __init__(self, sdk_config: SDKConfiguration) -> None:
+    def __init__(
+        self,
+        sdk_config: SDKConfiguration,
+        scan_cache: Optional[ScanCacheBackend] = None,
+        scan_coalescer: Optional[ScanCoalescer] = None,
+        scan_timing_hook: Optional[ScanTimingHook] = None,
+        lazy_responses: bool = False,
+        file_streaming_hook: Optional[FileStreamingHook] = None,
+        file_read_workers: int = 4,
+    ) -> None:
         super().__init__(sdk_config)
-        self._available_analyzers: Optional[List[Analyzer]] = None
+        self.scan_cache = scan_cache
+        self.scan_coalescer = scan_coalescer
+        self.scan_timing_hook = scan_timing_hook
+        self.lazy_responses = lazy_responses
+        self.file_streaming_hook = file_streaming_hook
+        if file_read_workers < 1:
+            raise ValueError("file_read_workers must be at least 1")
+        self.file_read_workers = file_read_workers
+        # reads the files of the async scans off the event loop, created on first use
+        self.__file_executor: Optional[ThreadPoolExecutor] = None
+        self.__file_executor_lock = threading.Lock()
+        self.analyzer_catalog_cache = default_analyzer_catalog_cache()
+
+    def close(self) -> None:
+        """
+        Stops the file reading threads of the async scans, if any were started. Later async
+        scans of files start new ones. Called when the SDK is closed.
+        """
+        with self.__file_executor_lock:
+            executor, self.__file_executor = self.__file_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
 
     def list_available_guards(self) -> List[str]:
         """
@@ -35,39 +97,83 @@ class ApexExtended(Apex):
         """
         return GuardName.values()
 
+    def analyzer_catalog(self) -> AnalyzerCatalog:
+        """
+        analyzer_catalog: returns the indexed analyzers of the Apex, shared by all SDK instances of the process and refreshed in the background.
+        """
+        return self.analyzer_catalog_cache.get(self.__analyzer_catalog_key(), self.list_analyzers)
+
+    async def analyzer_catalog_async(self) -> AnalyzerCatalog:
+        """
+        analyzer_catalog_async: returns the indexed analyzers of the Apex, shared by all SDK instances of the process and refreshed in the background.
+        """
+        return await self.analyzer_catalog_cache.get_async(self.__analyzer_catalog_key(), self.list_analyzers_async)
+
     def list_detectable_secrets(self) -> List[str]:
         """
         list_detectable_secrets: returns a list of all available secrets that can be detected.
         """
-        detectable_secrets: List[str] = []
-        if self._available_analyzers is None:
-            self._available_analyzers = self.list_analyzers()
-        for analyzer in self._available_analyzers:
-            if analyzer.detectors:
-                detectable_secrets_local = [
-                    str(detector.name)
-                    for detector in analyzer.detectors
-                    if detector.group == "Secrets"
-                ]
-                detectable_secrets.extend(detectable_secrets_local)
-        return sorted(list(set(detectable_secrets)))
+        return self.analyzer_catalog().detector_names("Secrets")
+
+    async def list_detectable_secrets_async(self) -> List[str]:
+        """
+        list_detectable_secrets_async: returns a list of all available secrets that can be detected.
+        """
+        return (await self.analyzer_catalog_async()).detector_names("Secrets")
 
     def list_detectable_piis(self) -> List[str]:
         """
         list_detectable_piis: returns a list of all available Piis that can be detected.
         """
-        detectable_piis: List[str] = []
-        if self._available_analyzers is None:
-            self._available_analyzers = self.list_analyzers()
-        for analyzer in self._available_analyzers:
-            if analyzer.detectors:
-                detectable_piis_local = [
-                    str(detector.name)
-                    for detector in analyzer.detectors
-                    if detector.group == "PIIs"
-                ]
-                detectable_piis.extend(detectable_piis_local)
-        return sorted(list(set(detectable_piis)))
+        return self.analyzer_catalog().detector_names("PIIs")
+
+    async def list_detectable_piis_async(self) -> List[str]:
+        """
+        list_detectable_piis_async: returns a list of all available Piis that can be detected.
+        """
+        return (await self.analyzer_catalog_async()).detector_names("PIIs")
+
+    def scan_request(
+        self,
+        *,
+        request: Union[Scanrequest, ScanrequestTypedDict] = Scanrequest(),
+        retries: OptionalNullable[RetryConfig] = UNSET,
+        server_url: Optional[str] = None,
+        timeout_ms: Optional[int] = None,
+        http_headers: Optional[Mapping[str, str]] = None,
+    ) -> Scanresponse:
+        """
+        Processes the scan request. With lazy responses, the returned Scanresponse is a LazyScanresponse.
+        """
+        with lazy_scan_responses() if self.lazy_responses else contextlib.nullcontext():
+            return super().scan_request(
+                request=request,
+                retries=retries,
+                server_url=server_url,
+                timeout_ms=timeout_ms,
+                http_headers=http_headers,
+            )
+
+    async def scan_request_async(
+        self,
+        *,
+        request: Union[Scanrequest, ScanrequestTypedDict] = Scanrequest(),
+        retries: OptionalNullable[RetryConfig] = UNSET,
+        server_url: Optional[str] = None,
+        timeout_ms: Optional[int] = None,
+        http_headers: Optional[Mapping[str, str]] = None,
+    ) -> Scanresponse:
+        """
+        Processes the scan request. With lazy responses, the returned Scanresponse is a LazyScanresponse.
+        """
+        with lazy_scan_responses() if self.lazy_responses else contextlib.nullcontext():
+            return await super().scan_request_async(
+                request=request,
+                retries=retries,
+                server_url=server_url,
+                timeout_ms=timeout_ms,
+                http_headers=http_headers,
+            )
 
     def scan(
         self,
@@ -77,7 +183,10 @@ class ApexExtended(Apex):
         annotations: Optional[Dict[str, str]] = None,
         redactions: Optional[List[str]] = None,
         keywords: Optional[List[str]] = None,
-        guard_config: Optional[Union[str, Path, Dict, List[Guard]]] = None,
+        guard_config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        chunk_concurrency: int = 8,
     ) -> ScanResponseMatch:
         """
         scan() runs the provided messages (prompts) through the Acuvity detection engines and returns the results. Alternatively, you can run model output through the detection engines.
@@ -92,30 +201,37 @@ class ApexExtended(Apex):
         :param annotations: the annotations to use. These are the annotations that you want to use. If not provided, no annotations will be used.
         :param redactions: the redactions that need to be redacted if detected. This arg cannot be used with guard_config.
         :param keywords: the keywords that need to be detected. This arg cannot be used with guard_config.
-        :param guard_config: the guard config used to do the response eval for matches. If not provided, the default guard config will be used.
+        :param guard_config: the guard config used to do the response eval for matches. Can be a path to a YAML file, a dictionary, a list of guards or a parsed GuardConfig. If not provided, the default guard config will be used.
+        :param chunk_size: if set, the messages longer than this many characters are split into chunks scanned concurrently, and their results merged back: the offsets of the detections are those in the whole message, and the guard config is evaluated against the merged scores. Cannot be used with redactions.
+        :param chunk_overlap: the number of characters of the previous chunk repeated at the start of the next one, so that detections spanning two chunks are not missed. Defaults to a quarter of chunk_size, up to 256.
+        :param chunk_concurrency: the maximum number of chunks scanned at once.
         """
 
-        raw_scan_response = self.scan_request(request=self.__build_scan_request(
+        request_gconfig, gconfig = self.__resolve_guard_config(guard_config)
+        if chunk_size is not None:
+            plan = ChunkedScan(messages, chunk_size, chunk_overlap)
+            if plan.chunked:
+                return self.__scan_chunked(
+                    plan,
+                    files=files,
+                    request_type=request_type,
+                    annotations=annotations,
+                    redactions=redactions,
+                    keywords=keywords,
+                    request_guard_config=request_gconfig,
+                    guard_config=gconfig,
+                    concurrency=chunk_concurrency,
+                )
+        return self.__scan(
             *messages,
             files=files,
             request_type=request_type,
             annotations=annotations,
             redactions=redactions,
             keywords=keywords,
-            guard_config=guard_config if guard_config is None else GuardConfig(guard_config),
-        ))
-
-        # always send a guard config to the ScanResponseMatch
-        try:
-            if guard_config:
-                gconfig = GuardConfig(guard_config)
-            else:
-                gconfig = GuardConfig()
-        except Exception as e:
-            logger.debug("Error while processing the guard config")
-            raise ValueError("Cannot process the guard config") from e
-
-        return ScanResponseMatch(raw_scan_response, gconfig, files=files)
+            request_guard_config=request_gconfig,
+            guard_config=gconfig,
+        )
 
     async def scan_async(
         self,
@@ -125,7 +241,10 @@ class ApexExtended(Apex):
         annotations: Optional[Dict[str, str]] = None,
         redactions: Optional[List[str]] = None,
         keywords: Optional[List[str]] = None,
-        guard_config: Optional[Union[str, Path, Dict, List[Guard]]] = None,
+        guard_config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        chunk_concurrency: int = 8,
     ) -> ScanResponseMatch:
         """
         scan_async() runs the provided messages (prompts) through the Acuvity detection engines and returns the results. Alternatively, you can run model output through the detection engines.
@@ -138,28 +257,667 @@ class ApexExtended(Apex):
         :param files: the files to scan. These are the files that you want to scan. Required if no messages are provided. Can be used in addition to messages.        :param request_type: the type of the validation. This can be either Type.INPUT or Type.OUTPUT. Defaults to Type.INPUT. Use Type.OUTPUT if you want to run model output through the detection engines.
         :param annotations: the annotations to use. These are the annotations that you want to use. If not provided, no annotations will be used.
         :param analyzers: the analyzers to use. These are the analyzers that you want to use. If not provided, the internal default analyzers will be used. Use "+" to include an analyzer and "-" to exclude an analyzer. For example, ["+image-classifier", "-modality-detector"] will include the image classifier and exclude the modality detector. If any analyzer does not start with a '+' or '-', then the default analyzers will be replaced by whatever is provided. Call `list_analyzers()` and/or its variants to get a list of available analyzers.
-        :param guard_config: the guard config used to do the response eval for matches. If not provided, the default guard config will be used.
+        :param guard_config: the guard config used to do the response eval for matches. Can be a path to a YAML file, a dictionary, a list of guards or a parsed GuardConfig. If not provided, the default guard config will be used.
+        :param chunk_size: if set, the messages longer than this many characters are split into chunks scanned concurrently, and their results merged back: the offsets of the detections are those in the whole message, and the guard config is evaluated against the merged scores. Cannot be used with redactions.
+        :param chunk_overlap: the number of characters of the previous chunk repeated at the start of the next one, so that detections spanning two chunks are not missed. Defaults to a quarter of chunk_size, up to 256.
+        :param chunk_concurrency: the maximum number of chunks scanned at once.
         """
-        raw_scan_response = await self.scan_request_async(request=self.__build_scan_request(
+        request_gconfig, gconfig = self.__resolve_guard_config(guard_config)
+        if chunk_size is not None:
+            plan = ChunkedScan(messages, chunk_size, chunk_overlap)
+            if plan.chunked:
+                return await self.__scan_chunked_async(
+                    plan,
+                    files=files,
+                    request_type=request_type,
+                    annotations=annotations,
+                    redactions=redactions,
+                    keywords=keywords,
+                    request_guard_config=request_gconfig,
+                    guard_config=gconfig,
+                    concurrency=chunk_concurrency,
+                )
+        return await self.__scan_async(
             *messages,
             files=files,
             request_type=request_type,
             annotations=annotations,
             redactions=redactions,
             keywords=keywords,
-            guard_config=guard_config if guard_config is None else GuardConfig(guard_config),
+            request_guard_config=request_gconfig,
+            guard_config=gconfig,
+        )
+
+    def scan_many(
+        self,
+        items: Iterable[ScanItem],
+        *,
+        concurrency: int = 8,
+        ordered: bool = True,
+        request_type: Union[Type,str] = Type.INPUT,
+        annotations: Optional[Dict[str, str]] = None,
+        redactions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        guard_config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]] = None,
+    ) -> Iterator[ScanBatchResult]:
+        """
+        scan_many() scans every item through the Acuvity detection engines with at most `concurrency` scans in flight at once.
+        Yields a ScanBatchResult per item. A failing item does not stop the batch: its exception is captured in the result's `error`.
+
+        The guard config is parsed once and shared by all items, and all scans share the SDK's HTTP client.
+
+        :param items: the items to scan. Each item is either a message, or a (message, files) tuple where message can be None to scan files only.
+        :param concurrency: the maximum number of scans in flight. Defaults to 8.
+        :param ordered: if True, results are yielded in the order of the items. Otherwise they are yielded as they complete.
+        :param request_type: the type of the validation. This can be either Type.INPUT or Type.OUTPUT. Defaults to Type.INPUT.
+        :param annotations: the annotations to use for every item.
+        :param redactions: the redactions that need to be redacted if detected. This arg cannot be used with guard_config.
+        :param keywords: the keywords that need to be detected. This arg cannot be used with guard_config.
+        :param guard_config: the guard config used to do the response eval for matches. Can be a path to a YAML file, a dictionary, a list of guards or a parsed GuardConfig. If not provided, the default guard config will be used.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        request_gconfig, gconfig = self.__resolve_guard_config(guard_config)
+
+        def scan_item(item: ScanItem) -> ScanResponseMatch:
+            messages, files = self.__unpack_scan_item(item)
+            return self.__scan(
+                *messages,
+                files=files,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                request_guard_config=request_gconfig,
+                guard_config=gconfig,
+            )
+
+        pending_items = enumerate(items)
+        in_flight: Dict[Future, Tuple[int, ScanItem]] = {}
+        completed: Dict[int, ScanBatchResult] = {}
+        next_index = 0
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            def submit_next() -> bool:
+                for index, item in pending_items:
+                    in_flight[executor.submit(scan_item, item)] = (index, item)
+                    return True
+                return False
+
+            try:
+                while len(in_flight) < concurrency and submit_next():
+                    pass
+
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, item = in_flight.pop(future)
+                        result = ScanBatchResult(index=index, item=item)
+                        try:
+                            result.response = future.result()
+                        except Exception as e: # pylint: disable=broad-exception-caught
+                            logger.debug("Batch scan of item %s failed", index, exc_info=True)
+                            result.error = e
+                        submit_next()
+
+                        if not ordered:
+                            yield result
+                            continue
+                        completed[index] = result
+                        while next_index in completed:
+                            yield completed.pop(next_index)
+                            next_index += 1
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    async def scan_many_async(
+        self,
+        items: Iterable[ScanItem],
+        *,
+        concurrency: int = 8,
+        ordered: bool = True,
+        request_type: Union[Type,str] = Type.INPUT,
+        annotations: Optional[Dict[str, str]] = None,
+        redactions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        guard_config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]] = None,
+    ) -> AsyncIterator[ScanBatchResult]:
+        """
+        scan_many_async() scans every item through the Acuvity detection engines with at most `concurrency` scans in flight at once.
+        Yields a ScanBatchResult per item. A failing item does not stop the batch: its exception is captured in the result's `error`.
+
+        The guard config is parsed once and shared by all items, and all scans share the SDK's async HTTP client.
+
+        :param items: the items to scan. Each item is either a message, or a (message, files) tuple where message can be None to scan files only.
+        :param concurrency: the maximum number of scans in flight. Defaults to 8.
+        :param ordered: if True, results are yielded in the order of the items. Otherwise they are yielded as they complete.
+        :param request_type: the type of the validation. This can be either Type.INPUT or Type.OUTPUT. Defaults to Type.INPUT.
+        :param annotations: the annotations to use for every item.
+        :param redactions: the redactions that need to be redacted if detected. This arg cannot be used with guard_config.
+        :param keywords: the keywords that need to be detected. This arg cannot be used with guard_config.
+        :param guard_config: the guard config used to do the response eval for matches. Can be a path to a YAML file, a dictionary, a list of guards or a parsed GuardConfig. If not provided, the default guard config will be used.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        request_gconfig, gconfig = self.__resolve_guard_config(guard_config)
+
+        async def scan_item(item: ScanItem) -> ScanResponseMatch:
+            messages, files = self.__unpack_scan_item(item)
+            return await self.__scan_async(
+                *messages,
+                files=files,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                request_guard_config=request_gconfig,
+                guard_config=gconfig,
+            )
+
+        pending_items = enumerate(items)
+        in_flight: Dict[asyncio.Task, Tuple[int, ScanItem]] = {}
+        completed: Dict[int, ScanBatchResult] = {}
+        next_index = 0
+
+        def submit_next() -> bool:
+            for index, item in pending_items:
+                in_flight[asyncio.ensure_future(scan_item(item))] = (index, item)
+                return True
+            return False
+
+        try:
+            while len(in_flight) < concurrency and submit_next():
+                pass
+
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, item = in_flight.pop(task)
+                    result = ScanBatchResult(index=index, item=item)
+                    try:
+                        result.response = task.result()
+                    except Exception as e: # pylint: disable=broad-exception-caught
+                        logger.debug("Batch scan of item %s failed", index, exc_info=True)
+                        result.error = e
+                    submit_next()
+
+                    if not ordered:
+                        yield result
+                        continue
+                    completed[index] = result
+                    while next_index in completed:
+                        yield completed.pop(next_index)
+                        next_index += 1
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def scan_stream(
+        self,
+        chunks: Iterable[str],
+        *,
+        window: int = 1024,
+        overlap: int = 64,
+        sentences: bool = True,
+        stop_on_match: bool = False,
+        request_type: Union[Type,str] = Type.OUTPUT,
+        annotations: Optional[Dict[str, str]] = None,
+        redactions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        guard_config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]] = None,
+    ) -> StreamScan:
+        """
+        scan_stream() scans a stream of text chunks, typically the tokens of a model completion, while it is generated.
+        Returns a StreamScan: iterating it yields a StreamScanResult per scanned window, and its verdict() merges all windows against the guard config.
+
+        :param chunks: the chunks of text to scan, in order.
+        :param window: the maximum number of new characters scanned per window.
+        :param overlap: the number of characters of the previous window repeated at the start of the next one.
+        :param sentences: scan a window as soon as a sentence ends instead of only once the window is full.
+        :param stop_on_match: stop consuming the stream after the first window matching a guard.
+        :param request_type: the type of the validation. Defaults to Type.OUTPUT.
+        :param annotations: the annotations to use for every window.
+        :param redactions: the redactions that need to be redacted if detected. This arg cannot be used with guard_config.
+        :param keywords: the keywords that need to be detected. This arg cannot be used with guard_config.
+        :param guard_config: the guard config used to do the response eval for matches. Can be a path to a YAML file, a dictionary, a list of guards or a parsed GuardConfig. If not provided, the default guard config will be used.
+        """
+        request_gconfig, gconfig = self.__resolve_guard_config(guard_config)
+
+        def scan_window(text: str) -> ScanResponseMatch:
+            return self.__scan(
+                text,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                request_guard_config=request_gconfig,
+                guard_config=gconfig,
+            )
+
+        return StreamScan(chunks, scan_window, gconfig, TextWindower(window, overlap, sentences), stop_on_match)
+
+    def scan_stream_async(
+        self,
+        chunks: Union[AsyncIterable[str], Iterable[str]],
+        *,
+        window: int = 1024,
+        overlap: int = 64,
+        sentences: bool = True,
+        stop_on_match: bool = False,
+        request_type: Union[Type,str] = Type.OUTPUT,
+        annotations: Optional[Dict[str, str]] = None,
+        redactions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        guard_config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]] = None,
+        max_in_flight: int = 8,
+    ) -> AsyncStreamScan:
+        """
+        scan_stream_async() is the async variant of scan_stream(). Windows are scanned concurrently with reading the stream.
+        Returns an AsyncStreamScan to iterate with `async for`. Parameters are the same as for scan_stream(), plus:
+
+        :param max_in_flight: the maximum number of windows scanned at once. Once that many are pending, the stream is only read further as their results are consumed.
+        """
+        request_gconfig, gconfig = self.__resolve_guard_config(guard_config)
+
+        async def scan_window(text: str) -> ScanResponseMatch:
+            return await self.__scan_async(
+                text,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                request_guard_config=request_gconfig,
+                guard_config=gconfig,
+            )
+
+        return AsyncStreamScan(
+            chunks, scan_window, gconfig, TextWindower(window, overlap, sentences), stop_on_match, max_in_flight,
+        )
+
+    def __scan(
+        self,
+        *messages: str,
+        files: Union[Sequence[Union[str,os.PathLike]], os.PathLike, str, None] = None,
+        request_type: Union[Type,str] = Type.INPUT,
+        annotations: Optional[Dict[str, str]] = None,
+        redactions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        request_guard_config: Optional[GuardConfig] = None,
+        guard_config: GuardConfig,
+    ) -> ScanResponseMatch:
+        """
+        Builds and runs a scan request, and evaluates its response against the guard config.
+        The phases are timed only if a scan timing hook is configured.
+        """
+        if self.scan_timing_hook is None:
+            return ScanResponseMatch(self.__scan_request_cached(self.__build_scan_request(
+                *messages,
+                files=files,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                guard_config=request_guard_config,
+            )), guard_config, files=files)
+
+        timer, token = self.scan_timing_hook.start()
+        match: Optional[ScanResponseMatch] = None
+        try:
+            request = self.__build_scan_request(
+                *messages,
+                files=files,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                guard_config=request_guard_config,
+            )
+            timer.mark_built()
+            response = self.__scan_request_cached(request)
+            timer.mark_returned()
+            match = ScanResponseMatch(response, guard_config, files=files)
+        finally:
+            # the timings of failed scans are not exported
+            timings = self.scan_timing_hook.finish(timer, token, match.scan_response if match else None)
+        match.timings = timings
+        return match
+
+    async def __scan_async(
+        self,
+        *messages: str,
+        files: Union[Sequence[Union[str,os.PathLike]], os.PathLike, str, None] = None,
+        request_type: Union[Type,str] = Type.INPUT,
+        annotations: Optional[Dict[str, str]] = None,
+        redactions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        request_guard_config: Optional[GuardConfig] = None,
+        guard_config: GuardConfig,
+    ) -> ScanResponseMatch:
+        """
+        Async variant of __scan().
+        """
+        if self.scan_timing_hook is None:
+            return ScanResponseMatch(await self.__scan_request_cached_async(self.__build_scan_request(
+                *messages,
+                files=files,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                guard_config=request_guard_config,
+                file_extractions=await self.__read_files_async(files),
+            )), guard_config, files=files)
+
+        timer, token = self.scan_timing_hook.start()
+        match: Optional[ScanResponseMatch] = None
+        try:
+            request = self.__build_scan_request(
+                *messages,
+                files=files,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                guard_config=request_guard_config,
+                file_extractions=await self.__read_files_async(files),
+            )
+            timer.mark_built()
+            response = await self.__scan_request_cached_async(request)
+            timer.mark_returned()
+            match = ScanResponseMatch(response, guard_config, files=files)
+        finally:
+            timings = self.scan_timing_hook.finish(timer, token, match.scan_response if match else None)
+        match.timings = timings
+        return match
+
+    @staticmethod
+    def __check_chunked_scan(
+        redactions: Optional[List[str]],
+        request_guard_config: Optional[GuardConfig],
+        concurrency: int,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("chunk_concurrency must be at least 1")
+        # the redacted chunks can't be stitched back into the redacted message
+        if redactions or (request_guard_config and request_guard_config.redaction_keys):
+            raise ValueError("Cannot use redactions with chunked scans.")
+
+    def __scan_chunked(
+        self,
+        plan: ChunkedScan,
+        *,
+        files: Union[Sequence[Union[str,os.PathLike]], os.PathLike, str, None] = None,
+        request_type: Union[Type,str] = Type.INPUT,
+        annotations: Optional[Dict[str, str]] = None,
+        redactions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        request_guard_config: Optional[GuardConfig] = None,
+        guard_config: GuardConfig,
+        concurrency: int,
+    ) -> ScanResponseMatch:
+        """
+        Scans the chunks of the oversized messages of a ChunkedScan concurrently, along with the
+        files and the other messages, and evaluates the merged response against the guard config.
+
+        The chunked scan is timed as a whole: building the requests of its parts is accounted
+        as serialize, the network phase runs from the first request sent to the last response
+        received, and merging the responses is accounted as unmarshal.
+        """
+        self.__check_chunked_scan(redactions, request_guard_config, concurrency)
+
+        def scan_part(*messages: str, part_files=None) -> Scanresponse:
+            return self.__scan_request_cached(self.__build_scan_request(
+                *messages,
+                files=part_files,
+                request_type=request_type,
+                annotations=annotations,
+                redactions=redactions,
+                keywords=keywords,
+                guard_config=request_guard_config,
+            ))
+
+        def scan_parts() -> Scanresponse:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                # the parts run in the context of the scan, e.g. to be timed with it
+                base = None
+                if plan.base_messages or files is not None:
+                    base = executor.submit(contextvars.copy_context().run, scan_part, *plan.base_messages, part_files=files)
+                chunks = [executor.submit(contextvars.copy_context().run, scan_part, text) for _, _, text in plan.chunks]
+                return plan.merge(
+                    base.result() if base is not None else None,
+                    [chunk.result() for chunk in chunks],
+                )
+
+        if self.scan_timing_hook is None:
+            return ScanResponseMatch(scan_parts(), guard_config, files=files)
+
+        timer, token = self.scan_timing_hook.start()
+        match: Optional[ScanResponseMatch] = None
+        try:
+            timer.mark_built()
+            response = scan_parts()
+            timer.mark_returned()
+            match = ScanResponseMatch(response, guard_config, files=files)
+        finally:
+            timings = self.scan_timing_hook.finish(timer, token, match.scan_response if match else None)
+        match.timings = timings
+        return match
+
+    async def __scan_chunked_async(
+        self,
+        plan: ChunkedScan,
+        *,
+        files: Union[Sequence[Union[str,os.PathLike]], os.PathLike, str, None] = None,
+        request_type: Union[Type,str] = Type.INPUT,
+        annotations: Optional[Dict[str, str]] = None,
+        redactions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None,
+        request_guard_config: Optional[GuardConfig] = None,
+        guard_config: GuardConfig,
+        concurrency: int,
+    ) -> ScanResponseMatch:
+        """
+        Async variant of __scan_chunked().
+        """
+        self.__check_chunked_scan(redactions, request_guard_config, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scan_part(*messages: str, part_files=None) -> Scanresponse:
+            async with semaphore:
+                return await self.__scan_request_cached_async(self.__build_scan_request(
+                    *messages,
+                    files=part_files,
+                    request_type=request_type,
+                    annotations=annotations,
+                    redactions=redactions,
+                    keywords=keywords,
+                    guard_config=request_guard_config,
+                    file_extractions=await self.__read_files_async(part_files),
+                ))
+
+        async def scan_parts() -> Scanresponse:
+            parts = [scan_part(text) for _, _, text in plan.chunks]
+            has_base = bool(plan.base_messages) or files is not None
+            if has_base:
+                parts.insert(0, scan_part(*plan.base_messages, part_files=files))
+            responses = await asyncio.gather(*parts)
+            return plan.merge(responses[0] if has_base else None, responses[1:] if has_base else responses)
+
+        if self.scan_timing_hook is None:
+            return ScanResponseMatch(await scan_parts(), guard_config, files=files)
+
+        timer, token = self.scan_timing_hook.start()
+        match: Optional[ScanResponseMatch] = None
+        try:
+            timer.mark_built()
+            response = await scan_parts()
+            timer.mark_returned()
+            match = ScanResponseMatch(response, guard_config, files=files)
+        finally:
+            timings = self.scan_timing_hook.finish(timer, token, match.scan_response if match else None)
+        match.timings = timings
+        return match
+
+    def __scan_cache_key(self, request: Scanrequest) -> str:
+        """
+        Returns the key of the scan request in the scan cache, scoped to the Apex and the credentials of the SDK.
+        """
+        security = get_security_from_env(self.sdk_configuration.security, Security)
+        if callable(security):
+            security = security()
+        return scan_request_key(request, scan_cache_scope(
+            self._get_url(None, None),
+            getattr(security, "token", None),
+            getattr(security, "cookie", None),
         ))
+
+    def __scan_request_cached(self, request: Scanrequest) -> Scanresponse:
+        """
+        Runs the scan request, serving it from the scan cache if one is configured.
+        """
+        if self.scan_cache is None:
+            return self.__send_scan_request(request)
+
+        key = self.__scan_cache_key(request)
+        cached = self.scan_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.__send_scan_request(request)
+        self.scan_cache.set(key, response)
+        return response
+
+    async def __scan_request_cached_async(self, request: Scanrequest) -> Scanresponse:
+        """
+        Runs the scan request asynchronously, serving it from the scan cache if one is configured.
+        """
+        if self.scan_cache is None:
+            return await self.__send_scan_request_async(request)
+
+        key = self.__scan_cache_key(request)
+        cached = self.scan_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.__send_scan_request_async(request)
+        self.scan_cache.set(key, response)
+        return response
+
+    def __send_scan_request(self, request: Scanrequest) -> Scanresponse:
+        """
+        Sends the scan request, batched with concurrent scans if a scan coalescer is configured.
+        """
+        if self.scan_coalescer is None:
+            return self.scan_request(request=request)
+        return self.scan_coalescer.scan(request, lambda r: self.scan_request(request=r))
+
+    async def __send_scan_request_async(self, request: Scanrequest) -> Scanresponse:
+        """
+        Sends the scan request asynchronously, batched with concurrent scans if a scan coalescer is configured.
+        """
+        if self.scan_coalescer is None:
+            return await self.scan_request_async(request=request)
+        return await self.scan_coalescer.scan_async(request, lambda r: self.scan_request_async(request=r))
+
+    def __analyzer_catalog_key(self) -> str:
+        """
+        Returns the key of the analyzer catalog of this SDK instance: the Apex URL and the token.
+        """
+        security = self.sdk_configuration.security
+        if callable(security):
+            security = security()
+        token = ""
+        if security is not None:
+            token = security.token or security.cookie or ""
+        return self.analyzer_catalog_cache.key(self._get_url(None, None), token)
+
+    @staticmethod
+    def __resolve_guard_config(
+        guard_config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]],
+    ) -> Tuple[Optional[GuardConfig], GuardConfig]:
+        """
+        Resolves the guard config once per scan, reusing previously parsed configs.
+        Returns the config for the scan request (None if none was given) and the config for the ScanResponseMatch.
+        """
+        if guard_config is None:
+            return None, GuardConfig.load()
+
+        gconfig = GuardConfig.load(guard_config)
         # always send a guard config to the ScanResponseMatch
-        try:
-            if guard_config:
-                gconfig = GuardConfig(guard_config)
-            else:
-                gconfig = GuardConfig()
-        except Exception as e:
-            logger.debug("Error while processing the guard config")
-            raise ValueError("Cannot process the guard config") from e
+        return gconfig, gconfig if guard_config else GuardConfig.load()
 
-        return ScanResponseMatch(raw_scan_response, gconfig, files=files)
+    @staticmethod
+    def __unpack_scan_item(
+        item: ScanItem,
+    ) -> Tuple[Tuple[str, ...], Union[Sequence[Union[str,os.PathLike]], os.PathLike, str, None]]:
+        """
+        Splits a batch item into the messages and files arguments of a scan.
+        """
+        if isinstance(item, str):
+            return (item,), None
+        if isinstance(item, tuple) and len(item) == 2:
+            message, files = item
+            return ((message,) if message is not None else ()), files
+        raise ValueError("scan items must be a message or a (message, files) tuple")
+
+    @staticmethod
+    def __file_paths(
+        files: Union[Sequence[Union[str,os.PathLike]], os.PathLike, str],
+    ) -> List[Union[os.PathLike, str]]:
+        """
+        Checks the files to scan: a list of strings (or paths) or a single string (or path).
+        """
+        if isinstance(files, (str, os.PathLike)):
+            return [files]
+        if not isinstance(files, Iterable):
+            raise ValueError("files must be strings or paths")
+        paths: List[Union[os.PathLike, str]] = []
+        for file in files:
+            if not isinstance(file, str) and not isinstance(file, os.PathLike):
+                raise ValueError("files must be strings or paths")
+            paths.append(file)
+        return paths
+
+    def __file_extraction(self, path: Union[str, os.PathLike]) -> Extractionrequest:
+        """
+        Reads a file to scan into an extraction, or sets it up to be streamed into the request.
+        """
+        if self.file_streaming_hook is not None:
+            streamed = self.file_streaming_hook.file(path)
+            if streamed is not None:
+                # the content is base64 encoded from disk into the request body when it is sent
+                return Extractionrequest.model_construct(data=streamed)
+        with open(path, 'rb') as opened_file:
+            file_content = opened_file.read()
+        # base64 encode the file content
+        return Extractionrequest(data=base64.b64encode(file_content).decode("utf-8"))
+
+    async def __read_files_async(
+        self,
+        files: Union[Sequence[Union[str,os.PathLike]], os.PathLike, str, None],
+    ) -> Optional[List[Extractionrequest]]:
+        """
+        Reads the files to scan in parallel, off the event loop, in the file reading thread
+        pool bounding the number of files read at once across all the scans of this instance.
+        """
+        if files is None:
+            return None
+        paths = self.__file_paths(files)
+        if not paths:
+            return []
+        with self.__file_executor_lock:
+            if self.__file_executor is None:
+                self.__file_executor = ThreadPoolExecutor(
+                    max_workers=self.file_read_workers, thread_name_prefix="acuvity-file-read",
+                )
+                # the threads don't outlive an SDK that is never closed
+                weakref.finalize(self, self.__file_executor.shutdown, wait=False)
+            executor = self.__file_executor
+        loop = asyncio.get_running_loop()
+        return list(await asyncio.gather(*(
+            loop.run_in_executor(executor, self.__file_extraction, path) for path in paths
+        )))
 
     def __build_scan_request(
         self,
@@ -171,7 +929,12 @@ class ApexExtended(Apex):
         keywords: Optional[List[str]] = None,
         anonymization: Union[Anonymization, str, None] = None,
         guard_config: Optional[GuardConfig] = None,
+        file_extractions: Optional[List[Extractionrequest]] = None,
     ) -> Scanrequest:
+        """
+        Builds a scan request. The files are read here unless their extractions are given
+        with `file_extractions`, as read by __read_files_async().
+        """
         request = Scanrequest.model_construct()
 
         # if guard_config is given, the keywords and redactions args must not be given.
@@ -187,30 +950,10 @@ class ApexExtended(Apex):
         if len(messages) > 0:
             request.messages = list(messages)
 
-        # files must be a list of strings (or paths) or a single string (or path)
-        extractions: List[Extractionrequest] = []
-        if files is not None:
-            process_files: List[Union[os.PathLike, str]] = []
-            if isinstance(files, str):
-                process_files.append(files)
-            elif isinstance(files, os.PathLike):
-                process_files.append(files)
-            elif isinstance(files, Iterable):
-                for file in files:
-                    if not isinstance(file, str) and not isinstance(file, os.PathLike):
-                        raise ValueError("files must be strings or paths")
-                    process_files.append(file)
-            else:
-                raise ValueError("files must be strings or paths")
-            for process_file in process_files:
-                with open(process_file, 'rb') as opened_file:
-                    file_content = opened_file.read()
-                    # base64 encode the file content and then append
-                    extractions.append(Extractionrequest(
-                        data=base64.b64encode(file_content).decode("utf-8"),
-                    ))
-        if len(extractions) > 0:
-            request.extractions = extractions
+        if file_extractions is None and files is not None:
+            file_extractions = [self.__file_extraction(path) for path in self.__file_paths(files)]
+        if file_extractions:
+            request.extractions = file_extractions
 
         # request_type must be either "Input" or "Output"
         if isinstance(request_type, Type):
@@ -1,9 +1,15 @@
-"""Code generated by Speakeasy (https://speakeasy.com). DO NOT EDIT."""
+"""Code originally generated by Speakeasy (https://speakeasy.com)."""
 
 from .sdkconfiguration import SDKConfiguration
 from acuvity import models, utils
 from acuvity._hooks import AfterErrorContext, AfterSuccessContext, BeforeRequestContext
 from acuvity.utils import RetryConfig, SerializedRequestBody, get_body_content
+from acuvity.utils.logger import get_response_content, is_debug_enabled
+from acuvity.utils.retries import (
+    CIRCUIT_BREAKER_STATUS_CODES,
+    with_circuit_breaker,
+    with_circuit_breaker_async,
+)
 import httpx
 from typing import Callable, List, Mapping, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
@@ -213,6 +219,10 @@ class BaseSDK:
     ) -> httpx.Response:
         client = self.sdk_configuration.client
         logger = self.sdk_configuration.debug_logger
+        rate_limiter = self.sdk_configuration.rate_limiter
+        # the request and response bodies are only read for logging if debug messages are logged
+        debug = is_debug_enabled(logger)
+        body_limit = self.sdk_configuration.debug_body_limit
 
         def do():
             http_res = None
@@ -220,18 +230,23 @@ class BaseSDK:
                 req = self.sdk_configuration.get_hooks().before_request(
                     BeforeRequestContext(hook_ctx), request
                 )
-                logger.debug(
-                    "Request:\nMethod: %s\nURL: %s\nHeaders: %s\nBody: %s",
-                    req.method,
-                    req.url,
-                    req.headers,
-                    get_body_content(req),
-                )
+                if debug:
+                    logger.debug(
+                        "Request:\nMethod: %s\nURL: %s\nHeaders: %s\nBody: %s",
+                        req.method,
+                        req.url,
+                        req.headers,
+                        get_body_content(req, body_limit),
+                    )
 
                 if client is None:
                     raise ValueError("client is required")
 
+                if rate_limiter is not None:
+                    rate_limiter.acquire()
                 http_res = client.send(req, stream=stream)
+                if rate_limiter is not None:
+                    rate_limiter.record_response(http_res)
             except Exception as e:
                 _, e = self.sdk_configuration.get_hooks().after_error(
                     AfterErrorContext(hook_ctx), None, e
@@ -244,13 +259,14 @@ class BaseSDK:
                 logger.debug("Raising no response SDK error")
                 raise models.APIError("No response received")
 
-            logger.debug(
-                "Response:\nStatus Code: %s\nURL: %s\nHeaders: %s\nBody: %s",
-                http_res.status_code,
-                http_res.url,
-                http_res.headers,
-                "<streaming response>" if stream else http_res.text,
-            )
+            if debug:
+                logger.debug(
+                    "Response:\nStatus Code: %s\nURL: %s\nHeaders: %s\nBody: %s",
+                    http_res.status_code,
+                    http_res.url,
+                    http_res.headers,
+                    "<streaming response>" if stream else get_response_content(http_res, body_limit),
+                )
 
             if utils.match_status_codes(error_status_codes, http_res.status_code):
                 result, err = self.sdk_configuration.get_hooks().after_error(
@@ -268,7 +284,16 @@ class BaseSDK:
             return http_res
 
         if retry_config is not None:
-            http_res = utils.retry(do, utils.Retries(retry_config[0], retry_config[1]))
+            http_res = utils.retry(do, utils.Retries(
+                retry_config[0],
+                retry_config[1],
+                self.sdk_configuration.circuit_breaker,
+                self.sdk_configuration.retry_budget,
+            ))
+        elif self.sdk_configuration.circuit_breaker is not None:
+            http_res = with_circuit_breaker(
+                do, self.sdk_configuration.circuit_breaker, CIRCUIT_BREAKER_STATUS_CODES
+            )()
         else:
             http_res = do()
 
@@ -289,6 +314,10 @@ class BaseSDK:
     ) -> httpx.Response:
         client = self.sdk_configuration.async_client
         logger = self.sdk_configuration.debug_logger
+        rate_limiter = self.sdk_configuration.rate_limiter
+        # the request and response bodies are only read for logging if debug messages are logged
+        debug = is_debug_enabled(logger)
+        body_limit = self.sdk_configuration.debug_body_limit
 
         async def do():
             http_res = None
@@ -296,18 +325,23 @@ class BaseSDK:
                 req = self.sdk_configuration.get_hooks().before_request(
                     BeforeRequestContext(hook_ctx), request
                 )
-                logger.debug(
-                    "Request:\nMethod: %s\nURL: %s\nHeaders: %s\nBody: %s",
-                    req.method,
-                    req.url,
-                    req.headers,
-                    get_body_content(req),
-                )
+                if debug:
+                    logger.debug(
+                        "Request:\nMethod: %s\nURL: %s\nHeaders: %s\nBody: %s",
+                        req.method,
+                        req.url,
+                        req.headers,
+                        get_body_content(req, body_limit),
+                    )
 
                 if client is None:
                     raise ValueError("client is required")
 
+                if rate_limiter is not None:
+                    await rate_limiter.acquire_async()
                 http_res = await client.send(req, stream=stream)
+                if rate_limiter is not None:
+                    rate_limiter.record_response(http_res)
             except Exception as e:
                 _, e = self.sdk_configuration.get_hooks().after_error(
                     AfterErrorContext(hook_ctx), None, e
@@ -320,13 +354,14 @@ class BaseSDK:
                 logger.debug("Raising no response SDK error")
                 raise models.APIError("No response received")
 
-            logger.debug(
-                "Response:\nStatus Code: %s\nURL: %s\nHeaders: %s\nBody: %s",
-                http_res.status_code,
-                http_res.url,
-                http_res.headers,
-                "<streaming response>" if stream else http_res.text,
-            )
+            if debug:
+                logger.debug(
+                    "Response:\nStatus Code: %s\nURL: %s\nHeaders: %s\nBody: %s",
+                    http_res.status_code,
+                    http_res.url,
+                    http_res.headers,
+                    "<streaming response>" if stream else get_response_content(http_res, body_limit),
+                )
 
             if utils.match_status_codes(error_status_codes, http_res.status_code):
                 result, err = self.sdk_configuration.get_hooks().after_error(
@@ -344,9 +379,16 @@ class BaseSDK:
             return http_res
 
         if retry_config is not None:
-            http_res = await utils.retry_async(
-                do, utils.Retries(retry_config[0], retry_config[1])
-            )
+            http_res = await utils.retry_async(do, utils.Retries(
+                retry_config[0],
+                retry_config[1],
+                self.sdk_configuration.circuit_breaker,
+                self.sdk_configuration.retry_budget,
+            ))
+        elif self.sdk_configuration.circuit_breaker is not None:
+            http_res = await with_circuit_breaker_async(
+                do, self.sdk_configuration.circuit_breaker, CIRCUIT_BREAKER_STATUS_CODES
+            )()
         else:
             http_res = await do()
 
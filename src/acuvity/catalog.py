@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from acuvity.models import Analyzer, Detector
+from acuvity.utils.logger import get_default_logger
+
+logger = get_default_logger()
+
+
+class AnalyzerCatalog:
+    """
+    Immutable snapshot of the analyzers of an Apex, indexed for constant time lookups
+    of detectors by group, by name and by analyzer.
+    """
+
+    def __init__(self, analyzers: List[Analyzer]):
+        """
+        Index the analyzers returned by list_analyzers().
+
+        Args:
+            analyzers: The analyzers of the Apex
+        """
+        self.analyzers: Tuple[Analyzer, ...] = tuple(analyzers)
+        self._by_analyzer: Dict[str, Analyzer] = {}
+        self._detectors_by_analyzer: Dict[str, Tuple[Detector, ...]] = {}
+        self._detectors_by_name: Dict[str, Tuple[Detector, ...]] = {}
+        self._detector_names_by_group: Dict[str, Tuple[str, ...]] = {}
+
+        by_name: Dict[str, List[Detector]] = {}
+        names_by_group: Dict[str, Set[str]] = {}
+        for analyzer in self.analyzers:
+            detectors = tuple(analyzer.detectors or [])
+            if analyzer.name is not None:
+                self._by_analyzer[analyzer.name] = analyzer
+                self._detectors_by_analyzer[analyzer.name] = detectors
+            for detector in detectors:
+                if detector.name is not None:
+                    by_name.setdefault(detector.name, []).append(detector)
+                if detector.group is not None:
+                    names_by_group.setdefault(detector.group, set()).add(str(detector.name))
+
+        self._detectors_by_name = {name: tuple(detectors) for name, detectors in by_name.items()}
+        self._detector_names_by_group = {group: tuple(sorted(names)) for group, names in names_by_group.items()}
+
+    def detector_names(self, group: str) -> List[str]:
+        """
+        Returns the sorted names of the detectors of a group, e.g. "Secrets" or "PIIs".
+        """
+        return list(self._detector_names_by_group.get(group, ()))
+
+    def groups(self) -> List[str]:
+        """
+        Returns the sorted detector groups.
+        """
+        return sorted(self._detector_names_by_group)
+
+    def detectors(self, name: str) -> List[Detector]:
+        """
+        Returns the detectors with the given name, one per analyzer providing it.
+        """
+        return list(self._detectors_by_name.get(name, ()))
+
+    def has_detector(self, name: str, group: Optional[str] = None) -> bool:
+        """
+        Tells if a detector with the given name exists, optionally restricted to a group.
+        """
+        if group is None:
+            return name in self._detectors_by_name
+        return any(detector.group == group for detector in self._detectors_by_name.get(name, ()))
+
+    def analyzer(self, name: str) -> Optional[Analyzer]:
+        """
+        Returns the analyzer with the given name, or None.
+        """
+        return self._by_analyzer.get(name)
+
+    def analyzer_detectors(self, name: str) -> List[Detector]:
+        """
+        Returns the detectors of the analyzer with the given name.
+        """
+        return list(self._detectors_by_analyzer.get(name, ()))
+
+
+class AnalyzerCatalogCache:
+    """
+    Process-wide cache of analyzer catalogs, shared by all SDK instances.
+
+    Catalogs are keyed by the Apex URL and a fingerprint of the token. Once a catalog is
+    older than `ttl` seconds, it is still served while a single background refresh
+    fetches a new one: in a thread for sync callers, in a task for async callers.
+    """
+
+    def __init__(self, ttl: float = 600.0):
+        """
+        Args:
+            ttl: Time in seconds after which a catalog is refreshed
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, AnalyzerCatalog]] = {}
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def key(server_url: str, token: str) -> str:
+        """
+        Returns the cache key for an Apex URL and a token.
+        """
+        return f"{server_url}#{hashlib.sha256(token.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str, fetch: Callable[[], List[Analyzer]]) -> AnalyzerCatalog:
+        """
+        Returns the catalog for the key, fetching it on the first use and refreshing
+        it in a background thread once expired.
+        """
+        catalog, stale = self._lookup(key)
+        if catalog is None:
+            # concurrent first uses of a key wait for a single fetch
+            with self._fetch_lock(key):
+                catalog, stale = self._lookup(key)
+                if catalog is None:
+                    return self._store(key, fetch())
+        if stale and self._start_refresh(key):
+            threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+        return catalog
+
+    async def get_async(self, key: str, fetch: Callable[[], Awaitable[List[Analyzer]]]) -> AnalyzerCatalog:
+        """
+        Returns the catalog for the key, fetching it on the first use and refreshing
+        it in a background task once expired.
+        """
+        catalog, stale = self._lookup(key)
+        if catalog is None:
+            return self._store(key, await fetch())
+        if stale and self._start_refresh(key):
+            task = asyncio.get_running_loop().create_task(self._refresh_async(key, fetch))
+            # hold a reference until the refresh is done, the event loop only keeps weak ones
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return catalog
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drops the catalog for the key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drops all catalogs.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: str) -> Tuple[Optional[AnalyzerCatalog], bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        fetched_at, catalog = entry
+        return catalog, time.monotonic() - fetched_at >= self.ttl
+
+    def _store(self, key: str, analyzers: List[Analyzer]) -> AnalyzerCatalog:
+        catalog = AnalyzerCatalog(analyzers)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), catalog)
+        return catalog
+
+    def _fetch_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._fetch_locks.setdefault(key, threading.Lock())
+
+    def _start_refresh(self, key: str) -> bool:
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _refresh(self, key: str, fetch: Callable[[], List[Analyzer]]) -> None:
+        try:
+            self._store(key, fetch())
+        except Exception: # pylint: disable=broad-exception-caught
+            # keep serving the stale catalog, the next lookup retries the refresh
+            logger.debug("Failed to refresh the analyzer catalog", exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _refresh_async(self, key: str, fetch: Callable[[], Awaitable[List[Analyzer]]]) -> None:
+        try:
+            self._store(key, await fetch())
+        except Exception: # pylint: disable=broad-exception-caught
+            # keep serving the stale catalog, the next lookup retries the refresh
+            logger.debug("Failed to refresh the analyzer catalog", exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+_default_cache = AnalyzerCatalogCache()
+
+
+def default_analyzer_catalog_cache() -> AnalyzerCatalogCache:
+    """
+    Returns the process-wide analyzer catalog cache used by all SDK instances.
+    """
+    return _default_cache
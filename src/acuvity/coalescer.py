@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from acuvity.models import Scanrequest, Scanresponse
+
+
+def coalesce_key(request: Scanrequest) -> str:
+    """
+    Returns the key of the batch a single-message request can join: requests with the
+    same type, annotations, keywords, redactions, analyzers and policies share a key.
+    """
+    key_material = request.model_dump(mode="json", by_alias=True, exclude_none=True, exclude={"messages"})
+    return hashlib.sha256(
+        json.dumps(key_material, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def _merge(requests: List[Scanrequest]) -> Scanrequest:
+    return requests[0].model_copy(update={"messages": [r.messages[0] for r in requests if r.messages]})
+
+
+def _split(response: Scanresponse, count: int) -> List[Scanresponse]:
+    extractions = response.extractions or []
+    if len(extractions) != count:
+        raise ValueError(f"batched scan returned {len(extractions)} extractions for {count} messages")
+    return [response.model_copy(update={"extractions": [extraction]}) for extraction in extractions]
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.requests: List[Scanrequest] = []
+        self.responses: Optional[List[Scanresponse]] = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class _AsyncBatch:
+    def __init__(self) -> None:
+        self.requests: List[Scanrequest] = []
+        self.responses: Optional[List[Scanresponse]] = None
+        self.full = asyncio.Event()
+        self.done = asyncio.Event()
+
+
+class ScanCoalescer:
+    """
+    Coalesces concurrent single-message scans into one scan request.
+
+    The first scan of a batch waits up to `max_delay` seconds, or until `max_size` scans
+    joined, then sends all messages in one request and hands each caller the extraction
+    of its own message. Only scans with one message, no files and the same request
+    parameters are batched together; any other scan is sent on its own.
+
+    If a batch fails, each of its scans is retried on its own, so that a single bad
+    message does not fail the others. Request-level fields of the response (decision,
+    alerts, reasons, summary) describe the whole batch.
+    """
+
+    def __init__(self, max_size: int = 32, max_delay: float = 0.005):
+        """
+        Args:
+            max_size: Maximum number of messages sent in one request
+            max_delay: Maximum time in seconds a scan waits for others to join its batch
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must be positive")
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._open: Dict[str, _Batch] = {}
+        self._open_async: Dict[Tuple[int, str], _AsyncBatch] = {}
+
+    def _close(self, key: str, batch: _Batch) -> None:
+        with self._lock:
+            if self._open.get(key) is batch:
+                del self._open[key]
+
+    def _close_async(self, key: Tuple[int, str], batch: _AsyncBatch) -> None:
+        if self._open_async.get(key) is batch:
+            del self._open_async[key]
+
+    @staticmethod
+    def eligible(request: Scanrequest) -> bool:
+        """
+        Tells if a request can be batched: it has exactly one message and no files.
+        """
+        return request.messages is not None and len(request.messages) == 1 and not request.extractions
+
+    def scan(self, request: Scanrequest, send: Callable[[Scanrequest], Scanresponse]) -> Scanresponse:
+        """
+        Scans the request in a batch with the concurrent scans of other threads.
+
+        Args:
+            request: The scan request
+            send: Sends a scan request to Apex
+        """
+        if not self.eligible(request):
+            return send(request)
+
+        key = coalesce_key(request)
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if batch is None:
+                batch = _Batch()
+                self._open[key] = batch
+            index = len(batch.requests)
+            batch.requests.append(request)
+            if len(batch.requests) >= self.max_size:
+                del self._open[key]
+                batch.full.set()
+
+        if leader:
+            try:
+                batch.full.wait(self.max_delay)
+                self._close(key, batch)
+                batch.responses = _split(send(_merge(batch.requests)), len(batch.requests))
+            except Exception: # pylint: disable=broad-exception-caught
+                if len(batch.requests) == 1:
+                    raise
+            finally:
+                self._close(key, batch)
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.responses is None:
+            return send(request)
+        return batch.responses[index]
+
+    async def scan_async(self, request: Scanrequest, send: Callable[[Scanrequest], Awaitable[Scanresponse]]) -> Scanresponse:
+        """
+        Scans the request in a batch with the concurrent scans of other tasks of the event loop.
+
+        Args:
+            request: The scan request
+            send: Sends a scan request to Apex
+        """
+        if not self.eligible(request):
+            return await send(request)
+
+        key = (id(asyncio.get_running_loop()), coalesce_key(request))
+        batch = self._open_async.get(key)
+        leader = batch is None
+        if batch is None:
+            batch = _AsyncBatch()
+            self._open_async[key] = batch
+        index = len(batch.requests)
+        batch.requests.append(request)
+        if len(batch.requests) >= self.max_size:
+            del self._open_async[key]
+            batch.full.set()
+
+        if leader:
+            try:
+                try:
+                    await asyncio.wait_for(batch.full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._close_async(key, batch)
+                batch.responses = _split(await send(_merge(batch.requests)), len(batch.requests))
+            except Exception: # pylint: disable=broad-exception-caught
+                if len(batch.requests) == 1:
+                    raise
+            finally:
+                # on failure or cancellation, the other scans of the batch are sent on their own
+                self._close_async(key, batch)
+                batch.done.set()
+        else:
+            await batch.done.wait()
+
+        if batch.responses is None:
+            return await send(request)
+        return batch.responses[index]
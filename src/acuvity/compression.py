@@ -0,0 +1,132 @@
+import gzip
+import importlib.util
+from typing import Dict, Optional, Sequence
+
+import httpx
+
+from ._hooks.types import BeforeRequestContext, BeforeRequestHook
+
+ENCODINGS = ("gzip", "zstd")
+
+
+def _zstd_compress(data: bytes, level: Optional[int]) -> bytes:
+    try:
+        # Python 3.14+
+        from compression import zstd # type: ignore[import-not-found] # pylint: disable=import-outside-toplevel
+        return zstd.compress(data, level=level)
+    except ImportError:
+        pass
+    try:
+        import zstandard # type: ignore[import-not-found] # pylint: disable=import-outside-toplevel,import-error
+    except ImportError as e:
+        raise ImportError("zstd compression requires Python 3.14+ or the zstandard package: pip install 'acuvity[zstd]'") from e
+    return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    try:
+        from compression import zstd # type: ignore[import-not-found] # pylint: disable=import-outside-toplevel
+        return zstd.decompress(data)
+    except ImportError:
+        pass
+    import zstandard # type: ignore[import-not-found] # pylint: disable=import-outside-toplevel,import-error
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compresses data with a Content-Encoding, "gzip" or "zstd", at the level of the encoding or its default."""
+    if encoding == "gzip":
+        # the fastest level by default, as compressing is in the latency of the request; mtime=0 for reproducible bodies
+        return gzip.compress(data, compresslevel=1 if level is None else level, mtime=0)
+    if encoding == "zstd":
+        return _zstd_compress(data, level)
+    raise ValueError(f"unsupported encoding {encoding!r}, must be one of {', '.join(ENCODINGS)}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """Decompresses data compressed with a Content-Encoding, "gzip" or "zstd"."""
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd":
+        return _zstd_decompress(data)
+    raise ValueError(f"unsupported encoding {encoding!r}, must be one of {', '.join(ENCODINGS)}")
+
+
+# response encodings httpx can decode, and the package it needs to decode them
+_RESPONSE_DECODERS: Dict[str, Optional[str]] = {
+    "identity": None,
+    "gzip": None,
+    "deflate": None,
+    "br": "brotli",
+    "zstd": "zstandard",
+}
+
+
+def _can_decode(encoding: str) -> bool:
+    if encoding not in _RESPONSE_DECODERS:
+        return False
+    package = _RESPONSE_DECODERS[encoding]
+    if package == "brotli":
+        return importlib.util.find_spec("brotli") is not None or importlib.util.find_spec("brotlicffi") is not None
+    return package is None or importlib.util.find_spec(package) is not None
+
+
+class RequestCompression(BeforeRequestHook):
+    """
+    Compresses the bodies of the requests sent to Apex, and sets their Content-Encoding.
+
+    Only bodies of at least `threshold` bytes are compressed, so that short prompts are
+    not slowed down for nothing. Files streamed from disk (see `file_streaming_threshold`)
+    are sent uncompressed.
+
+    The encodings of the responses are negotiated separately: with `accept_encodings`,
+    the requests advertise exactly these encodings in their Accept-Encoding header, e.g.
+    ["identity"] to receive uncompressed responses. Otherwise the HTTP client's default
+    header is sent.
+    """
+
+    def __init__(
+        self,
+        encoding: str = "gzip",
+        threshold: int = 8192,
+        level: Optional[int] = None,
+        accept_encodings: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            encoding: Content-Encoding of the request bodies, "gzip" or "zstd"
+            threshold: Size in bytes from which request bodies are compressed
+            level: Compression level, defaults to 1 for gzip, the fastest, and 3 for zstd
+            accept_encodings: Response encodings to accept, among those the HTTP client can decode
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"unsupported encoding {encoding!r}, must be one of {', '.join(ENCODINGS)}")
+        if encoding == "zstd":
+            # fail now rather than on the first request
+            compress(b"", encoding, level)
+        if accept_encodings is not None:
+            for accept_encoding in accept_encodings:
+                if not _can_decode(accept_encoding):
+                    raise ValueError(f"responses encoded with {accept_encoding!r} can't be decoded")
+
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level
+        self.accept_encoding = ", ".join(accept_encodings) if accept_encodings is not None else None
+
+    def before_request(self, hook_ctx: BeforeRequestContext, request: httpx.Request) -> httpx.Request:
+        if self.accept_encoding is not None:
+            request.headers["Accept-Encoding"] = self.accept_encoding
+
+        # a streamed body hasn't been read, and is never compressed
+        if not hasattr(request, "_content") or "Content-Encoding" in request.headers:
+            return request
+        content = request.content
+        if len(content) < self.threshold:
+            return request
+
+        compressed = compress(content, self.encoding, self.level)
+        headers = request.headers.copy()
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        return httpx.Request(request.method, request.url, headers=headers, content=compressed, extensions=request.extensions)
@@ -0,0 +1,187 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import httpx
+
+from .utils.logger import Logger
+
+
+class _SharedTransport(httpx.BaseTransport):
+    """Transport of several clients, left open when one of them is closed."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.transport.handle_request(request)
+
+    def close(self) -> None:
+        pass
+
+
+class _AsyncSharedTransport(httpx.AsyncBaseTransport):
+    """Async variant of _SharedTransport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class ConnectionConfig:
+    """
+    Connection pool, keep-alive, HTTP/2 and timeout settings of the HTTP clients created by the SDK.
+
+    The defaults are those of httpx. Under high fan-out, raise `max_connections` and
+    `max_keepalive_connections` so that concurrent scans don't wait for a free connection
+    or open new ones, or enable `http2` to multiplex them over a few connections, which
+    requires the h2 package: pip install 'acuvity[http2]'.
+
+    With `prewarm`, that many connections to Apex are opened when the SDK is created, so that
+    the first scans don't pay for the DNS resolution and the TLS handshake. The synchronous
+    client is warmed up by Acuvity(), the async one by Acuvity.create_async().
+
+    With `share_transport`, the clients created with this config share one connection pool,
+    so that many SDK instances talking to the same Apex, e.g. one per tenant, don't each open
+    their own connections. The async pool must only be used from one event loop. The shared
+    pools are left open when the SDKs are closed, close() and aclose() close them.
+
+    Clients given to the SDK with `client` or `async_client` are used as they are.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        connect_timeout: Optional[float] = 5.0,
+        read_timeout: Optional[float] = 5.0,
+        write_timeout: Optional[float] = 5.0,
+        pool_timeout: Optional[float] = 5.0,
+        prewarm: int = 0,
+        share_transport: bool = False,
+    ):
+        """
+        Args:
+            max_connections: Maximum number of connections to Apex, None for no limit
+            max_keepalive_connections: Maximum number of idle connections kept open, None for no limit
+            keepalive_expiry: Seconds after which idle connections are closed, None to keep them open
+            http2: Use HTTP/2 with servers supporting it
+            connect_timeout: Seconds to wait for a connection to be established, None to wait forever
+            read_timeout: Seconds to wait for a chunk of a response, None to wait forever
+            write_timeout: Seconds to wait for a chunk of a request to be sent, None to wait forever
+            pool_timeout: Seconds to wait for a connection from the pool, None to wait forever
+            prewarm: Number of connections opened when the SDK is created
+            share_transport: Share one connection pool between all the clients created with this config
+        """
+        if prewarm < 0:
+            raise ValueError("prewarm must not be negative")
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.write_timeout = write_timeout
+        self.pool_timeout = pool_timeout
+        self.prewarm = prewarm
+        self.share_transport = share_transport
+        self._transport: Optional[_SharedTransport] = None
+        self._async_transport: Optional[_AsyncSharedTransport] = None
+        self._lock = threading.Lock()
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def client(self) -> httpx.Client:
+        """Creates a synchronous client with these settings."""
+        if not self.share_transport:
+            return httpx.Client(limits=self.limits, timeout=self.timeout, http2=self.http2)
+        with self._lock:
+            if self._transport is None:
+                self._transport = _SharedTransport(httpx.HTTPTransport(limits=self.limits, http2=self.http2))
+        return httpx.Client(transport=self._transport, timeout=self.timeout)
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Creates an async client with these settings."""
+        if not self.share_transport:
+            return httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+        with self._lock:
+            if self._async_transport is None:
+                self._async_transport = _AsyncSharedTransport(httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2))
+        return httpx.AsyncClient(transport=self._async_transport, timeout=self.timeout)
+
+    def close(self) -> None:
+        """Closes the shared synchronous connection pool, if any."""
+        with self._lock:
+            transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.transport.close()
+
+    async def aclose(self) -> None:
+        """Closes the shared async connection pool, if any."""
+        with self._lock:
+            transport, self._async_transport = self._async_transport, None
+        if transport is not None:
+            await transport.transport.aclose()
+
+    def _prewarm_count(self) -> int:
+        # a single HTTP/2 connection carries all the requests
+        count = 1 if self.http2 else self.prewarm
+        if self.max_keepalive_connections is not None:
+            count = min(count, self.max_keepalive_connections)
+        return min(count, self.prewarm)
+
+    def prewarm_client(self, client: httpx.Client, url: str, logger: Optional[Logger] = None) -> None:
+        """
+        Opens `prewarm` connections to `url` in the pool of `client`, with concurrent HEAD requests.
+        Failures are only logged: the scans will connect again.
+        """
+        count = self._prewarm_count()
+        if count == 0:
+            return
+
+        def head(_: int) -> None:
+            try:
+                client.head(url)
+            except httpx.HTTPError as e:
+                if logger is not None:
+                    logger.debug("Failed to prewarm a connection to %s: %s", url, e)
+
+        if count == 1:
+            head(0)
+            return
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            list(executor.map(head, range(count)))
+
+    async def prewarm_async_client(self, client: httpx.AsyncClient, url: str, logger: Optional[Logger] = None) -> None:
+        """Async variant of prewarm_client()."""
+        async def head() -> None:
+            try:
+                await client.head(url)
+            except httpx.HTTPError as e:
+                if logger is not None:
+                    logger.debug("Failed to prewarm a connection to %s: %s", url, e)
+
+        await asyncio.gather(*(head() for _ in range(self._prewarm_count())))
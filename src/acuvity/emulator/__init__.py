@@ -0,0 +1,19 @@
+from acuvity.emulator.server import (
+    ApexEmulator,
+    EmulatorConfig,
+    constant_latency,
+    lognormal_latency,
+    parse_latency,
+    synthetic_scan_response,
+    uniform_latency,
+)
+
+__all__ = [
+    'ApexEmulator',
+    'EmulatorConfig',
+    'constant_latency',
+    'uniform_latency',
+    'lognormal_latency',
+    'parse_latency',
+    'synthetic_scan_response'
+]
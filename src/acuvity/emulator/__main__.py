@@ -0,0 +1,152 @@
+"""
+Local Apex emulator and load generator.
+
+    python -m acuvity.emulator serve --port 8443 --latency lognormal:0.05,0.5 --rate-limit-rate 0.01
+    python -m acuvity.emulator load --url http://127.0.0.1:8443 --concurrency 32 --requests 2000
+    python -m acuvity.emulator load --embedded --latency constant:0.02 --concurrency 64 --async
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, cast
+
+from acuvity.emulator.server import ApexEmulator, EmulatorConfig, parse_latency
+
+
+def _config(args: argparse.Namespace) -> EmulatorConfig:
+    responses = None
+    if args.responses:
+        with open(args.responses, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        responses = loaded if isinstance(loaded, list) else [loaded]
+    return EmulatorConfig(
+        latency=parse_latency(args.latency) if args.latency else None,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        responses=responses,
+        seed=args.seed,
+        compress_responses=args.compress_responses,
+    )
+
+
+def _serve(args: argparse.Namespace) -> None:
+    async def run() -> None:
+        emulator = ApexEmulator(_config(args), host=args.host, port=args.port)
+        await emulator.start()
+        print(f"Apex emulator listening on {emulator.url}", flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await emulator.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def _report(latencies: List[float], errors: int, elapsed: float) -> None:
+    total = len(latencies) + errors
+    print(f"requests:   {total} ({errors} failed)")
+    print(f"elapsed:    {elapsed:.3f}s")
+    print(f"throughput: {total / elapsed:.1f} req/s")
+    if len(latencies) >= 2:
+        q = statistics.quantiles(latencies, n=100)
+        print(f"latency:    p50={q[49] * 1000:.2f}ms p90={q[89] * 1000:.2f}ms p99={q[98] * 1000:.2f}ms max={max(latencies) * 1000:.2f}ms")
+
+
+def _load(args: argparse.Namespace, url: str) -> None:
+    # imported here so that serving does not pay for importing the SDK
+    from acuvity import Acuvity, Security # pylint: disable=import-outside-toplevel
+    from acuvity.apexextend import ApexExtended # pylint: disable=import-outside-toplevel
+
+    client = Acuvity(security=Security(token=args.token), server_url=url)
+    # pylint infers the generated Apex, replaced by an ApexExtended when the SDK is created
+    apex = cast(ApexExtended, client.apex)
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one() -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            apex.scan(args.message) # pylint: disable=no-member
+        except Exception: # pylint: disable=broad-exception-caught
+            with lock:
+                errors += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    async def one_async(semaphore: asyncio.Semaphore) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await apex.scan_async(args.message) # pylint: disable=no-member
+            except Exception: # pylint: disable=broad-exception-caught
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    async def run_async() -> None:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        await asyncio.gather(*(one_async(semaphore) for _ in range(args.requests)))
+
+    start = time.perf_counter()
+    if args.use_async:
+        asyncio.run(run_async())
+    else:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            for _ in range(args.requests):
+                executor.submit(one)
+    _report(latencies, errors, time.perf_counter() - start)
+
+
+def _add_emulator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", help='latency distribution: "constant:S", "uniform:LOW,HIGH" or "lognormal:MEDIAN[,SIGMA]"')
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of scans failing with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of scans rejected with a 429")
+    parser.add_argument("--responses", help="JSON file of a recorded scan response, or of a list of them, to serve in turn")
+    parser.add_argument("--seed", type=int, help="seed of the random generator")
+    parser.add_argument("--compress-responses", action="store_true", help="gzip the responses to clients accepting gzip")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m acuvity.emulator", description="Local Apex emulator and load generator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the Apex emulator")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8443)
+    _add_emulator_arguments(serve)
+
+    load = commands.add_parser("load", help="send scans concurrently and report throughput and latency")
+    target = load.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="URL of the Apex to load")
+    target.add_argument("--embedded", action="store_true", help="load an emulator started in this process")
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--requests", type=int, default=1000)
+    load.add_argument("--async", dest="use_async", action="store_true", help="use scan_async instead of threads")
+    load.add_argument("--message", default="hello world")
+    load.add_argument("--token", default="emulator", help="token sent to the Apex")
+    _add_emulator_arguments(load)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        _serve(args)
+    elif args.embedded:
+        with ApexEmulator(_config(args)) as emulator:
+            _load(args, emulator.url)
+            print(f"served:     {dict((f'{path} {status}', count) for (path, status), count in emulator.stats.items())}")
+    else:
+        _load(args, args.url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import asyncio
+import itertools
+import json
+import math
+import random
+import threading
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from acuvity.compression import compress, decompress
+
+Latency = Callable[[random.Random], float]
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    415: "Unsupported Media Type",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+def constant_latency(seconds: float) -> Latency:
+    """Every request takes `seconds`."""
+    return lambda _: seconds
+
+
+def uniform_latency(low: float, high: float) -> Latency:
+    """Request latencies are uniformly distributed between `low` and `high` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> Latency:
+    """Request latencies follow a log-normal distribution, with a long tail for larger `sigma`."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def parse_latency(spec: str) -> Latency:
+    """
+    Parses a latency distribution given as "constant:S", "uniform:LOW,HIGH" or "lognormal:MEDIAN[,SIGMA]", in seconds.
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",")] if args else []
+        if kind == "constant" and len(values) == 1:
+            return constant_latency(values[0])
+        if kind == "uniform" and len(values) == 2:
+            return uniform_latency(values[0], values[1])
+        if kind == "lognormal" and len(values) in (1, 2):
+            return lognormal_latency(*values)
+    except ValueError as e:
+        raise ValueError(f"invalid latency: {spec}") from e
+    raise ValueError(f"invalid latency: {spec}")
+
+
+def synthetic_scan_response(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds a scan response echoing every message and file of the request as an extraction.
+    Messages containing "ignore" are flagged as prompt injections.
+    """
+    data = list(request.get("messages") or []) + [e.get("data", "") for e in request.get("extractions") or []]
+    response: Dict[str, Any] = {
+        "principal": {"type": "App", "authType": "Token"},
+        "decision": "Allow",
+        "type": request.get("type", "Input"),
+        "extractions": [
+            {
+                "data": d,
+                "exploits": {"prompt_injection": 1.0 if "ignore" in d.lower() else 0.0},
+                "malcontents": {"toxic": 0.0},
+                "languages": {"english": 1.0},
+            }
+            for d in data
+        ],
+    }
+    if request.get("annotations"):
+        response["annotations"] = request["annotations"]
+    return response
+
+
+@dataclass
+class EmulatorConfig:
+    """
+    Behavior of the emulated Apex.
+
+    Attributes:
+        latency: Distribution of the time taken by every scan, None for no latency
+        error_rate: Share of scans failing with a 500
+        rate_limit_rate: Share of scans rejected with a 429
+        retry_after: Value of the Retry-After header of 429 responses in seconds, None to omit it
+        responses: Recorded scan responses served in turn instead of synthetic ones
+        analyzers: Analyzers served by /_acuvity/analyzers
+        seed: Seed of the random generator, for reproducible runs
+        compress_responses: Gzip the responses of at least 1KiB to clients accepting gzip
+    """
+    latency: Optional[Latency] = None
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: Optional[float] = 1.0
+    responses: Optional[List[Dict[str, Any]]] = None
+    analyzers: List[Dict[str, Any]] = field(default_factory=lambda: [
+        {
+            "name": "text-detector",
+            "group": "Detectors",
+            "enabled": True,
+            "detectors": [
+                {"name": "email_address", "group": "PIIs"},
+                {"name": "ssn", "group": "PIIs"},
+                {"name": "aws_secret_key", "group": "Secrets"},
+            ],
+        },
+    ])
+    seed: Optional[int] = None
+    compress_responses: bool = False
+
+
+class ApexEmulator:
+    """
+    Local stand-in for an Apex, serving the scan, analyzers and well-known discovery
+    endpoints over plain HTTP/1.1 on 127.0.0.1.
+
+    It runs on a background thread with its own event loop:
+
+        with ApexEmulator(EmulatorConfig(latency=lognormal_latency(0.05))) as apex:
+            client = Acuvity(security=Security(token="token"), server_url=apex.url)
+
+    or in the running event loop with `await start()` and `await stop()`.
+    `stats` counts the requests served by path and status code.
+    """
+
+    def __init__(self, config: Optional[EmulatorConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            config: Behavior of the emulated Apex
+            host: Address to listen on
+            port: Port to listen on, 0 to pick a free one
+        """
+        self.config = config or EmulatorConfig()
+        self.host = host
+        self.port = port
+        self.stats: Counter = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._responses: Optional[Iterator[Dict[str, Any]]] = (
+            itertools.cycle(self.config.responses) if self.config.responses else None
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict["asyncio.Task[None]", asyncio.StreamWriter] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the emulator, to use as the server_url of the SDK."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """Starts serving in the running event loop."""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stops serving."""
+        if self._server is not None:
+            self._server.close()
+            # idle keep-alive connections would otherwise outlive the server
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def __enter__(self) -> "ApexEmulator":
+        started = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="apex-emulator", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+            self._thread = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                status, payload, extra_headers = await self._handle(
+                    method, path.split("?", 1)[0], body, headers.get("content-encoding", "identity"),
+                )
+                self.stats[(path, status)] += 1
+                content = json.dumps(payload).encode("utf-8")
+                if self.config.compress_responses and len(content) >= 1024 and "gzip" in headers.get("accept-encoding", ""):
+                    content = compress(content, "gzip")
+                    extra_headers["Content-Encoding"] = "gzip"
+                response_headers = {
+                    "Content-Type": "application/json",
+                    "Content-Length": str(len(content)),
+                    **extra_headers,
+                }
+                head = f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n" + "".join(
+                    f"{k}: {v}\r\n" for k, v in response_headers.items()
+                ) + "\r\n"
+                # a HEAD response has the headers of the GET response, without its body
+                writer.write(head.encode("latin-1") + (content if method != "HEAD" else b""))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+            self._connections.pop(task, None) # type: ignore[arg-type]
+
+    async def _handle(self, method: str, path: str, body: bytes, encoding: str) -> Tuple[int, Any, Dict[str, str]]:
+        if path == "/.well-known/acuvity/my-apex.json":
+            return 200, {"url": f"http://{self.host}", "portNoMTLS": self.port}, {}
+
+        if path == "/_acuvity/analyzers":
+            if method != "GET":
+                return 405, _error(405, "method not allowed"), {}
+            return 200, self.config.analyzers, {}
+
+        if path == "/_acuvity/scan":
+            if method != "POST":
+                return 405, _error(405, "method not allowed"), {}
+            if encoding != "identity":
+                try:
+                    body = decompress(body, encoding)
+                except (ValueError, OSError, ImportError, zlib.error):
+                    return 415, _error(415, f"can't decode {encoding} body"), {}
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError:
+                return 400, _error(400, "invalid JSON body"), {}
+
+            if self.config.latency is not None:
+                await asyncio.sleep(max(0.0, self.config.latency(self._rng)))
+
+            draw = self._rng.random()
+            if draw < self.config.rate_limit_rate:
+                headers = {}
+                if self.config.retry_after is not None:
+                    headers["Retry-After"] = f"{self.config.retry_after:g}"
+                return 429, _error(429, "rate limited"), headers
+            if draw < self.config.rate_limit_rate + self.config.error_rate:
+                return 500, _error(500, "emulated failure"), {}
+
+            if self._responses is not None:
+                return 200, next(self._responses), {}
+            return 200, synthetic_scan_response(request), {}
+
+        return 404, _error(404, "not found"), {}
+
+
+def _error(code: int, description: str) -> Dict[str, Any]:
+    return {"code": code, "title": _REASONS.get(code, ""), "description": description}
@@ -0,0 +1,151 @@
+import asyncio
+import base64
+import hashlib
+import os
+import re
+import secrets
+import weakref
+from typing import AsyncIterator, Iterator, List, Optional, Union
+
+import httpx
+
+from acuvity.timing import SCAN_OPERATION_ID
+
+from ._hooks.types import BeforeRequestContext, BeforeRequestHook
+
+# a multiple of 3, so that every chunk but the last one encodes without padding
+CHUNK_SIZE = 3 * 64 * 1024
+
+MARKER_PREFIX = "acuvity-streamed-file:"
+
+_MARKER_RE = re.compile(rb'"(' + re.escape(MARKER_PREFIX.encode()) + rb'[0-9a-f]{32})"')
+
+
+class StreamedFile(str):
+    """
+    Stands in for the base64 encoded content of a file in the extractions of a scan request.
+
+    Its value is a unique random marker, which is serialized in the JSON body of the
+    request like any string, and replaced when the request is sent by the content of
+    the file, read from disk and base64 encoded chunk by chunk.
+    """
+
+    path: str
+    size: int
+
+    def __new__(cls, path: Union[str, os.PathLike]) -> "StreamedFile":
+        self = super().__new__(cls, MARKER_PREFIX + secrets.token_hex(16))
+        self.path = os.fspath(path)
+        self.size = os.stat(self.path).st_size
+        return self
+
+    @property
+    def encoded_size(self) -> int:
+        """Size of the base64 encoded content."""
+        return 4 * ((self.size + 2) // 3)
+
+    def iter_encoded(self) -> Iterator[bytes]:
+        """Reads the file and yields its base64 encoded content chunk by chunk."""
+        with open(self.path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield base64.b64encode(chunk)
+
+    async def aiter_encoded(self) -> AsyncIterator[bytes]:
+        """Async variant of iter_encoded(), reading the file in a worker thread."""
+        f = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, CHUNK_SIZE):
+                yield base64.b64encode(chunk)
+        finally:
+            f.close()
+
+    def sha256(self) -> str:
+        """Returns the SHA-256 digest of the base64 encoded content, read from disk."""
+        digest = hashlib.sha256()
+        for chunk in self.iter_encoded():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class StreamedBody(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Request body made of serialized JSON and of streamed files, base64 encoded between its quotes.
+    Every iteration reads the files again, so that the request can be retried.
+    """
+
+    def __init__(self, parts: List[Union[bytes, StreamedFile]]):
+        self.parts = parts
+
+    def __len__(self) -> int:
+        return sum(part.encoded_size if isinstance(part, StreamedFile) else len(part) for part in self.parts)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for part in self.parts:
+            if isinstance(part, StreamedFile):
+                yield from part.iter_encoded()
+            else:
+                yield part
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for part in self.parts:
+            if isinstance(part, StreamedFile):
+                async for chunk in part.aiter_encoded():
+                    yield chunk
+            else:
+                yield part
+
+
+class FileStreamingHook(BeforeRequestHook):
+    """
+    Streams large scanned files from disk into the scan requests, instead of reading them
+    into memory and base64 encoding them in the request before serializing it.
+
+    The peak memory of a scan is then independent of the size of its files, at the cost
+    of reading them again on every retry. The request is sent with a Content-Length
+    computed beforehand: files must not change while they are scanned.
+    """
+
+    def __init__(self, threshold: int):
+        """
+        Args:
+            threshold: Size in bytes from which files are streamed, 0 to stream all files
+        """
+        self.threshold = threshold
+        # the files of the requests being built or sent, by marker
+        self._files: "weakref.WeakValueDictionary[str, StreamedFile]" = weakref.WeakValueDictionary()
+
+    def file(self, path: Union[str, os.PathLike]) -> Optional[StreamedFile]:
+        """
+        Returns the StreamedFile to put in the scan request in place of the content of the
+        file, or None if the file is small enough to be sent as is. The file is streamed as
+        long as the StreamedFile is referenced.
+        """
+        if os.stat(path).st_size < self.threshold:
+            return None
+        streamed = StreamedFile(path)
+        self._files[str(streamed)] = streamed
+        return streamed
+
+    def before_request(self, hook_ctx: BeforeRequestContext, request: httpx.Request) -> httpx.Request:
+        if hook_ctx.operation_id != SCAN_OPERATION_ID or not self._files:
+            return request
+
+        content = request.content
+        parts: List[Union[bytes, StreamedFile]] = []
+        start = 0
+        for marker in _MARKER_RE.finditer(content):
+            streamed = self._files.get(marker.group(1).decode())
+            if streamed is None:
+                continue
+            # keep the quotes around the marker
+            parts.append(content[start:marker.start(1)])
+            parts.append(streamed)
+            start = marker.end(1)
+        if not parts:
+            return request
+        parts.append(content[start:])
+
+        body = StreamedBody(parts)
+        headers = request.headers.copy()
+        headers["Content-Length"] = str(len(body))
+        return httpx.Request(request.method, request.url, headers=headers, stream=body, extensions=request.extensions)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import json
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-
-import yaml
+from typing import Any, ClassVar, Dict, Hashable, List, Optional, Sequence, Tuple, Union
 
 from .constants import GuardName
 from .errors import (
@@ -129,32 +131,105 @@ class GuardConfig:
     The parser handles two types of guards:
     1. Match Guards: Guards with a 'matches' section (e.g., pii_detector)
     2. Simple Guards: Guards without matches (e.g., prompt_injection, toxic)
+
+    A GuardConfig is immutable once parsed, so a single instance can be shared
+    between scans and threads. Use GuardConfig.load() to reuse parsed configs.
     """
 
-    def __init__(self, config: Optional[Union[str, Path, Dict, List[Guard]]] = None):
+    _CACHE_SIZE: ClassVar[int] = 128
+    _cache: ClassVar["OrderedDict[Hashable, Tuple[Hashable, GuardConfig]]"] = OrderedDict()
+    _cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]] = None):
         """
         Initialize parser with analyzer mapping.
 
         Args:
-            config: Configuration as a string, filepath or dictionary
+            config: Configuration as a string, filepath, dictionary, list of guards or another GuardConfig
+        """
+        guards: Sequence[Guard]
+
+        if isinstance(config, GuardConfig):
+            # Already parsed and validated
+            guards = config.guards
+        elif config is None:
+            # Handle default configuration, skipping the keyword detector
+            guards = [
+                Guard(
+                    name=guard,
+                    matches={},
+                    threshold=DEFAULT_THRESHOLD,
+                    count_threshold=0,
+                )
+                for guard in GuardName if guard != GuardName.KEYWORD_DETECTOR
+            ]
+        else:
+            # Use the config provided
+            guards = self._parse_config(config)
+
+        self._guards: Tuple[Guard, ...] = tuple(guards)
+        self._redaction_keys: Tuple[str, ...] = tuple(
+            key for guard in self._guards if guard.matches is not None
+            for key, match in guard.matches.items() if match.redact
+        )
+        self._keywords: Tuple[str, ...] = tuple(
+            key for guard in self._guards if guard.name == GuardName.KEYWORD_DETECTOR
+            for key in guard.matches
+        )
+
+    @classmethod
+    def load(cls, config: Optional[Union[str, Path, Dict, List[Guard], GuardConfig]] = None) -> GuardConfig:
+        """
+        Return a parsed GuardConfig, reusing a previously parsed one when possible.
+
+        YAML files are only re-read and re-parsed when their modification time or size
+        changes, and dictionaries are only re-parsed when their content changes.
+        The returned instance is shared and must be treated as read-only.
+
+        Args:
+            config: Configuration as a string, filepath, dictionary, list of guards or GuardConfig
+
+        Returns:
+            GuardConfig for the configuration
         """
-        self.guards: List[Guard] = []
+        if isinstance(config, GuardConfig):
+            return config
 
-        # Handle default configuration
+        key: Hashable
+        stamp: Hashable = None
         if config is None:
-            for guard in GuardName:
-                # skip keyword detector in default
-                if guard != GuardName.KEYWORD_DETECTOR:
-                    self.guards.append(Guard(
-                        name=guard,
-                        matches={},
-                        threshold=DEFAULT_THRESHOLD,
-                        count_threshold=0,
-                    ))
-            return
-
-        # Use the config provided
-        self._parse_config(config)
+            key = None
+        elif isinstance(config, (str, Path)):
+            try:
+                stat = os.stat(config)
+            except OSError as e:
+                raise GuardConfigError(f"Failed to load config file: {e}") from e
+            key = ("path", os.path.abspath(config))
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        elif isinstance(config, dict):
+            try:
+                key = ("dict", json.dumps(config, sort_keys=True, default=str))
+            except (TypeError, ValueError):
+                return cls(config)
+        else:
+            # lists of Guard objects are cheap to validate and not hashable
+            return cls(config)
+
+        with cls._cache_lock:
+            entry = cls._cache.get(key)
+            if entry is not None and entry[0] == stamp:
+                cls._cache.move_to_end(key)
+                return entry[1]
+
+        guard_config = cls(config)
+
+        with cls._cache_lock:
+            cls._cache[key] = (stamp, guard_config)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls._CACHE_SIZE:
+                cls._cache.popitem(last=False)
+
+        return guard_config
 
     @staticmethod
     def load_yaml(path: Union[str, Path]) -> Dict[str, Any]:
@@ -170,6 +245,9 @@ class GuardConfig:
         Raises:
             GuardConfigError: If file cannot be read or parsed
         """
+        # yaml is only needed for config files, and slow to import
+        import yaml # pylint: disable=import-outside-toplevel
+
         try:
             with open(path, encoding='utf-8') as yaml_file:
                 return yaml.safe_load(yaml_file)
@@ -191,8 +269,7 @@ class GuardConfig:
         """
         # Handle list of guard dictionaries
         if isinstance(config, list) and all(isinstance(guard, Guard) for guard in config):
-            self.guards = [self._parse_guard_obj(guard) for guard in config if self._validate_guard(guard)]
-            return self.guards
+            return [self._parse_guard_obj(guard) for guard in config if self._validate_guard(guard)]
 
         config_data: Dict[str, Any]
         if isinstance(config, (str, Path)):
@@ -208,9 +285,8 @@ class GuardConfig:
             if not isinstance(guards, list):
                 guards = [guards]
 
-            self.guards = [self._parse_guard(guard) for guard in guards
+            return [self._parse_guard(guard) for guard in guards
                               if self._validate_guard(guard)]
-            return self.guards
 
         except Exception as e:
             raise GuardConfigError(f"Failed to parse config: {e}") from e
@@ -307,41 +383,34 @@ class GuardConfig:
             count_threshold=0
         )
 
+    @property
+    def guards(self) -> Tuple[Guard, ...]:
+        """
+        Returns all the guards configured. A GuardConfig is immutable: build a new one
+        from a list of guards to change them.
+        """
+        return self._guards
+
     @property
     def guard_names(self) -> List[GuardName]:
         """
         Returns the list of all guards configured
         """
-        names = []
-        for guard in self.guards:
-            names.append(guard.name)
-        return names
+        return [guard.name for guard in self._guards]
 
     @property
     def redaction_keys(self) -> List[str]:
         """
         Returns the list of the keys that have redaction set.
         """
-        redact_keys = []
-        for guard in self.guards:
-            if guard.matches is None:
-                continue
-            for key, matches in guard.matches.items():
-                if matches.redact:
-                    redact_keys.append(key)
-        return redact_keys
+        return list(self._redaction_keys)
 
     @property
     def keywords(self) -> List[str]:
         """
         Returns the list of the keys that have redaction set.
         """
-        keywords: List[str] = []
-        for guard in self.guards:
-            if guard.name == GuardName.KEYWORD_DETECTOR:
-                for key, _ in guard.matches.items():
-                    keywords.append(key)
-        return keywords
+        return list(self._keywords)
 
     def _parse_guard(self, guard: Dict) -> Guard:
         """
@@ -1,8 +1,28 @@
+import operator
 from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict
 
 from .constants import ComparisonOperator
 from .errors import GuardConfigValidationError
 
+_COMPARATORS: Dict[ComparisonOperator, Callable[[float, float], bool]] = {
+    ComparisonOperator.GREATER_THAN: operator.gt,
+    ComparisonOperator.GREATER_EQUAL: operator.ge,
+    ComparisonOperator.EQUAL: operator.eq,
+    ComparisonOperator.LESS_EQUAL: operator.le,
+    ComparisonOperator.LESS_THAN: operator.lt,
+}
+
+# comparators with swapped operands, so that the threshold value can be bound first
+_SWAPPED_COMPARATORS: Dict[ComparisonOperator, Callable[[float, float], bool]] = {
+    ComparisonOperator.GREATER_THAN: operator.lt,
+    ComparisonOperator.GREATER_EQUAL: operator.le,
+    ComparisonOperator.EQUAL: operator.eq,
+    ComparisonOperator.LESS_EQUAL: operator.ge,
+    ComparisonOperator.LESS_THAN: operator.gt,
+}
+
 
 @dataclass(frozen=False)
 class Threshold:
@@ -62,17 +82,20 @@ class Threshold:
         Returns:
             True if value meets threshold criteria, False otherwise
         """
-        if self.operator == ComparisonOperator.GREATER_THAN:
-            return value > self.value
-        if self.operator == ComparisonOperator.GREATER_EQUAL:
-            return value >= self.value
-        if self.operator == ComparisonOperator.EQUAL:
-            return value == self.value
-        if self.operator == ComparisonOperator.LESS_EQUAL:
-            return value <= self.value
-        if self.operator == ComparisonOperator.LESS_THAN:
-            return value < self.value
-        return False
+        comparator = _COMPARATORS.get(self.operator)
+        if comparator is None:
+            return False
+        return comparator(value, self.value)
+
+    def comparator(self) -> Callable[[float], bool]:
+        """
+        Returns a comparison callable with the operator and value of the threshold pre-bound.
+        The callable is equivalent to compare() but does not resolve the operator on every call.
+        """
+        comparator = _SWAPPED_COMPARATORS.get(self.operator)
+        if comparator is None:
+            return lambda _: False
+        return partial(comparator, self.value)
 
 
 DEFAULT_THRESHOLD = Threshold(">= 0.0")
@@ -0,0 +1,94 @@
+import threading
+from typing import Any, Callable, Generic, Optional, TypeVar, Union
+
+import httpx
+
+from .httpclient import AsyncHttpClient, ClientOwner, HttpClient, close_clients
+
+C = TypeVar("C", HttpClient, AsyncHttpClient)
+
+
+class _LazyClient(Generic[C]):
+    def __init__(self, factory: Callable[[], C]):
+        self._factory: Callable[[], C] = factory
+        self._client: Optional[C] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> C:
+        """The client, created on first access."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if self._closed:
+                        raise RuntimeError("Cannot send a request, as the client has been closed.")
+                    self._client = self._factory()
+        return self._client
+
+    @property
+    def created(self) -> bool:
+        return self._client is not None
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def build_request(self, method: str, url: Any, **kwargs: Any) -> httpx.Request:
+        return self.client.build_request(method, url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # other attributes of the client, such as headers or timeout
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
+class LazyHttpClient(_LazyClient[HttpClient]):
+    """
+    Synchronous client created on first use, so that an SDK only used through its *_async
+    methods never builds a synchronous connection pool.
+    """
+
+    def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        return self.client.send(request, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+class LazyAsyncHttpClient(_LazyClient[AsyncHttpClient]):
+    """
+    Async client created on first use, so that an SDK only used through its synchronous
+    methods never builds an async connection pool.
+    """
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        return await self.client.send(request, **kwargs)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._closed = True
+            client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+def close_created_clients(
+    owner: ClientOwner,
+    client: Union[HttpClient, None],
+    async_client: Union[AsyncHttpClient, None],
+) -> None:
+    """
+    Same as close_clients() for clients owned by an SDK, but skips the lazy clients that
+    were never created, which spares an event loop to close an async client never used.
+    """
+    if isinstance(client, LazyHttpClient) and not client.created:
+        client = None
+    if isinstance(async_client, LazyAsyncHttpClient) and not async_client.created:
+        async_client = None
+    close_clients(owner, client, False, async_client, False)
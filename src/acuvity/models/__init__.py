@@ -1,47 +1,76 @@
-"""Code generated by Speakeasy (https://speakeasy.com). DO NOT EDIT."""
+"""Code originally generated by Speakeasy (https://speakeasy.com)."""
 
-from .alertevent import Alertevent, AlerteventTypedDict
-from .analyzer import (
-    Analyzer,
-    AnalyzerTypedDict,
-    DetectionMatchers,
-    DetectionMatchersTypedDict,
-)
-from .analyzermodel import Analyzermodel, AnalyzermodelTypedDict
-from .apierror import APIError
-from .detector import Detector, DetectorTypedDict
-from .elementalerror import Data, DataTypedDict, Elementalerror, ElementalerrorData
-from .extraction import Extraction, ExtractionTypedDict
-from .extractionrequest import Extractionrequest, ExtractionrequestTypedDict
-from .extractionsummary import Extractionsummary, ExtractionsummaryTypedDict
-from .latency import Latency, LatencyTypedDict
-from .mcpmessage import Direction, Mcpmessage, McpmessageType, McpmessageTypedDict
-from .mcpserver import Mcpserver, McpserverTypedDict
-from .mcptoolannotations import Mcptoolannotations, McptoolannotationsTypedDict
-from .modality import Modality, ModalityTypedDict
-from .principal import AuthType, Principal, PrincipalType, PrincipalTypedDict
-from .principalapp import Principalapp, PrincipalappTypedDict
-from .principalappuser import Principalappuser, PrincipalappuserTypedDict
-from .principaluser import Principaluser, PrincipaluserTypedDict
-from .scanrequest import Anonymization, Scanrequest, ScanrequestTypedDict, Type
-from .scanresponse import (
-    Decision,
-    Scanresponse,
-    ScanresponseType,
-    ScanresponseTypedDict,
-)
-from .security import Security, SecurityTypedDict
-from .textualdetection import (
-    Textualdetection,
-    TextualdetectionType,
-    TextualdetectionTypedDict,
-)
-from .tool import Category, Tool, ToolTypedDict
-from .toolchoice import Choice, Toolchoice, ToolchoiceTypedDict
-from .toolresult import Toolresult, ToolresultTypedDict
-from .tooluse import Tooluse, TooluseTypedDict
-from .traceref import Kind, StatusCode, Traceref, TracerefTypedDict
+import builtins
+from importlib import import_module
+from typing import TYPE_CHECKING, Dict
 
+if TYPE_CHECKING:
+    from .alertevent import Alertevent, AlerteventTypedDict
+    from .analyzer import (
+        Analyzer,
+        AnalyzerTypedDict,
+        DetectionMatchers,
+        DetectionMatchersTypedDict,
+    )
+    from .analyzermodel import Analyzermodel, AnalyzermodelTypedDict
+    from .apierror import APIError
+    from .detector import Detector, DetectorTypedDict
+    from .elementalerror import (
+        Data,
+        DataTypedDict,
+        Elementalerror,
+        ElementalerrorData,
+    )
+    from .extraction import Extraction, ExtractionTypedDict
+    from .extractionrequest import Extractionrequest, ExtractionrequestTypedDict
+    from .extractionsummary import Extractionsummary, ExtractionsummaryTypedDict
+    from .latency import Latency, LatencyTypedDict
+    from .mcpmessage import (
+        Direction,
+        Mcpmessage,
+        McpmessageType,
+        McpmessageTypedDict,
+    )
+    from .mcpserver import Mcpserver, McpserverTypedDict
+    from .mcptoolannotations import Mcptoolannotations, McptoolannotationsTypedDict
+    from .modality import Modality, ModalityTypedDict
+    from .principal import (
+        AuthType,
+        Principal,
+        PrincipalType,
+        PrincipalTypedDict,
+    )
+    from .principalapp import Principalapp, PrincipalappTypedDict
+    from .principalappuser import Principalappuser, PrincipalappuserTypedDict
+    from .principaluser import Principaluser, PrincipaluserTypedDict
+    from .scanrequest import (
+        Anonymization,
+        Scanrequest,
+        ScanrequestTypedDict,
+        Type,
+    )
+    from .scanresponse import (
+        Decision,
+        Scanresponse,
+        ScanresponseType,
+        ScanresponseTypedDict,
+    )
+    from .security import Security, SecurityTypedDict
+    from .textualdetection import (
+        Textualdetection,
+        TextualdetectionType,
+        TextualdetectionTypedDict,
+    )
+    from .tool import Category, Tool, ToolTypedDict
+    from .toolchoice import Choice, Toolchoice, ToolchoiceTypedDict
+    from .toolresult import Toolresult, ToolresultTypedDict
+    from .tooluse import Tooluse, TooluseTypedDict
+    from .traceref import (
+        Kind,
+        StatusCode,
+        Traceref,
+        TracerefTypedDict,
+    )
 
 __all__ = [
     "APIError",
@@ -115,3 +144,93 @@ __all__ = [
     "TracerefTypedDict",
     "Type",
 ]
+
+# models are imported on first access, so that importing the package does not build them all
+_dynamic_imports: Dict[str, str] = {
+    "Alertevent": ".alertevent",
+    "AlerteventTypedDict": ".alertevent",
+    "Analyzer": ".analyzer",
+    "AnalyzerTypedDict": ".analyzer",
+    "DetectionMatchers": ".analyzer",
+    "DetectionMatchersTypedDict": ".analyzer",
+    "Analyzermodel": ".analyzermodel",
+    "AnalyzermodelTypedDict": ".analyzermodel",
+    "APIError": ".apierror",
+    "Detector": ".detector",
+    "DetectorTypedDict": ".detector",
+    "Data": ".elementalerror",
+    "DataTypedDict": ".elementalerror",
+    "Elementalerror": ".elementalerror",
+    "ElementalerrorData": ".elementalerror",
+    "Extraction": ".extraction",
+    "ExtractionTypedDict": ".extraction",
+    "Extractionrequest": ".extractionrequest",
+    "ExtractionrequestTypedDict": ".extractionrequest",
+    "Extractionsummary": ".extractionsummary",
+    "ExtractionsummaryTypedDict": ".extractionsummary",
+    "Latency": ".latency",
+    "LatencyTypedDict": ".latency",
+    "Direction": ".mcpmessage",
+    "Mcpmessage": ".mcpmessage",
+    "McpmessageType": ".mcpmessage",
+    "McpmessageTypedDict": ".mcpmessage",
+    "Mcpserver": ".mcpserver",
+    "McpserverTypedDict": ".mcpserver",
+    "Mcptoolannotations": ".mcptoolannotations",
+    "McptoolannotationsTypedDict": ".mcptoolannotations",
+    "Modality": ".modality",
+    "ModalityTypedDict": ".modality",
+    "AuthType": ".principal",
+    "Principal": ".principal",
+    "PrincipalType": ".principal",
+    "PrincipalTypedDict": ".principal",
+    "Principalapp": ".principalapp",
+    "PrincipalappTypedDict": ".principalapp",
+    "Principalappuser": ".principalappuser",
+    "PrincipalappuserTypedDict": ".principalappuser",
+    "Principaluser": ".principaluser",
+    "PrincipaluserTypedDict": ".principaluser",
+    "Anonymization": ".scanrequest",
+    "Scanrequest": ".scanrequest",
+    "ScanrequestTypedDict": ".scanrequest",
+    "Type": ".scanrequest",
+    "Decision": ".scanresponse",
+    "Scanresponse": ".scanresponse",
+    "ScanresponseType": ".scanresponse",
+    "ScanresponseTypedDict": ".scanresponse",
+    "Security": ".security",
+    "SecurityTypedDict": ".security",
+    "Textualdetection": ".textualdetection",
+    "TextualdetectionType": ".textualdetection",
+    "TextualdetectionTypedDict": ".textualdetection",
+    "Category": ".tool",
+    "Tool": ".tool",
+    "ToolTypedDict": ".tool",
+    "Choice": ".toolchoice",
+    "Toolchoice": ".toolchoice",
+    "ToolchoiceTypedDict": ".toolchoice",
+    "Toolresult": ".toolresult",
+    "ToolresultTypedDict": ".toolresult",
+    "Tooluse": ".tooluse",
+    "TooluseTypedDict": ".tooluse",
+    "Kind": ".traceref",
+    "StatusCode": ".traceref",
+    "Traceref": ".traceref",
+    "TracerefTypedDict": ".traceref",
+}
+
+
+def __getattr__(attr_name: str) -> object:
+    module_name = _dynamic_imports.get(attr_name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {attr_name!r}")
+
+    result = getattr(import_module(module_name, __package__), attr_name)
+    # cache the model, so that the next accesses do not go through __getattr__
+    globals()[attr_name] = result
+    return result
+
+
+def __dir__():
+    lazy_attrs = builtins.list(_dynamic_imports.keys())
+    return builtins.sorted(lazy_attrs)
@@ -1,8 +1,17 @@
+from acuvity.response.batch import ScanBatchResult
+from acuvity.response.lazy import LazyExtraction, LazyScanresponse
 from acuvity.response.match import GuardMatch, Matches, ResponseMatch, ScanResponseMatch
+from acuvity.response.stream import AsyncStreamScan, StreamScan, StreamScanResult
 
 __all__ = [
     'ResponseMatch',
     'GuardMatch',
     'Matches',
-    'ScanResponseMatch'
+    'ScanResponseMatch',
+    'ScanBatchResult',
+    'StreamScan',
+    'AsyncStreamScan',
+    'StreamScanResult',
+    'LazyScanresponse',
+    'LazyExtraction'
 ]
@@ -0,0 +1,21 @@
+import os
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple, Union
+
+from acuvity.response.match import ScanResponseMatch
+
+ScanFiles = Union[Sequence[Union[str, os.PathLike]], os.PathLike, str, None]
+ScanItem = Union[str, Tuple[Optional[str], ScanFiles]]
+
+@dataclass
+class ScanBatchResult:
+    """Result of a single item of a batch scan."""
+    index: int
+    item: ScanItem
+    response: Optional[ScanResponseMatch] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the item was scanned successfully."""
+        return self.error is None
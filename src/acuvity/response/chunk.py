@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from acuvity.models.extraction import Extraction
+from acuvity.models.scanresponse import Decision, Scanresponse
+from acuvity.models.textualdetection import Textualdetection
+from acuvity.response.merge import merge_extractions
+from acuvity.response.stream import _SENTENCE_END # pylint: disable=protected-access
+
+# decisions of a chunk overriding the decisions of the other parts of the scan, most restrictive first
+_DECISION_PRECEDENCE = (Decision.DENY, Decision.FORBIDDEN_USER, Decision.ASK)
+
+
+def split_text(text: str, chunk_size: int, overlap: int) -> List[Tuple[int, str]]:
+    """
+    Splits a text into chunks of at most `chunk_size` new characters, each prefixed with the
+    last `overlap` characters of the text before it. Chunks end at the last sentence end of
+    their second half when there is one.
+
+    Returns:
+        The chunks as tuples of (offset in the text, chunk text)
+    """
+    chunks: List[Tuple[int, str]] = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            for boundary in _SENTENCE_END.finditer(text, start + chunk_size // 2, end):
+                end = boundary.end()
+        offset = max(0, start - overlap)
+        chunks.append((offset, text[offset:end]))
+        start = end
+    return chunks
+
+
+def _drop_truncated(detections: List[Textualdetection], starts: Set[int], ends: Set[int]) -> List[Textualdetection]:
+    """
+    Drops the detections cut by the edge of a chunk, when the neighboring chunk saw them whole.
+    """
+    spans: Dict[Tuple, List[Tuple[int, int]]] = defaultdict(list)
+    for d in detections:
+        if d.start is not None and d.end is not None:
+            spans[(d.type, d.name)].append((d.start, d.end))
+
+    kept = []
+    for d in detections:
+        if d.start is not None and d.end is not None and (d.start in starts or d.end in ends):
+            if any(
+                start <= d.start and d.end <= end and (start, end) != (d.start, d.end)
+                for start, end in spans[(d.type, d.name)]
+            ):
+                continue
+        kept.append(d)
+    return kept
+
+
+class ChunkedScan:
+    """
+    Splits the messages of a scan longer than `chunk_size` into overlapping chunks, scanned
+    as separate requests, and merges the responses back into the response of the whole scan.
+
+    The files and the other messages are scanned in one request, the base request. In the
+    merged extraction of a chunked message, the offsets of the textual detections are those
+    in the whole message, the detections found again in the overlap of two chunks are only
+    kept once, and every score is the highest score of the chunks. The decision is the most
+    restrictive of all the responses, their alerts and reasons are concatenated, and the other
+    fields of the response are those of the first response.
+    """
+
+    def __init__(self, messages: Sequence[str], chunk_size: int, overlap: Optional[int] = None):
+        """
+        Args:
+            messages: The messages of the scan
+            chunk_size: Maximum number of new characters per chunk
+            overlap: Number of characters of the previous chunk repeated at the start of the next,
+                defaults to a quarter of the chunk size, up to 256
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if overlap is None:
+            overlap = min(256, chunk_size // 4)
+        if overlap < 0 or overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be positive and smaller than chunk_size")
+        self.messages = list(messages)
+        # messages scanned whole in the base request
+        self.base_messages: List[str] = []
+        # chunks as tuples of (message index, offset in the message, chunk text)
+        self.chunks: List[Tuple[int, int, str]] = []
+        for index, message in enumerate(self.messages):
+            if len(message) <= chunk_size:
+                self.base_messages.append(message)
+                continue
+            for offset, text in split_text(message, chunk_size, overlap):
+                self.chunks.append((index, offset, text))
+
+    @property
+    def chunked(self) -> bool:
+        """True if any message is split into chunks."""
+        return len(self.chunks) > 0
+
+    def merge(self, base: Optional[Scanresponse], chunk_responses: Sequence[Scanresponse]) -> Scanresponse:
+        """
+        Merges the response of the base request, if one was sent, and the responses of the chunks, in order.
+        """
+        if len(chunk_responses) != len(self.chunks):
+            raise ValueError(f"got {len(chunk_responses)} responses for {len(self.chunks)} chunks")
+        base_extractions = list(base.extractions or []) if base is not None else []
+        # the extractions of the files come first
+        file_count = len(base_extractions) - len(self.base_messages)
+        if file_count < 0:
+            raise ValueError(f"scan returned {len(base_extractions)} extractions for {len(self.base_messages)} messages")
+
+        extractions: List[Extraction] = base_extractions[:file_count]
+        base_iter = iter(base_extractions[file_count:])
+        parts: Dict[int, List[Tuple[int, Extraction]]] = defaultdict(list)
+        starts: Dict[int, Set[int]] = defaultdict(set)
+        ends: Dict[int, Set[int]] = defaultdict(set)
+        for (index, offset, text), response in zip(self.chunks, chunk_responses):
+            if not response.extractions:
+                raise ValueError(f"scan of a chunk of message {index} returned no extraction")
+            parts[index].append((offset, response.extractions[0]))
+            # where the chunk was cut from the rest of the message
+            if offset > 0:
+                starts[index].add(offset)
+            if offset + len(text) < len(self.messages[index]):
+                ends[index].add(offset + len(text))
+
+        for index, message in enumerate(self.messages):
+            if index not in parts:
+                extractions.append(next(base_iter))
+                continue
+            merged = merge_extractions(parts[index], message)
+            if merged.detections:
+                merged.detections = _drop_truncated(merged.detections, starts[index], ends[index]) or None
+            extractions.append(merged)
+
+        responses = ([base] if base is not None else []) + list(chunk_responses)
+        decisions = [r.decision for r in responses if r.decision is not None]
+        decision = next((d for d in _DECISION_PRECEDENCE if d in decisions), decisions[0] if decisions else None)
+        alerts = [a for r in responses for a in r.alerts or []]
+        reasons = list(dict.fromkeys(reason for r in responses for reason in r.reasons or []))
+        return responses[0].model_copy(update={
+            "extractions": extractions,
+            "decision": decision,
+            "alerts": alerts or None,
+            "reasons": reasons or None,
+        })
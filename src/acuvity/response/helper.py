@@ -1,14 +1,28 @@
-from typing import Dict, List, Optional, Union
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from acuvity.guard.config import Guard
 from acuvity.guard.constants import GuardName
 from acuvity.models.extraction import Extraction
-from acuvity.models.textualdetection import Textualdetection, TextualdetectionType
+from acuvity.models.textualdetection import TextualdetectionType
+from acuvity.response.index import ExtractionIndex
 from acuvity.response.result import GuardMatch, ResponseMatch
 from acuvity.utils.logger import get_default_logger
 
 logger = get_default_logger()
 
+GuardLookup = Callable[
+    [Extraction, Optional[str], Optional[ExtractionIndex]],
+    Tuple[bool, float, int, List[str]],
+]
+
+# guards evaluated on textual detections: extraction field and detection type
+TEXT_DETECTION_GUARDS: Dict[GuardName, Tuple[str, TextualdetectionType]] = {
+    GuardName.PII_DETECTOR: ("pi_is", TextualdetectionType.PII),
+    GuardName.SECRETS_DETECTOR: ("secrets", TextualdetectionType.SECRET),
+    GuardName.KEYWORD_DETECTOR: ("keywords", TextualdetectionType.KEYWORD),
+}
+
 class ResponseHelper:
     """
     Parser for evaluating content against different types of guards/filters.
@@ -19,7 +33,8 @@ class ResponseHelper:
     def evaluate(
         extraction: Extraction,
         guard: Guard,
-        match_name: Optional[str] = None
+        match_name: Optional[str] = None,
+        index: Optional[ExtractionIndex] = None
     ) -> GuardMatch:
         """
         Evaluates extracted content against a specific guard configuration.
@@ -28,50 +43,39 @@ class ResponseHelper:
             extraction: Contains all detected content from the detection engine
             guard: Configuration defining what to check for and threshold values
             match_name: Optional specific pattern/entity name to check for
+            index: Detection index of the extraction, built on demand if not provided
 
         Returns:
             GuardMatch object indicating whether the check passed/failed and related metadata
         """
-        exists = False
-        value = 0.0
-        match_count = 0
-        match_list: List[str] = []
+        if index is None and match_name and guard.name in TEXT_DETECTION_GUARDS:
+            index = ExtractionIndex(extraction)
 
-        # Dispatch to appropriate handler based on guard type
-        if guard.name in (GuardName.PROMPT_INJECTION, GuardName.JAILBREAK, GuardName.MALICIOUS_URL):
-            # Security-related checks
-            exists, value = ResponseHelper._get_guard_value(extraction.exploits, str(guard.name))
-        elif guard.name in (GuardName.TOXIC, GuardName.BIASED, GuardName.HARMFUL):
-            # Content quality/safety checks
-            exists, value = ResponseHelper._get_guard_value(extraction.malcontents, str(guard.name))
-        elif guard.name == GuardName.LANGUAGE:
-            # Language detection - check specific language or any language
-            if match_name:
-                exists, value = ResponseHelper._get_guard_value(extraction.languages, match_name)
-            elif extraction.languages:
-                exists, value = len(extraction.languages) > 0 , 1.0
-        elif guard.name == GuardName.MODALITY:
-            # Check for specific content modalities (text, image, etc.)
-            exists = ResponseHelper._get_modality_value(extraction, guard, match_name)
-        elif guard.name == GuardName.PII_DETECTOR:
-            # Personal Identifiable Information detection
-            exists, value, match_count, match_list = ResponseHelper._get_text_detections(
-                extraction.pi_is, guard, TextualdetectionType.PII, extraction.detections, match_name
-            )
-        elif guard.name == GuardName.SECRETS_DETECTOR:
-            # Secrets detection (API keys, passwords, etc.)
-            exists, value, match_count, match_list = ResponseHelper._get_text_detections(
-                extraction.secrets, guard, TextualdetectionType.SECRET, extraction.detections, match_name
-            )
-        elif guard.name == GuardName.KEYWORD_DETECTOR:
-            # Custom keyword matching
-            exists, value, match_count, match_list = ResponseHelper._get_text_detections(
-                extraction.keywords, guard, TextualdetectionType.KEYWORD, extraction.detections, match_name
-            )
+        exists, value, match_count, match_list = ResponseHelper.compile_lookup(guard)(extraction, match_name, index)
 
+        return ResponseHelper.guard_match(
+            guard.name, str(guard.threshold), guard.threshold.compare, exists, value, match_count, match_list
+        )
+
+    @staticmethod
+    def guard_match(
+        guard_name: GuardName,
+        threshold: str,
+        compare: Callable[[float], bool],
+        exists: bool,
+        value: float,
+        match_count: int,
+        match_list: List[str],
+    ) -> GuardMatch:
+        """
+        Builds the GuardMatch of a guard lookup.
+
+        Returns:
+            GuardMatch object indicating whether the check passed/failed and related metadata
+        """
         # Determine if the check passed based on threshold configuration
         response_match = ResponseMatch.NO
-        if exists and guard.threshold.compare(value):
+        if exists and compare(value):
             response_match = ResponseMatch.YES
 
         # Only return positive values for matches
@@ -80,13 +84,67 @@ class ResponseHelper:
 
         return GuardMatch(
             response_match=response_match,
-            guard_name=guard.name,
-            threshold=str(guard.threshold),
+            guard_name=guard_name,
+            threshold=threshold,
             actual_value=value,
             match_count=match_count,
             match_values=match_list
         )
 
+    @staticmethod
+    def compile_lookup(guard: Guard) -> GuardLookup:
+        """
+        Resolves the extraction field and handler of a guard once.
+
+        Returns:
+            Callable taking (extraction, match_name, index) and returning a tuple of
+            (exists, score, count, match_list) for the guard
+        """
+        name = guard.name
+        key = str(name)
+
+        if name in (GuardName.PROMPT_INJECTION, GuardName.JAILBREAK, GuardName.MALICIOUS_URL):
+            # Security-related checks
+            def exploits_lookup(extraction: Extraction, _: Optional[str], __: Optional[ExtractionIndex]):
+                return (*ResponseHelper._get_guard_value(extraction.exploits, key), 0, [])
+            return exploits_lookup
+
+        if name in (GuardName.TOXIC, GuardName.BIASED, GuardName.HARMFUL):
+            # Content quality/safety checks
+            def malcontents_lookup(extraction: Extraction, _: Optional[str], __: Optional[ExtractionIndex]):
+                return (*ResponseHelper._get_guard_value(extraction.malcontents, key), 0, [])
+            return malcontents_lookup
+
+        if name == GuardName.LANGUAGE:
+            # Language detection - check specific language or any language
+            def language_lookup(extraction: Extraction, match_name: Optional[str], _: Optional[ExtractionIndex]):
+                if match_name:
+                    return (*ResponseHelper._get_guard_value(extraction.languages, match_name), 0, [])
+                if extraction.languages:
+                    return len(extraction.languages) > 0, 1.0, 0, []
+                return False, 0.0, 0, []
+            return language_lookup
+
+        if name == GuardName.MODALITY:
+            # Check for specific content modalities (text, image, etc.)
+            def modality_lookup(extraction: Extraction, match_name: Optional[str], _: Optional[ExtractionIndex]):
+                return ResponseHelper._get_modality_value(extraction, guard, match_name), 0.0, 0, []
+            return modality_lookup
+
+        if name in TEXT_DETECTION_GUARDS:
+            # PIIs, secrets (API keys, passwords, etc.) and custom keywords
+            field, detection_type = TEXT_DETECTION_GUARDS[name]
+            get_field = attrgetter(field)
+            def text_detections_lookup(extraction: Extraction, match_name: Optional[str], index: Optional[ExtractionIndex]):
+                return ResponseHelper._get_text_detections(
+                    get_field(extraction), guard, detection_type, index, match_name
+                )
+            return text_detections_lookup
+
+        def no_lookup(_: Extraction, __: Optional[str], ___: Optional[ExtractionIndex]):
+            return False, 0.0, 0, []
+        return no_lookup
+
     @staticmethod
     def _get_guard_value(
         lookup: Union[Dict[str, float], None],
@@ -110,7 +168,7 @@ class ResponseHelper:
         lookup: Union[Dict[str, float], None],
         guard: Guard,
         detection_type: TextualdetectionType,
-        detections: Union[List[Textualdetection], None],
+        index: Optional[ExtractionIndex],
         match_name: Optional[str]
     ) -> tuple[bool, float, int, List[str]]:
         """
@@ -124,16 +182,11 @@ class ResponseHelper:
         """
         if match_name:
             # Looking for a specific pattern/entity
-            if not detections:
+            if index is None or not index.extraction.detections:
                 return False, 0, 0, []
 
-            # Find all matching detections that exceed the threshold
-            text_matches = [
-                d.score for d in detections
-                if d.type == detection_type and d.name == match_name and d.score is not None and guard.threshold.compare(d.score)
-            ]
-
-            count = len(text_matches)
+            # Count all matching detections that exceed the threshold, and their highest score
+            count, score = index.matching(detection_type, match_name, guard.threshold)
 
             # If no textual detections found, check lookup dictionary as fallback
             if count == 0 and lookup and match_name in lookup:
@@ -143,7 +196,6 @@ class ResponseHelper:
                 return False, 0, 0, []
 
             # Return highest confidence score if multiple matches
-            score = max(text_matches)
             return True, score, count, [match_name]
 
         # No specific match requested - return all matches for this detection type
@@ -0,0 +1,71 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Tuple
+
+from acuvity.guard.constants import ComparisonOperator
+from acuvity.guard.threshold import Threshold
+from acuvity.models.extraction import Extraction
+from acuvity.models.textualdetection import TextualdetectionType
+
+
+class ExtractionIndex:
+    """
+    One-time index over the textual detections of an extraction.
+
+    Detections are grouped by (type, name) with their scores sorted, so that each
+    guard match is answered with a binary search instead of a scan of all detections.
+    """
+
+    def __init__(self, extraction: Extraction):
+        """
+        Build the index for an extraction.
+
+        Args:
+            extraction: The extraction whose detections are indexed
+        """
+        self.extraction = extraction
+        self._scores: Dict[Tuple[TextualdetectionType, str], List[float]] = {}
+
+        for detection in extraction.detections or []:
+            if detection.type is None or detection.name is None or detection.score is None:
+                continue
+            self._scores.setdefault((detection.type, detection.name), []).append(detection.score)
+
+        for scores in self._scores.values():
+            scores.sort()
+
+    def scores(self, detection_type: TextualdetectionType, name: str) -> List[float]:
+        """
+        Returns the sorted scores of all detections of the given type and name.
+        """
+        return self._scores.get((detection_type, name), [])
+
+    def matching(self, detection_type: TextualdetectionType, name: str, threshold: Threshold) -> Tuple[int, float]:
+        """
+        Count the detections of the given type and name whose score meets the threshold.
+
+        Returns:
+            Tuple of (count, highest matching score), the score is 0.0 when nothing matches
+        """
+        scores = self._scores.get((detection_type, name))
+        if not scores:
+            return 0, 0.0
+
+        value = threshold.value
+        operator = threshold.operator
+        if operator == ComparisonOperator.GREATER_EQUAL:
+            count = len(scores) - bisect_left(scores, value)
+        elif operator == ComparisonOperator.GREATER_THAN:
+            count = len(scores) - bisect_right(scores, value)
+        elif operator == ComparisonOperator.EQUAL:
+            count = bisect_right(scores, value) - bisect_left(scores, value)
+            return count, value if count else 0.0
+        elif operator == ComparisonOperator.LESS_EQUAL:
+            count = bisect_right(scores, value)
+            return count, scores[count - 1] if count else 0.0
+        elif operator == ComparisonOperator.LESS_THAN:
+            count = bisect_left(scores, value)
+            return count, scores[count - 1] if count else 0.0
+        else:
+            return 0, 0.0
+
+        return count, scores[-1] if count else 0.0
@@ -0,0 +1,182 @@
+import contextlib
+from typing import Any, ClassVar, Dict, Iterator, Optional, Type
+
+import pydantic_core
+from pydantic import BaseModel, PrivateAttr
+from pydantic.fields import FieldInfo
+
+from acuvity.models.extraction import Extraction
+from acuvity.models.scanresponse import Scanresponse
+from acuvity.utils.serializers import get_type_adapter, json_unmarshallers
+
+
+class _LazyFields(BaseModel):
+    """
+    Base of the models built from their raw JSON values, and validating each field only on its first access.
+
+    Anything reading the model as a whole (dumps, copies, comparisons, repr, pickling)
+    validates all the remaining fields first, so lazy models behave like eager ones.
+    """
+
+    # the pydantic model the lazy model stands for
+    _model: ClassVar[Type[BaseModel]]
+    # field names by JSON key, aliases and field names alike
+    _keys: ClassVar[Dict[str, str]]
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        keys = {}
+        for name, info in cls.model_fields.items():
+            keys[name] = name
+            if info.alias:
+                keys[info.alias] = name
+        cls._keys = keys
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> Any:
+        """
+        Wraps a parsed JSON object without validating it. Returns an eagerly validated
+        model if required fields are missing, so that the validation error is raised.
+        """
+        pending: Dict[str, Any] = {}
+        for key, value in raw.items():
+            field = cls._keys.get(key)
+            if field is not None:
+                pending[field] = value
+
+        values: Dict[str, Any] = {}
+        for name, info in cls.model_fields.items():
+            if name in pending:
+                continue
+            if info.is_required():
+                return get_type_adapter(cls._model).validate_python(raw)
+            values[name] = info.get_default(call_default_factory=True)
+
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "__dict__", values)
+        object.__setattr__(obj, "__pydantic_fields_set__", set(pending))
+        object.__setattr__(obj, "__pydantic_extra__", None)
+        object.__setattr__(obj, "__pydantic_private__", {"_pending": pending})
+        return obj
+
+    def _validate_field(self, name: str, value: Any) -> Any:
+        fields: Dict[str, FieldInfo] = self._model.model_fields
+        return get_type_adapter(fields[name].annotation).validate_python(value)
+
+    def __getattr__(self, name: str) -> Any:
+        private = object.__getattribute__(self, "__pydantic_private__")
+        pending = private.get("_pending") if private else None
+        if pending and name in pending:
+            # concurrent first accesses may both validate the field, with the same result
+            value = self._validate_field(name, pending[name])
+            self.__dict__[name] = value
+            pending.pop(name, None)
+            return value
+        return super().__getattr__(name)
+
+    def materialize(self) -> None:
+        """Validates all the fields not accessed yet."""
+        pending = (self.__pydantic_private__ or {}).get("_pending")
+        if not pending:
+            return
+        for name in list(pending):
+            getattr(self, name)
+        # restore the field order, which serializers follow
+        values = self.__dict__
+        fields: Dict[str, FieldInfo] = self._model.model_fields
+        object.__setattr__(self, "__dict__", {name: values[name] for name in fields})
+
+    def model_dump(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        self.materialize()
+        return super().model_dump(*args, **kwargs)
+
+    def model_dump_json(self, *args: Any, **kwargs: Any) -> str:
+        self.materialize()
+        return super().model_dump_json(*args, **kwargs)
+
+    def model_copy(self, *args: Any, **kwargs: Any) -> Any:
+        self.materialize()
+        return super().model_copy(*args, **kwargs)
+
+    def __copy__(self) -> Any:
+        self.materialize()
+        return super().__copy__()
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> Any:
+        self.materialize()
+        return super().__deepcopy__(memo)
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        self.materialize()
+        return super().__getstate__()
+
+    def __repr_args__(self) -> Any:
+        self.materialize()
+        return super().__repr_args__()
+
+    def __iter__(self) -> Any:
+        self.materialize()
+        return super().__iter__()
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, self._model):
+            return NotImplemented
+        self.materialize()
+        if isinstance(other, _LazyFields):
+            other.materialize()
+        return self.__dict__ == other.__dict__
+
+
+class LazyExtraction(_LazyFields, Extraction):
+    """
+    Extraction validating each of its fields, e.g. its detections or data sets, on first access.
+    """
+    _model: ClassVar[Type[BaseModel]] = Extraction
+    _pending: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+
+class LazyScanresponse(_LazyFields, Scanresponse):
+    """
+    Scanresponse parsed from JSON without validating it: each field is validated on first
+    access, and every extraction is a LazyExtraction validating its own fields on access.
+
+    Reading only a few fields of a large response, e.g. the guard-related scores of its
+    extractions and not their data, skips validating and building everything else.
+    """
+    _model: ClassVar[Type[BaseModel]] = Scanresponse
+    _pending: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, raw: Any) -> Scanresponse:
+        """
+        Parses a JSON scan response lazily.
+        """
+        parsed = pydantic_core.from_json(raw)
+        if not isinstance(parsed, dict):
+            return get_type_adapter(Scanresponse).validate_json(raw)
+        return cls.from_raw(parsed)
+
+    def _validate_field(self, name: str, value: Any) -> Any:
+        if name == "extractions" and isinstance(value, list) and all(isinstance(v, dict) for v in value):
+            return [LazyExtraction.from_raw(v) for v in value]
+        return super()._validate_field(name, value)
+
+    def materialize(self) -> None:
+        """Validates all the fields not accessed yet, including those of the extractions."""
+        super().materialize()
+        for extraction in self.extractions or []:
+            if isinstance(extraction, LazyExtraction):
+                extraction.materialize()
+
+
+@contextlib.contextmanager
+def lazy_scan_responses() -> Iterator[None]:
+    """
+    Parses the scan responses received in the current thread or task as LazyScanresponse.
+    """
+    token = json_unmarshallers.set({Scanresponse: LazyScanresponse.from_json})
+    try:
+        yield
+    finally:
+        json_unmarshallers.reset(token)
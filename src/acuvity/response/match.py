@@ -1,11 +1,12 @@
 import os
-from typing import List, Sequence, Union
+from typing import List, Optional, Sequence, Union
 
 from acuvity.guard.config import GuardConfig
 from acuvity.guard.constants import GuardName
 from acuvity.models.scanresponse import Scanresponse
 from acuvity.response.processor import ResponseProcessor
 from acuvity.response.result import GuardMatch, Matches, ResponseMatch
+from acuvity.timing import ScanTimings
 
 
 class ScanResponseMatch:
@@ -27,6 +28,8 @@ class ScanResponseMatch:
         """
         self._guard_config = guard_config
         self.scan_response = scan_response
+        # set by the SDK when a scan timing hook is configured
+        self.timings: Optional[ScanTimings] = None
         self._number_of_files = self._count_files(files)
         if self._guard_config is None:
             raise ValueError("No guard configuration was passed or available in the instance.")
@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from acuvity.models.extraction import Extraction
+from acuvity.models.modality import Modality
+from acuvity.models.textualdetection import Textualdetection
+
+# extraction fields holding a score per detected item
+_SCORE_FIELDS = (
+    "pi_is",
+    "secrets",
+    "keywords",
+    "exploits",
+    "malcontents",
+    "languages",
+    "topics",
+    "intent",
+    "custom_data_types",
+)
+
+
+def merge_extractions(parts: Sequence[Tuple[int, Extraction]], data: Optional[str] = None) -> Extraction:
+    """
+    Merges the extractions of consecutive parts of one text into the extraction of the whole text.
+
+    Scores are merged by keeping the highest score of every item. The offsets of the textual
+    detections are shifted by the offset of their part, and detections found twice at the same
+    position (e.g. in overlapping parts) are only kept once with their highest score.
+
+    Args:
+        parts: Tuples of (offset of the part in the whole text, extraction of the part)
+        data: The whole text
+
+    Returns:
+        Extraction of the whole text
+    """
+    merged: Dict[str, Dict[str, float]] = {}
+    modalities: Dict[Tuple[str, str], Modality] = {}
+    positioned: Dict[Tuple, Textualdetection] = {}
+    unpositioned: List[Textualdetection] = []
+
+    for offset, extraction in parts:
+        for field in _SCORE_FIELDS:
+            scores = getattr(extraction, field)
+            if not scores:
+                continue
+            target = merged.setdefault(field, {})
+            for name, score in scores.items():
+                if name not in target or score > target[name]:
+                    target[name] = score
+
+        for modality in extraction.modalities or []:
+            modalities.setdefault((modality.group, modality.type), modality)
+
+        for detection in extraction.detections or []:
+            if detection.start is None or detection.end is None:
+                unpositioned.append(detection)
+                continue
+            shifted = detection.model_copy(update={
+                "start": detection.start + offset,
+                "end": detection.end + offset,
+            })
+            key = (shifted.type, shifted.name, shifted.start, shifted.end)
+            current = positioned.get(key)
+            if current is None or (shifted.score or 0.0) > (current.score or 0.0):
+                positioned[key] = shifted
+
+    detections = sorted(positioned.values(), key=lambda d: (d.start, d.end)) + unpositioned
+    fields: Dict[str, Any] = {
+        "data": data,
+        "detections": detections or None,
+        "modalities": list(modalities.values()) or None,
+    }
+    fields.update(merged)
+    return Extraction(**fields)
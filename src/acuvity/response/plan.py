@@ -0,0 +1,159 @@
+import threading
+import weakref
+from typing import List, Optional, Tuple
+
+from acuvity.guard.config import Guard, GuardConfig
+from acuvity.guard.constants import GuardName
+from acuvity.models.extraction import Extraction
+from acuvity.response.helper import ResponseHelper
+from acuvity.response.index import ExtractionIndex
+from acuvity.response.result import GuardMatch, Matches, ResponseMatch
+from acuvity.utils.logger import get_default_logger
+
+logger = get_default_logger()
+
+class GuardPlan:
+    """
+    Evaluation step of a single guard.
+
+    The extraction field lookup and the threshold comparison of the guard are
+    resolved once, so evaluating the guard does no dispatch on its name or operator.
+    """
+
+    def __init__(self, guard: Guard):
+        """
+        Compile a guard.
+
+        Args:
+            guard: The guard configuration to compile
+        """
+        self.guard = guard
+        self.name: GuardName = guard.name
+        self.threshold: str = str(guard.threshold)
+        self.count_threshold: int = guard.count_threshold
+        self.compare = guard.threshold.comparator()
+        self.lookup = ResponseHelper.compile_lookup(guard)
+        self.matches: Tuple[Tuple[str, int], ...] = tuple(
+            (match_name, match.count_threshold) for match_name, match in (guard.matches or {}).items()
+        )
+
+    def evaluate(self, extraction: Extraction, index: ExtractionIndex, match_name: Optional[str] = None) -> GuardMatch:
+        """
+        Evaluate the guard, or one of its matches, against an extraction.
+
+        Returns:
+            GuardMatch with results of the evaluation
+        """
+        exists, value, match_count, match_list = self.lookup(extraction, match_name, index)
+        return ResponseHelper.guard_match(
+            self.name, self.threshold, self.compare, exists, value, match_count, match_list
+        )
+
+    def run(self, extraction: Extraction, index: ExtractionIndex) -> GuardMatch:
+        """
+        Run the guard against an extraction.
+
+        If guard has specific matches defined, each match is evaluated independently
+        and results are aggregated based on count thresholds.
+
+        Returns:
+            GuardMatch with results of the evaluation
+        """
+        # Simple case: guard with no specific matches to check
+        if not self.matches:
+            return self.evaluate(extraction, index)
+
+        # Complex case: guard with specific patterns/entities to match
+        result_match = ResponseMatch.NO
+        match_counter = 0
+        match_list : List[str] = []
+
+        # Check each specific match pattern defined in the guard
+        for match_name, count_threshold in self.matches:
+            result = self.evaluate(extraction, index, match_name)
+
+            # Track matches that exceed their individual thresholds
+            if result.response_match == ResponseMatch.YES and result.match_count >= count_threshold:
+                match_counter += result.match_count
+                match_list.append(match_name)
+
+                # If total matches exceed the guard's overall threshold, flag as a match
+                if match_counter >= self.count_threshold:
+                    result_match = ResponseMatch.YES
+
+        logger.debug("match guard {%s} , check {%s}, total match {%s}, guard threshold {%s}, match_list {%s}",
+                    self.name, result_match, match_counter, self.count_threshold, match_list)
+
+        # Only keep match list if there was an overall match
+        if result_match == ResponseMatch.NO:
+            match_list = []
+
+        return GuardMatch(
+                    response_match=result_match,
+                    guard_name=self.name,
+                    threshold=self.threshold,
+                    actual_value=1.0,  # Always 1.0 for aggregated matches
+                    match_count=match_counter,
+                    match_values=match_list
+                )
+
+class EvaluationPlan:
+    """
+    Compiled form of a GuardConfig.
+
+    Every guard of the config is compiled into a GuardPlan once, and the plan is
+    then executed against each extraction of a scan response.
+    """
+
+    _plans: "weakref.WeakKeyDictionary[GuardConfig, EvaluationPlan]" = weakref.WeakKeyDictionary()
+    _plans_lock = threading.Lock()
+
+    def __init__(self, guard_config: GuardConfig):
+        """
+        Compile a guard configuration.
+
+        Args:
+            guard_config: Configuration defining guards and thresholds
+        """
+        self.guards: Tuple[GuardPlan, ...] = tuple(GuardPlan(guard) for guard in guard_config.guards)
+
+    @classmethod
+    def compile(cls, guard_config: GuardConfig) -> "EvaluationPlan":
+        """
+        Return the evaluation plan of a guard configuration, compiling it only once per GuardConfig instance.
+        """
+        with cls._plans_lock:
+            plan = cls._plans.get(guard_config)
+            if plan is None:
+                plan = cls(guard_config)
+                cls._plans[guard_config] = plan
+            return plan
+
+    def run(self, extraction: Extraction) -> Matches:
+        """
+        Run all guards against an extraction.
+
+        Returns:
+            Matches object with the results of all guards
+        """
+        matched_checks = []  # Guards that matched (violations)
+        all_checks = []      # All guard checks performed
+
+        # Index the detections once for all guards and matches
+        index = ExtractionIndex(extraction)
+
+        # Check each guard against this extraction
+        for guard in self.guards:
+            result = guard.run(extraction, index)
+
+            # Track violations and all checks separately
+            if result.response_match == ResponseMatch.YES:
+                matched_checks.append(result)
+            all_checks.append(result)
+
+        return Matches(
+            input_data=extraction.data or "",
+            response_match=ResponseMatch.YES if matched_checks else ResponseMatch.NO,
+            matched_checks=matched_checks,
+            all_checks=all_checks
+        )
@@ -0,0 +1,274 @@
+import asyncio
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from acuvity.guard.config import GuardConfig
+from acuvity.response.match import ScanResponseMatch
+from acuvity.response.merge import merge_extractions
+from acuvity.response.plan import EvaluationPlan
+from acuvity.response.result import Matches, ResponseMatch
+
+# end of a sentence: terminal punctuation followed by whitespace, or a line break
+_SENTENCE_END = re.compile(r"[.!?](?=\s)|\n")
+
+
+class TextWindower:
+    """
+    Splits a stream of text chunks into the windows to scan.
+
+    A window is emitted as soon as the pending text ends a sentence, or once it reaches
+    `window` characters. Every window is prefixed with the last `overlap` characters of
+    the previous one, so that detections spanning a window boundary are not missed.
+    """
+
+    def __init__(self, window: int = 1024, overlap: int = 64, sentences: bool = True):
+        """
+        Args:
+            window: Maximum number of new characters per window
+            overlap: Number of characters of the previous window repeated at the start of the next
+            sentences: Emit windows at sentence boundaries instead of only when full
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if overlap < 0 or overlap >= window:
+            raise ValueError("overlap must be positive and smaller than the window")
+        self.window = window
+        self.overlap = overlap
+        self.sentences = sentences
+        self._pending = ""
+        self._tail = ""
+        self._offset = 0
+
+    def feed(self, chunk: str) -> List[Tuple[int, str]]:
+        """
+        Adds a chunk of text.
+
+        Returns:
+            The windows completed by the chunk as tuples of (offset in the whole text, window text)
+        """
+        self._pending += chunk
+        windows: List[Tuple[int, str]] = []
+        while self._pending:
+            cut = self._cut()
+            if cut == 0:
+                break
+            windows.append(self._emit(cut))
+        return windows
+
+    def flush(self) -> List[Tuple[int, str]]:
+        """
+        Ends the stream.
+
+        Returns:
+            The last window, if any text is pending
+        """
+        if not self._pending.strip():
+            return []
+        return [self._emit(len(self._pending))]
+
+    def _cut(self) -> int:
+        limit = min(len(self._pending), self.window)
+        if self.sentences:
+            cut = 0
+            for boundary in _SENTENCE_END.finditer(self._pending, 0, limit):
+                cut = boundary.end()
+            if cut:
+                return cut
+        return self.window if len(self._pending) >= self.window else 0
+
+    def _emit(self, cut: int) -> Tuple[int, str]:
+        text = self._pending[:cut]
+        window = (self._offset - len(self._tail), self._tail + text)
+        self._tail = window[1][-self.overlap:] if self.overlap else ""
+        self._pending = self._pending[cut:]
+        self._offset += cut
+        return window
+
+
+@dataclass
+class StreamScanResult:
+    """
+    Result of the scan of one window of a stream.
+
+    Attributes:
+        index: Position of the window in the stream
+        offset: Offset of the window in the whole text
+        text: The scanned window
+        match: The evaluated scan response of the window
+    """
+    index: int
+    offset: int
+    text: str
+    match: ScanResponseMatch
+
+    @property
+    def response_match(self) -> ResponseMatch:
+        """YES if any guard matched in this window."""
+        for m in self.match.matches():
+            if m.response_match == ResponseMatch.YES:
+                return ResponseMatch.YES
+        return ResponseMatch.NO
+
+
+class _StreamScanBase:
+    def __init__(self, guard_config: GuardConfig, windower: TextWindower, stop_on_match: bool):
+        self.guard_config = guard_config
+        self.windower = windower
+        self.stop_on_match = stop_on_match
+        self.results: List[StreamScanResult] = []
+        self.aborted = False
+        self._chunks: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """The text consumed from the stream so far."""
+        return "".join(self._chunks)
+
+    def verdict(self) -> Matches:
+        """
+        Merges the windows scanned so far and evaluates them against the guard config,
+        so that count thresholds apply to the whole text rather than to each window.
+        """
+        parts = []
+        for result in self.results:
+            extractions = result.match.scan_response.extractions or []
+            if extractions:
+                parts.append((result.offset, extractions[0]))
+        merged = merge_extractions(parts, self.text)
+        return EvaluationPlan.compile(self.guard_config).run(merged)
+
+    def _result(self, offset: int, text: str, match: ScanResponseMatch) -> StreamScanResult:
+        result = StreamScanResult(index=len(self.results), offset=offset, text=text, match=match)
+        self.results.append(result)
+        if self.stop_on_match and result.response_match == ResponseMatch.YES:
+            self.aborted = True
+        return result
+
+
+class StreamScan(_StreamScanBase):
+    """
+    Scans a stream of text chunks, e.g. the tokens of a model completion, window by window.
+
+    Iterating yields a StreamScanResult per window as soon as it is scanned. With
+    `stop_on_match`, the iteration stops after the first window matching a guard and
+    the stream is not consumed any further. verdict() returns the merged evaluation.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[str],
+        scan: Callable[[str], ScanResponseMatch],
+        guard_config: GuardConfig,
+        windower: TextWindower,
+        stop_on_match: bool = False,
+    ):
+        super().__init__(guard_config, windower, stop_on_match)
+        self._source = chunks
+        self._scan = scan
+
+    def __iter__(self) -> Iterator[StreamScanResult]:
+        iterator = iter(self._source)
+        try:
+            for chunk in iterator:
+                self._chunks.append(chunk)
+                for offset, text in self.windower.feed(chunk):
+                    yield self._result(offset, text, self._scan(text))
+                    if self.aborted:
+                        return
+            for offset, text in self.windower.flush():
+                yield self._result(offset, text, self._scan(text))
+        finally:
+            close = getattr(iterator, "close", None)
+            if self.aborted and close is not None:
+                close()
+
+
+class AsyncStreamScan(_StreamScanBase):
+    """
+    Async variant of StreamScan.
+
+    Windows are scanned in background tasks while the next chunks are read, at most
+    `max_in_flight` at once, and results are yielded in stream order. Once `max_in_flight`
+    windows are pending, the stream is only read further as their results are yielded.
+    With `stop_on_match`, the pending scans are cancelled after the first window matching a guard.
+    """
+
+    def __init__(
+        self,
+        chunks: Union[AsyncIterable[str], Iterable[str]],
+        scan: Callable[[str], Awaitable[ScanResponseMatch]],
+        guard_config: GuardConfig,
+        windower: TextWindower,
+        stop_on_match: bool = False,
+        max_in_flight: int = 8,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        super().__init__(guard_config, windower, stop_on_match)
+        self._source = chunks
+        self._scan = scan
+        self.max_in_flight = max_in_flight
+
+    async def _iter_chunks(self) -> AsyncGenerator[str, None]:
+        if isinstance(self._source, AsyncIterable):
+            async for chunk in self._source:
+                yield chunk
+        else:
+            for chunk in self._source:
+                yield chunk
+
+    def __aiter__(self) -> AsyncIterator[StreamScanResult]:
+        return self._run()
+
+    async def _run(self) -> AsyncIterator[StreamScanResult]:
+        pending: Deque[Tuple[int, str, "asyncio.Task[ScanResponseMatch]"]] = deque()
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def scan(text: str) -> ScanResponseMatch:
+            async with semaphore:
+                return await self._scan(text)
+
+        def submit(windows: List[Tuple[int, str]]) -> None:
+            for offset, text in windows:
+                pending.append((offset, text, asyncio.ensure_future(scan(text))))
+
+        chunks = self._iter_chunks()
+        try:
+            async for chunk in chunks:
+                self._chunks.append(chunk)
+                submit(self.windower.feed(chunk))
+                # yield what is already scanned without waiting for the stream, and
+                # wait for the oldest scans before reading on once too many are pending
+                while pending and (pending[0][2].done() or len(pending) >= self.max_in_flight):
+                    offset, text, task = pending.popleft()
+                    yield self._result(offset, text, await task)
+                    if self.aborted:
+                        return
+            submit(self.windower.flush())
+            while pending:
+                offset, text, task = pending.popleft()
+                yield self._result(offset, text, await task)
+                if self.aborted:
+                    return
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+            await chunks.aclose()
+            aclose: Optional[Callable[[], Awaitable[None]]] = getattr(self._source, "aclose", None)
+            if self.aborted and aclose is not None:
+                await aclose()
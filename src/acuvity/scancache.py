@@ -0,0 +1,152 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from acuvity.fileupload import StreamedFile
+from acuvity.models import Scanrequest, Scanresponse
+
+
+def scan_cache_scope(server_url: str, token: Optional[str] = None, cookie: Optional[str] = None) -> str:
+    """
+    Returns the scope of the responses of one Apex to one principal, so that a cache shared
+    by several SDKs never serves the response of a server or a tenant to another. The
+    credentials are reduced to their SHA-256 digest.
+    """
+    credentials = hashlib.sha256(f"{token or ''}\n{cookie or ''}".encode("utf-8")).hexdigest()
+    return f"{server_url}|{credentials}"
+
+
+def scan_request_key(request: Scanrequest, scope: Optional[str] = None) -> str:
+    """
+    Returns a content address for the scan request, sent within `scope`, see scan_cache_scope().
+
+    Two requests get the same key if they carry the same messages, extraction data, type,
+    keywords, redactions, annotations, analyzers and policies, in the same scope. Extraction
+    data is reduced to its SHA-256 digest so that large files don't get copied into the key
+    material; the digest of streamed files is computed from disk.
+    """
+    key_material = request.model_dump(mode="json", by_alias=True, exclude_none=True, exclude={"extractions"})
+    if scope is not None:
+        key_material["scope"] = scope
+    if request.extractions:
+        extractions = []
+        for extraction in request.extractions:
+            extraction_material = extraction.model_dump(mode="json", by_alias=True, exclude_none=True, exclude={"data"})
+            if isinstance(extraction.data, StreamedFile):
+                extraction_material["data"] = extraction.data.sha256()
+            elif extraction.data is not None:
+                extraction_material["data"] = hashlib.sha256(extraction.data.encode("utf-8")).hexdigest()
+            extractions.append(extraction_material)
+        key_material["extractions"] = extractions
+
+    return hashlib.sha256(
+        json.dumps(key_material, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+class ScanCacheBackend(ABC):
+    """
+    Storage interface for scan results, keyed by scan_request_key().
+
+    Implement this to plug in a shared cache (e.g. Redis or memcached) and pass the
+    instance as `scan_cache` to the SDK.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Scanresponse]:
+        """Returns the cached response for the key, or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, response: Scanresponse) -> None:
+        """Stores the response for the key."""
+
+    def clear(self) -> None:
+        """Drops all cached responses."""
+
+
+@dataclass(frozen=True)
+class ScanCacheStats:
+    """Snapshot of the counters of a scan cache."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+
+
+class InMemoryScanCache(ScanCacheBackend):
+    """
+    Thread-safe in-process LRU cache for scan results with an optional TTL.
+
+    Least recently used entries are evicted once `maxsize` entries are stored,
+    and entries older than `ttl` seconds are treated as misses. Responses are copied
+    in and out, so that changing a returned response doesn't change the cached one.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300.0):
+        """
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Time to live of a cached response in seconds, None to never expire
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Scanresponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> Optional[Scanresponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, response = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return response.model_copy(deep=True)
+
+    def set(self, key: str, response: Scanresponse) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        response = response.model_copy(deep=True)
+        with self._lock:
+            self._entries[key] = (expires_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> ScanCacheStats:
+        """Returns a snapshot of the hit/miss/eviction counters."""
+        with self._lock:
+            return ScanCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._entries),
+            )
@@ -1,4 +1,4 @@
-"""Code generated by Speakeasy (https://speakeasy.com). DO NOT EDIT."""
+"""Code originally generated by Speakeasy (https://speakeasy.com)."""
 
 from .basesdk import BaseSDK
 from .httpclient import AsyncHttpClient, ClientOwner, HttpClient, close_clients
@@ -145,3 +145,8 @@ class Acuvity(BaseSDK):
         ):
             await self.sdk_configuration.async_client.aclose()
         self.sdk_configuration.async_client = None
+
+
+# patches Acuvity with the extended APIs, whichever module it is imported from
+# pylint: disable=wrong-import-position,unused-import,cyclic-import
+import acuvity.sdkextend # noqa: E402
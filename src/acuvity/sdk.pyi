@@ -1,10 +1,17 @@
 from acuvity import models
+from acuvity.apexdiscovery import ApexDiscoveryCache
 from acuvity.apexextend import ApexExtended
+from acuvity.coalescer import ScanCoalescer
+from acuvity.compression import RequestCompression
+from acuvity.connection import ConnectionConfig
+from acuvity.scancache import ScanCacheBackend
+from acuvity.timing import ScanTimingHook
 from acuvity.types import OptionalNullable, UNSET
 from .httpclient import AsyncHttpClient, HttpClient
 from .utils.logger import Logger
-from .utils.retries import RetryConfig
-from typing import Callable, Dict, Optional, Union
+from .utils.ratelimit import AdaptiveRateLimiter
+from .utils.retries import CircuitBreaker, RetryBudget, RetryConfig
+from typing import Any, Callable, Dict, Optional, Union
 from .basesdk import BaseSDK
 from .apexextend import ApexExtended
 
@@ -27,5 +34,61 @@ class Acuvity(BaseSDK):
         retry_config: OptionalNullable[RetryConfig] = UNSET,
         timeout_ms: Optional[int] = None,
         debug_logger: Optional[Logger] = None,
+        scan_cache: Optional[ScanCacheBackend] = None,
+        apex_discovery_cache: Optional[ApexDiscoveryCache] = None,
+        scan_coalescer: Optional[ScanCoalescer] = None,
+        scan_timing_hook: Optional[ScanTimingHook] = None,
+        lazy_responses: bool = False,
+        file_streaming_threshold: Optional[int] = None,
+        request_compression: Optional[RequestCompression] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        debug_body_limit: Optional[int] = None,
+        connection_config: Optional[ConnectionConfig] = None,
+        file_read_workers: int = 4,
     ) -> None:
         pass
+
+    @classmethod
+    async def create_async(
+        cls,
+        security: Optional[
+            Union[models.Security, Callable[[], models.Security]]
+        ] = None,
+        apex_domain: Optional[str] = None,
+        apex_port: Optional[str] = None,
+        server_idx: Optional[int] = None,
+        server_url: Optional[str] = None,
+        url_params: Optional[Dict[str, str]] = None,
+        async_client: Optional[AsyncHttpClient] = None,
+        retry_config: OptionalNullable[RetryConfig] = UNSET,
+        timeout_ms: Optional[int] = None,
+        debug_logger: Optional[Logger] = None,
+        scan_cache: Optional[ScanCacheBackend] = None,
+        apex_discovery_cache: Optional[ApexDiscoveryCache] = None,
+        scan_coalescer: Optional[ScanCoalescer] = None,
+        scan_timing_hook: Optional[ScanTimingHook] = None,
+        lazy_responses: bool = False,
+        file_streaming_threshold: Optional[int] = None,
+        request_compression: Optional[RequestCompression] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        debug_body_limit: Optional[int] = None,
+        connection_config: Optional[ConnectionConfig] = None,
+        file_read_workers: int = 4,
+    ) -> "Acuvity":
+        pass
+
+    def __enter__(self) -> "Acuvity":
+        pass
+
+    async def __aenter__(self) -> "Acuvity":
+        pass
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        pass
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        pass
@@ -1,4 +1,4 @@
-"""Code generated by Speakeasy (https://speakeasy.com). DO NOT EDIT."""
+"""Code originally generated by Speakeasy (https://speakeasy.com)."""
 
 from ._hooks import SDKHooks
 from ._version import (
@@ -9,6 +9,8 @@ from ._version import (
 )
 from .httpclient import AsyncHttpClient, HttpClient
 from .utils import Logger, RetryConfig, remove_suffix
+from .utils.ratelimit import AdaptiveRateLimiter
+from .utils.retries import CircuitBreaker, RetryBudget
 from acuvity import models
 from acuvity.types import OptionalNullable, UNSET
 from dataclasses import dataclass, field
@@ -43,6 +45,13 @@ class SDKConfiguration:
     user_agent: str = __user_agent__
     retry_config: OptionalNullable[RetryConfig] = Field(default_factory=lambda: UNSET)
     timeout_ms: Optional[int] = None
+    # shared by all the retried requests of the SDK
+    circuit_breaker: Optional[CircuitBreaker] = None
+    retry_budget: Optional[RetryBudget] = None
+    # shared by all the requests of the SDK
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+    # bytes of the request and response bodies logged with the debug logger, None for all of them
+    debug_body_limit: Optional[int] = None
 
     def __post_init__(self):
         self._hooks = SDKHooks()
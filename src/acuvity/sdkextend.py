@@ -1,21 +1,38 @@
 # pylint: disable=protected-access
 
-from typing import Callable, Dict, Optional, Union
+import weakref
+from typing import Any, Callable, Dict, Optional, Union
 
 import httpx
 
 from acuvity import models
-from acuvity.apexdiscovery import discover_apex
+from acuvity.apexdiscovery import (
+    ApexDiscoveryCache,
+    ApexDiscoveryInvalidationHook,
+    default_apex_discovery_cache,
+    discover_apex,
+    discover_apex_async,
+)
 from acuvity.apexextend import ApexExtended
+from acuvity.coalescer import ScanCoalescer
+from acuvity.compression import RequestCompression
+from acuvity.connection import ConnectionConfig
+from acuvity.fileupload import FileStreamingHook
+from acuvity.scancache import ScanCacheBackend
 from acuvity.sdk import Acuvity
+from acuvity.timing import ScanTimingHook
 from acuvity.types import UNSET, OptionalNullable
 
-from .httpclient import AsyncHttpClient, HttpClient
+from .httpclient import AsyncHttpClient, HttpClient, close_clients
+from .lazyclient import LazyAsyncHttpClient, LazyHttpClient, close_created_clients
 from .utils.logger import Logger
-from .utils.retries import RetryConfig
+from .utils.ratelimit import AdaptiveRateLimiter
+from .utils.retries import CircuitBreaker, RetryBudget, RetryConfig
 
-# Save the original __init__ reference
+# Save the original __init__, __exit__ and __aexit__ references
 __original_init__ = Acuvity.__init__
+__original_exit__ = Acuvity.__exit__
+__original_aexit__ = Acuvity.__aexit__
 
 # Define the new __init__ method
 def __patched_init__(
@@ -33,6 +50,19 @@ def __patched_init__(
     retry_config: OptionalNullable[RetryConfig] = UNSET,
     timeout_ms: Optional[int] = None,
     debug_logger: Optional[Logger] = None,
+    scan_cache: Optional[ScanCacheBackend] = None,
+    apex_discovery_cache: Optional[ApexDiscoveryCache] = None,
+    scan_coalescer: Optional[ScanCoalescer] = None,
+    scan_timing_hook: Optional[ScanTimingHook] = None,
+    lazy_responses: bool = False,
+    file_streaming_threshold: Optional[int] = None,
+    request_compression: Optional[RequestCompression] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    debug_body_limit: Optional[int] = None,
+    connection_config: Optional[ConnectionConfig] = None,
+    file_read_workers: int = 4,
 ) -> None:
     r"""Instantiates the SDK configuring it with the provided parameters.
 
@@ -46,22 +76,59 @@ def __patched_init__(
     :param async_client: The Async HTTP client to use for all asynchronous methods
     :param retry_config: The retry configuration to use for all supported methods
     :param timeout_ms: Optional request timeout applied to each operation in milliseconds
+    :param scan_cache: Optional cache for scan results, e.g. an InMemoryScanCache, used by apex.scan() and its variants
+    :param apex_discovery_cache: Optional cache for the Apex discovery results, defaults to a process-wide cache persisted to the file named by ACUVITY_APEX_DISCOVERY_CACHE if set
+    :param scan_coalescer: Optional ScanCoalescer batching concurrent single-message scans into one request
+    :param scan_timing_hook: Optional ScanTimingHook timing the phases of every scan and exporting them
+    :param lazy_responses: Parse scan responses lazily, validating their fields and extractions only when accessed
+    :param file_streaming_threshold: Optional size in bytes from which scanned files are streamed from disk into the requests instead of being read into memory
+    :param request_compression: Optional RequestCompression compressing the request bodies over a size threshold, and setting the accepted response encodings
+    :param circuit_breaker: Optional CircuitBreaker failing the retried requests fast while Apex keeps failing
+    :param retry_budget: Optional RetryBudget capping the retries to a fraction of the requests
+    :param rate_limiter: Optional AdaptiveRateLimiter slowing down all the requests when Apex pushes back
+    :param debug_body_limit: Optional number of bytes of the request and response bodies logged by the debug logger
+    :param connection_config: Optional ConnectionConfig setting the pool, keep-alive, HTTP/2 and timeouts of the clients created by the SDK, and the connections opened upfront
+    :param file_read_workers: Maximum number of files read at once, off the event loop, by the async scans
     """
+    # the clients the SDK owns are only created on first use, most services use either the sync or the async methods
+    owned_client = None
     if client is None:
-        client = httpx.Client()
+        client = owned_client = LazyHttpClient(
+            connection_config.client if connection_config is not None else httpx.Client
+        )
+    owned_async_client = None
+    if async_client is None:
+        async_client = owned_async_client = LazyAsyncHttpClient(
+            connection_config.async_client if connection_config is not None else httpx.AsyncClient
+        )
 
     assert issubclass(
         type(client), HttpClient
     ), "The provided client must implement the HttpClient protocol."
 
+    if apex_discovery_cache is None:
+        apex_discovery_cache = default_apex_discovery_cache()
+    discovered = server_url is None and apex_domain is None
+
     apex_domain, apex_port = discover_apex(
         client=client,
         server_url=server_url,
         security=security,
         apex_domain=apex_domain,
         apex_port=apex_port,
+        cache=apex_discovery_cache,
     )
 
+    # must be set before the original __init__ as it calls _init_sdks
+    self._scan_cache = scan_cache
+    self._scan_coalescer = scan_coalescer
+    self._scan_timing_hook = scan_timing_hook
+    self._lazy_responses = lazy_responses
+    self._file_read_workers = file_read_workers
+    self._file_streaming_hook = None
+    if file_streaming_threshold is not None:
+        self._file_streaming_hook = FileStreamingHook(file_streaming_threshold)
+
     # Call the original __init__ using super
     __original_init__(
         self,
@@ -78,10 +145,181 @@ def __patched_init__(
         debug_logger=debug_logger,
     )
 
+    self.sdk_configuration.circuit_breaker = circuit_breaker
+    self.sdk_configuration.retry_budget = retry_budget
+    self.sdk_configuration.rate_limiter = rate_limiter
+    self.sdk_configuration.debug_body_limit = debug_body_limit
+
+    # the original __init__ only owns the clients it created itself
+    if owned_client is not None or owned_async_client is not None:
+        self.sdk_configuration.client_supplied = owned_client is None
+        self.sdk_configuration.async_client_supplied = owned_async_client is None
+        weakref.finalize(self, close_created_clients, self.sdk_configuration, owned_client, owned_async_client)
+
+    if scan_timing_hook is not None:
+        hooks = self.sdk_configuration.get_hooks()
+        hooks.register_before_request_hook(scan_timing_hook)
+        hooks.register_after_success_hook(scan_timing_hook)
+        hooks.register_after_error_hook(scan_timing_hook)
+
+    if self._file_streaming_hook is not None:
+        self.sdk_configuration.get_hooks().register_before_request_hook(self._file_streaming_hook)
+
+    # after the file streaming hook, which must find its markers in the uncompressed body
+    if request_compression is not None:
+        self.sdk_configuration.get_hooks().register_before_request_hook(request_compression)
+
+    # forget a discovered Apex that can't be connected to anymore
+    if discovered:
+        self.sdk_configuration.get_hooks().register_after_error_hook(
+            ApexDiscoveryInvalidationHook(apex_discovery_cache, security)
+        )
+
+    if connection_config is not None and connection_config.prewarm > 0:
+        sync_client = self.sdk_configuration.client
+        if isinstance(sync_client, LazyHttpClient):
+            sync_client = sync_client.client
+        if isinstance(sync_client, httpx.Client):
+            connection_config.prewarm_client(sync_client, self._get_url(None, None), self.sdk_configuration.debug_logger)
+
+class AsyncOnlyHttpClient:
+    """
+    Stands in for the synchronous client of an SDK created with Acuvity.create_async(),
+    so that no synchronous transport is ever built. Only the *_async methods can be used.
+    """
+
+    def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        raise RuntimeError("SDK was created with Acuvity.create_async(), use the async methods instead")
+
+    def build_request(self, method: str, url: Any, **kwargs: Any) -> httpx.Request:
+        raise RuntimeError("SDK was created with Acuvity.create_async(), use the async methods instead")
+
+    def close(self) -> None:
+        pass
+
+async def __create_async(
+    cls,
+    security: Optional[
+        Union[models.Security, Callable[[], models.Security]]
+    ] = None,
+    apex_domain: Optional[str] = None,
+    apex_port: Optional[str] = None,
+    server_idx: Optional[int] = None,
+    server_url: Optional[str] = None,
+    url_params: Optional[Dict[str, str]] = None,
+    async_client: Optional[AsyncHttpClient] = None,
+    retry_config: OptionalNullable[RetryConfig] = UNSET,
+    timeout_ms: Optional[int] = None,
+    debug_logger: Optional[Logger] = None,
+    scan_cache: Optional[ScanCacheBackend] = None,
+    apex_discovery_cache: Optional[ApexDiscoveryCache] = None,
+    scan_coalescer: Optional[ScanCoalescer] = None,
+    scan_timing_hook: Optional[ScanTimingHook] = None,
+    lazy_responses: bool = False,
+    file_streaming_threshold: Optional[int] = None,
+    request_compression: Optional[RequestCompression] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    debug_body_limit: Optional[int] = None,
+    connection_config: Optional[ConnectionConfig] = None,
+    file_read_workers: int = 4,
+) -> Acuvity:
+    r"""Instantiates an async-only SDK without blocking the event loop.
+
+    The Apex discovery is done with the async client, and no synchronous client is created:
+    only the *_async methods of the SDK can be used. The parameters are the same as for Acuvity().
+    """
+    async_client_supplied = async_client is not None
+    if async_client is None:
+        async_client = connection_config.async_client() if connection_config is not None else httpx.AsyncClient()
+
+    assert issubclass(
+        type(async_client), AsyncHttpClient
+    ), "The provided async_client must implement the AsyncHttpClient protocol."
+
+    if apex_discovery_cache is None:
+        apex_discovery_cache = default_apex_discovery_cache()
+    discovered = server_url is None and apex_domain is None
+
+    apex_domain, apex_port = await discover_apex_async(
+        client=async_client,
+        server_url=server_url,
+        security=security,
+        apex_domain=apex_domain,
+        apex_port=apex_port,
+        cache=apex_discovery_cache,
+    )
+
+    sdk = cls(
+        security=security,
+        apex_domain=apex_domain,
+        apex_port=apex_port,
+        server_idx=server_idx,
+        server_url=server_url,
+        url_params=url_params,
+        client=AsyncOnlyHttpClient(),
+        async_client=async_client,
+        retry_config=retry_config,
+        timeout_ms=timeout_ms,
+        debug_logger=debug_logger,
+        scan_cache=scan_cache,
+        apex_discovery_cache=apex_discovery_cache,
+        scan_coalescer=scan_coalescer,
+        scan_timing_hook=scan_timing_hook,
+        lazy_responses=lazy_responses,
+        file_streaming_threshold=file_streaming_threshold,
+        request_compression=request_compression,
+        circuit_breaker=circuit_breaker,
+        retry_budget=retry_budget,
+        rate_limiter=rate_limiter,
+        debug_body_limit=debug_body_limit,
+        connection_config=connection_config,
+        file_read_workers=file_read_workers,
+    )
+
+    # the SDK owns the async client it was given here unless the caller supplied it
+    if not async_client_supplied:
+        sdk.sdk_configuration.async_client_supplied = False
+        weakref.finalize(sdk, close_clients, sdk.sdk_configuration, None, True, async_client, False)
+
+    # forget a discovered Apex that can't be connected to anymore
+    if discovered:
+        sdk.sdk_configuration.get_hooks().register_after_error_hook(
+            ApexDiscoveryInvalidationHook(apex_discovery_cache, security)
+        )
+
+    if connection_config is not None and connection_config.prewarm > 0 and isinstance(async_client, httpx.AsyncClient):
+        await connection_config.prewarm_async_client(
+            async_client, sdk._get_url(None, None), sdk.sdk_configuration.debug_logger
+        )
+
+    return sdk
+
 # Define the new _init_sdks method
 def __patched_init_sdks(self):
-    self.apex = ApexExtended(self.sdk_configuration)
+    self.apex = ApexExtended(
+        self.sdk_configuration,
+        scan_cache=getattr(self, "_scan_cache", None),
+        scan_coalescer=getattr(self, "_scan_coalescer", None),
+        scan_timing_hook=getattr(self, "_scan_timing_hook", None),
+        lazy_responses=getattr(self, "_lazy_responses", False),
+        file_streaming_hook=getattr(self, "_file_streaming_hook", None),
+        file_read_workers=getattr(self, "_file_read_workers", 4),
+    )
+
+# Define the new __exit__ and __aexit__ methods, also stopping the file reading threads
+def __patched_exit__(self, exc_type, exc_val, exc_tb):
+    self.apex.close()
+    __original_exit__(self, exc_type, exc_val, exc_tb)
+
+async def __patched_aexit__(self, exc_type, exc_val, exc_tb):
+    self.apex.close()
+    await __original_aexit__(self, exc_type, exc_val, exc_tb)
 
-# Monkey-patch the __init__ and _init_sdks methods
+# Monkey-patch the __init__, _init_sdks, __exit__ and __aexit__ methods, and add the create_async factory
 setattr(Acuvity, "__init__", __patched_init__)
 setattr(Acuvity, "_init_sdks", __patched_init_sdks)
+setattr(Acuvity, "__exit__", __patched_exit__)
+setattr(Acuvity, "__aexit__", __patched_aexit__)
+setattr(Acuvity, "create_async", classmethod(__create_async))
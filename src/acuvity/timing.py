@@ -0,0 +1,219 @@
+import contextvars
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from acuvity.models.latency import Latency
+from acuvity.models.scanresponse import Scanresponse
+from acuvity.utils.logger import get_default_logger
+
+from ._hooks.types import (
+    AfterErrorContext,
+    AfterErrorHook,
+    AfterSuccessContext,
+    AfterSuccessHook,
+    BeforeRequestContext,
+    BeforeRequestHook,
+)
+
+logger = get_default_logger()
+
+SCAN_OPERATION_ID = "create-ScanRequest-as-ScanResponse"
+
+# client-side phases of a scan, in order
+PHASES = ("build", "serialize", "network", "unmarshal", "evaluate")
+
+# timer of the scan running in the current thread or task
+_current_timer: contextvars.ContextVar[Optional["_ScanTimer"]] = contextvars.ContextVar("acuvity_scan_timer", default=None)
+
+
+@dataclass
+class ScanTimings:
+    """
+    Where the time of one scan went, in seconds.
+
+    Attributes:
+        started_at_ns: Wall-clock start of the scan in nanoseconds since the epoch
+        build: Reading and encoding the files and building the scan request
+        serialize: Serializing the request and running the SDK hooks before sending it
+        network: Round trips to Apex, including retries and backoff
+        unmarshal: Parsing the response into a Scanresponse
+        evaluate: Evaluating the response against the guard config
+        total: The whole scan
+        attempts: Number of requests sent for this scan; 0 if the response came from the
+            scan cache or from a coalesced request sent by another scan, in which case the
+            wait is accounted as network
+        server: The latencies reported by Apex for the analysis, extraction and policies
+    """
+    started_at_ns: int
+    build: float = 0.0
+    serialize: float = 0.0
+    network: float = 0.0
+    unmarshal: float = 0.0
+    evaluate: float = 0.0
+    total: float = 0.0
+    attempts: int = 0
+    server: Optional[Latency] = None
+
+    def phases(self) -> Dict[str, float]:
+        """Returns the duration of every client-side phase, in order."""
+        return {phase: getattr(self, phase) for phase in PHASES}
+
+    def server_phases(self) -> Dict[str, float]:
+        """Returns the latencies reported by Apex in seconds, by phase."""
+        if self.server is None:
+            return {}
+        return {
+            name: value / 1e9
+            for name, value in self.server.model_dump(exclude_none=True).items()
+        }
+
+
+class _ScanTimer:
+    __slots__ = ("started_at_ns", "start", "built", "sent", "received", "returned", "attempts")
+
+    def __init__(self) -> None:
+        self.started_at_ns = time.time_ns()
+        self.start = time.perf_counter()
+        self.built: Optional[float] = None
+        self.sent: Optional[float] = None
+        self.received: Optional[float] = None
+        self.returned: Optional[float] = None
+        self.attempts = 0
+
+    def mark_built(self) -> None:
+        self.built = time.perf_counter()
+
+    def mark_returned(self) -> None:
+        self.returned = time.perf_counter()
+
+
+class ScanTimingHook(BeforeRequestHook, AfterSuccessHook, AfterErrorHook):
+    """
+    Times the phases of every scan and hands the ScanTimings to the exporters.
+
+    Pass it as the `scan_timing_hook` of the SDK: it is registered with the SDK hooks to
+    time the requests, and the timings are also set on the `timings` of every
+    ScanResponseMatch. Without it, scans are not timed at all.
+    """
+
+    def __init__(self, exporters: Optional[List[Callable[[ScanTimings], Any]]] = None):
+        """
+        Args:
+            exporters: Callables receiving the timings of every scan, e.g. an OpenTelemetryScanExporter
+        """
+        self.exporters = list(exporters or [])
+
+    def start(self) -> Tuple[_ScanTimer, contextvars.Token]:
+        """Starts timing a scan in the current thread or task."""
+        timer = _ScanTimer()
+        return timer, _current_timer.set(timer)
+
+    def finish(self, timer: _ScanTimer, token: contextvars.Token, response: Optional[Scanresponse]) -> Optional[ScanTimings]:
+        """
+        Stops timing a scan. Returns its timings, after exporting them, if it completed.
+        """
+        _current_timer.reset(token)
+        if response is None or timer.built is None or timer.returned is None:
+            # the scan failed
+            return None
+
+        end = time.perf_counter()
+        timings = ScanTimings(
+            started_at_ns=timer.started_at_ns,
+            build=timer.built - timer.start,
+            evaluate=end - timer.returned,
+            total=end - timer.start,
+            attempts=timer.attempts,
+            server=response.latency,
+        )
+        if timer.sent is not None and timer.received is not None:
+            timings.serialize = timer.sent - timer.built
+            timings.network = timer.received - timer.sent
+            timings.unmarshal = timer.returned - timer.received
+        else:
+            timings.network = timer.returned - timer.built
+
+        for exporter in self.exporters:
+            try:
+                exporter(timings)
+            except Exception: # pylint: disable=broad-exception-caught
+                logger.debug("Scan timings exporter failed", exc_info=True)
+        return timings
+
+    def before_request(self, hook_ctx: BeforeRequestContext, request: httpx.Request) -> httpx.Request:
+        timer = _current_timer.get()
+        if timer is not None and hook_ctx.operation_id == SCAN_OPERATION_ID:
+            if timer.sent is None:
+                timer.sent = time.perf_counter()
+            timer.attempts += 1
+        return request
+
+    def after_success(self, hook_ctx: AfterSuccessContext, response: httpx.Response) -> httpx.Response:
+        timer = _current_timer.get()
+        if timer is not None and hook_ctx.operation_id == SCAN_OPERATION_ID:
+            timer.received = time.perf_counter()
+        return response
+
+    def after_error(
+        self,
+        hook_ctx: AfterErrorContext,
+        response: Optional[httpx.Response],
+        error: Optional[Exception],
+    ) -> Tuple[Optional[httpx.Response], Optional[Exception]]:
+        timer = _current_timer.get()
+        if timer is not None and hook_ctx.operation_id == SCAN_OPERATION_ID:
+            timer.received = time.perf_counter()
+        return response, error
+
+
+class OpenTelemetryScanExporter:
+    """
+    Exports scan timings to OpenTelemetry, without depending on it.
+
+    Every scan becomes an "acuvity.scan" span of the tracer, with its phases as attributes
+    and as events at the end of each phase. If a meter is given, the phase durations are
+    also recorded in the "acuvity.scan.duration" histogram with a `phase` attribute.
+
+        tracer = opentelemetry.trace.get_tracer("acuvity")
+        meter = opentelemetry.metrics.get_meter("acuvity")
+        hook = ScanTimingHook([OpenTelemetryScanExporter(tracer, meter)])
+    """
+
+    def __init__(self, tracer: Any = None, meter: Any = None):
+        """
+        Args:
+            tracer: An OpenTelemetry tracer, or None to not export spans
+            meter: An OpenTelemetry meter, or None to not export metrics
+        """
+        self.tracer = tracer
+        self.histogram = None
+        if meter is not None:
+            self.histogram = meter.create_histogram(
+                "acuvity.scan.duration", unit="s", description="Duration of the phases of Acuvity scans",
+            )
+
+    def __call__(self, timings: ScanTimings) -> None:
+        phases = timings.phases()
+        server_phases = timings.server_phases()
+
+        if self.histogram is not None:
+            self.histogram.record(timings.total, attributes={"phase": "total"})
+            for phase, duration in phases.items():
+                self.histogram.record(duration, attributes={"phase": phase})
+            for phase, duration in server_phases.items():
+                self.histogram.record(duration, attributes={"phase": f"server.{phase}"})
+
+        if self.tracer is None:
+            return
+        attributes: Dict[str, Any] = {"acuvity.scan.attempts": timings.attempts}
+        attributes.update({f"acuvity.scan.{phase}": duration for phase, duration in phases.items()})
+        attributes.update({f"acuvity.scan.server.{phase}": duration for phase, duration in server_phases.items()})
+        span = self.tracer.start_span("acuvity.scan", start_time=timings.started_at_ns, attributes=attributes)
+        elapsed = 0.0
+        for phase, duration in phases.items():
+            elapsed += duration
+            span.add_event(phase, timestamp=timings.started_at_ns + int(elapsed * 1e9))
+        span.end(end_time=timings.started_at_ns + int(timings.total * 1e9))
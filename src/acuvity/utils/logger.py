@@ -1,9 +1,9 @@
-"""Code generated by Speakeasy (https://speakeasy.com). DO NOT EDIT."""
+"""Code originally generated by Speakeasy (https://speakeasy.com)."""
 
 import httpx
 import logging
 import os
-from typing import Any, Protocol
+from typing import Any, Optional, Protocol
 
 
 class Logger(Protocol):
@@ -16,8 +16,35 @@ class NoOpLogger:
         pass
 
 
-def get_body_content(req: httpx.Request) -> str:
-    return "<streaming body>" if not hasattr(req, "_content") else str(req.content)
+def is_debug_enabled(logger: Logger) -> bool:
+    """
+    Returns whether debug messages of the logger go anywhere, so that their arguments are
+    worth building. Loggers other than NoOpLogger and logging.Logger are assumed to log them.
+    """
+    if isinstance(logger, NoOpLogger):
+        return False
+    if isinstance(logger, logging.Logger):
+        return logger.isEnabledFor(logging.DEBUG)
+    return True
+
+
+def _truncated(content: bytes, limit: Optional[int]) -> str:
+    if limit is None or len(content) <= limit:
+        return str(content)
+    return f"{content[:limit]!s}... ({len(content) - limit} more bytes)"
+
+
+def get_body_content(req: httpx.Request, limit: Optional[int] = None) -> str:
+    """Returns the body of the request for logging, truncated to `limit` bytes if given."""
+    return "<streaming body>" if not hasattr(req, "_content") else _truncated(req.content, limit)
+
+
+def get_response_content(res: httpx.Response, limit: Optional[int] = None) -> str:
+    """Returns the body of the response for logging, truncated to `limit` bytes if given."""
+    if limit is None or len(res.content) <= limit:
+        return res.text
+    text = res.content[:limit].decode(res.encoding or "utf-8", errors="replace")
+    return f"{text}... ({len(res.content) - limit} more bytes)"
 
 
 def get_default_logger() -> Logger:
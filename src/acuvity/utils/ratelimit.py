@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Sequence
+
+import httpx
+
+from .retries import get_retry_after
+
+
+@dataclass
+class RateLimiterStats:
+    """
+    Attributes:
+        rate: Current limit in requests per second, None while requests are not limited
+        throttled: Number of responses signaling backpressure
+        delayed: Number of requests delayed by the limiter
+    """
+    rate: Optional[float]
+    throttled: int
+    delayed: int
+
+
+class AdaptiveRateLimiter:
+    """
+    Slows down the requests of all the callers sharing an SDKConfiguration when Apex pushes back.
+
+    Requests are not limited until a response signals backpressure: a 429 or a 503 by
+    default. From then on:
+    - no request is sent before the delay asked by the server with Retry-After, if any;
+    - requests are limited to `decrease` times the rate of the last second, at most once
+      per second, and the limit grows by `increase` requests per second with every
+      successful response, until no backpressure was seen for `recovery_time` seconds.
+    """
+
+    def __init__(
+        self,
+        decrease: float = 0.5,
+        increase: float = 1.0,
+        min_rate: float = 1.0,
+        recovery_time: float = 30.0,
+        backpressure_statuses: Sequence[int] = (429, 503),
+    ):
+        """
+        Args:
+            decrease: Factor applied to the rate of requests on backpressure
+            increase: Requests per second added to the limit by every successful response
+            min_rate: Lowest limit in requests per second
+            recovery_time: Seconds without backpressure after which requests are not limited anymore
+            backpressure_statuses: Status codes of the responses signaling backpressure
+        """
+        self.decrease = decrease
+        self.increase = increase
+        self.min_rate = min_rate
+        self.recovery_time = recovery_time
+        self.backpressure_statuses = frozenset(backpressure_statuses)
+        self._lock = threading.Lock()
+        self._rate: Optional[float] = None
+        # earliest time of the next request
+        self._next = 0.0
+        self._paused_until = 0.0
+        self._backpressure_at = float("-inf")
+        self._decreased_at = float("-inf")
+        # times of the requests of the last second
+        self._sent: Deque[float] = deque()
+        self._throttled = 0
+        self._delayed = 0
+
+    def _reserve(self) -> float:
+        """Reserves the next slot to send a request, and returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            if self._rate is not None:
+                start = max(start, self._next)
+                self._next = start + 1 / self._rate
+            self._sent.append(start)
+            while self._sent[0] < now - 1.0:
+                self._sent.popleft()
+            if start > now:
+                self._delayed += 1
+            return start - now
+
+    def acquire(self) -> None:
+        """Waits until the next request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Async variant of acquire()."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_response(self, response: httpx.Response) -> None:
+        """Adapts the limit to a response."""
+        with self._lock:
+            now = time.monotonic()
+            if response.status_code in self.backpressure_statuses:
+                self._throttled += 1
+                self._backpressure_at = now
+                retry_after = get_retry_after(response)
+                if retry_after is not None:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+                if now - self._decreased_at >= 1.0:
+                    self._decreased_at = now
+                    current = self._rate if self._rate is not None else len(self._sent)
+                    self._rate = max(self.min_rate, current * self.decrease)
+                return
+
+            if self._rate is None or response.status_code >= 400:
+                return
+            if now - self._backpressure_at >= self.recovery_time:
+                self._rate = None
+            else:
+                self._rate += self.increase
+
+    def stats(self) -> RateLimiterStats:
+        with self._lock:
+            return RateLimiterStats(self._rate, self._throttled, self._delayed)
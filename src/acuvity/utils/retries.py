@@ -1,12 +1,17 @@
-"""Code generated by Speakeasy (https://speakeasy.com). DO NOT EDIT."""
+"""Code originally generated by Speakeasy (https://speakeasy.com)."""
 
 import asyncio
 import random
+import threading
 import time
-from typing import List
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Tuple
 
 import httpx
 
+from .values import match_status_codes
+
 
 class BackoffStrategy:
     initial_interval: int
@@ -40,13 +45,284 @@ class RetryConfig:
         self.retry_connection_errors = retry_connection_errors
 
 
+def _parse_seconds(value: str) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Returns how many seconds the server asks to wait before retrying, if it does: its
+    Retry-After header, in seconds or as an HTTP date, or else the reset time of an
+    exhausted rate limit in the RateLimit-* or X-RateLimit-* headers.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        return _parse_seconds(retry_after.strip())
+
+    for prefix in ("RateLimit-", "X-RateLimit-"):
+        remaining = response.headers.get(prefix + "Remaining")
+        reset = response.headers.get(prefix + "Reset")
+        if remaining is None or reset is None or remaining.strip() != "0":
+            continue
+        try:
+            seconds = float(reset)
+        except ValueError:
+            continue
+        # some servers send the time of the reset rather than a delay
+        if seconds > 1e9:
+            seconds -= time.time()
+        return max(0.0, seconds)
+    return None
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+@dataclass
+class CircuitBreakerStats:
+    """
+    Attributes:
+        state: "closed", "open" or "half_open"
+        failures: Consecutive failures counted while closed
+        opened: Number of times the circuit opened
+        rejected: Number of requests failed fast while open
+    """
+    state: str
+    failures: int
+    opened: int
+    rejected: int
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while Apex is failing, instead of sending them and retrying them.
+
+    The circuit opens after `failure_threshold` consecutive failed attempts: requests
+    answered with a retryable status code, connection errors, timeouts and the other
+    transport errors. While open, requests fail with a CircuitOpenError without being sent.
+    After `recovery_time` seconds it is half-open: up to `half_open_requests` probes are
+    sent, and the circuit closes again on the first success, or opens again on the first
+    failure. A probe ending with another error, e.g. raised by a hook, or cancelled, is
+    neither, and lets another request probe.
+
+    It is shared by all the requests of an SDKConfiguration, across threads and tasks,
+    retried or not.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0, half_open_requests: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_requests = half_open_requests
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._opened = 0
+        self._rejected = 0
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_time:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent now, counting it as a probe if half-open."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probes < self.half_open_requests:
+                self._probes += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def release(self) -> None:
+        """Gives back the probe of a request that ended with neither a success nor a failure."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                self._failures += 1
+                if self._failures < self.failure_threshold:
+                    return
+            elif state == self.OPEN:
+                return
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._failures = 0
+            self._opened += 1
+
+    def stats(self) -> CircuitBreakerStats:
+        with self._lock:
+            return CircuitBreakerStats(self._current_state(), self._failures, self._opened, self._rejected)
+
+
+@dataclass
+class RetryBudgetStats:
+    """
+    Attributes:
+        requests: Number of requests sent for the first time
+        retries: Number of retries allowed
+        denied: Number of retries denied for lack of budget
+        tokens: Retries currently available
+    """
+    requests: int
+    retries: int
+    denied: int
+    tokens: float
+
+
+class RetryBudget:
+    """
+    Token bucket capping the retries to a fraction of the requests.
+
+    Every request adds `ratio` tokens to the bucket, and every retry takes one; when the
+    bucket is empty the request is not retried, and its last response or error is returned
+    at once. The bucket also refills at `min_retries_per_second`, so that low traffic can
+    still be retried, and holds at most `max_tokens`, which it starts with.
+
+    It is shared by all the requests of an SDKConfiguration, across threads and tasks.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries_per_second: float = 1.0, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._tokens = max_tokens
+        self._refilled_at = time.monotonic()
+        self._requests = 0
+        self._retries = 0
+        self._denied = 0
+
+    def _refill(self, tokens: float) -> None:
+        now = time.monotonic()
+        tokens += (now - self._refilled_at) * self.min_retries_per_second
+        self._refilled_at = now
+        self._tokens = min(self.max_tokens, self._tokens + tokens)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+            self._refill(self.ratio)
+
+    def try_retry(self) -> bool:
+        """Takes a token for a retry, returns False if none is left."""
+        with self._lock:
+            self._refill(0.0)
+            if self._tokens < 1.0:
+                self._denied += 1
+                return False
+            self._tokens -= 1.0
+            self._retries += 1
+            return True
+
+    def stats(self) -> RetryBudgetStats:
+        with self._lock:
+            self._refill(0.0)
+            return RetryBudgetStats(self._requests, self._retries, self._denied, self._tokens)
+
+
+# status codes counted as failures by the circuit breaker for the requests sent without retries
+CIRCUIT_BREAKER_STATUS_CODES = ["408", "423", "429", "502", "503", "504"]
+
+
+def with_circuit_breaker(func, breaker: CircuitBreaker, status_codes: List[str]):
+    """
+    Wraps a request to fail fast with a CircuitOpenError while the circuit is open, and to
+    record its outcome: a response with one of `status_codes` or a transport error is a
+    failure, any other response a success.
+    """
+
+    def do_request() -> httpx.Response:
+        if not breaker.allow():
+            raise CircuitOpenError("circuit breaker is open, Apex is failing")
+        try:
+            res = func()
+        except BaseException as exception:
+            if isinstance(exception, httpx.TransportError):
+                breaker.record_failure()
+            else:
+                breaker.release()
+            raise
+        if match_status_codes(status_codes, res.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return res
+
+    return do_request
+
+
+def with_circuit_breaker_async(func, breaker: CircuitBreaker, status_codes: List[str]):
+    """Async variant of with_circuit_breaker()."""
+
+    async def do_request() -> httpx.Response:
+        if not breaker.allow():
+            raise CircuitOpenError("circuit breaker is open, Apex is failing")
+        try:
+            res = await func()
+        except BaseException as exception:
+            if isinstance(exception, httpx.TransportError):
+                breaker.record_failure()
+            else:
+                breaker.release()
+            raise
+        if match_status_codes(status_codes, res.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return res
+
+    return do_request
+
+
 class Retries:
     config: RetryConfig
     status_codes: List[str]
+    circuit_breaker: Optional[CircuitBreaker]
+    retry_budget: Optional[RetryBudget]
 
-    def __init__(self, config: RetryConfig, status_codes: List[str]):
+    def __init__(
+        self,
+        config: RetryConfig,
+        status_codes: List[str],
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ):
         self.config = config
         self.status_codes = status_codes
+        self.circuit_breaker = circuit_breaker
+        self.retry_budget = retry_budget
 
 
 class TemporaryError(Exception):
@@ -64,6 +340,9 @@ class PermanentError(Exception):
 
 
 def retry(func, retries: Retries):
+    if retries.circuit_breaker is not None:
+        func = with_circuit_breaker(func, retries.circuit_breaker, retries.status_codes)
+
     if retries.config.strategy == "backoff":
 
         def do_request() -> httpx.Response:
@@ -101,18 +380,25 @@ def retry(func, retries: Retries):
 
             return res
 
+        if retries.retry_budget is not None:
+            retries.retry_budget.record_request()
+
         return retry_with_backoff(
             do_request,
             retries.config.backoff.initial_interval,
             retries.config.backoff.max_interval,
             retries.config.backoff.exponent,
             retries.config.backoff.max_elapsed_time,
+            retries.retry_budget,
         )
 
     return func()
 
 
 async def retry_async(func, retries: Retries):
+    if retries.circuit_breaker is not None:
+        func = with_circuit_breaker_async(func, retries.circuit_breaker, retries.status_codes)
+
     if retries.config.strategy == "backoff":
 
         async def do_request() -> httpx.Response:
@@ -150,23 +436,41 @@ async def retry_async(func, retries: Retries):
 
             return res
 
+        if retries.retry_budget is not None:
+            retries.retry_budget.record_request()
+
         return await retry_with_backoff_async(
             do_request,
             retries.config.backoff.initial_interval,
             retries.config.backoff.max_interval,
             retries.config.backoff.exponent,
             retries.config.backoff.max_elapsed_time,
+            retries.retry_budget,
         )
 
     return await func()
 
 
+def _retry_delay(exception: Exception, retries: int, initial_interval, max_interval, exponent) -> Tuple[float, bool]:
+    """
+    Returns the seconds to wait before the next attempt, and whether the server asked for it.
+    The delay asked by the server is honored as is, without jitter nor max_interval.
+    """
+    if isinstance(exception, TemporaryError):
+        retry_after = get_retry_after(exception.response)
+        if retry_after is not None:
+            return retry_after, True
+    sleep = (initial_interval / 1000) * exponent**retries + random.uniform(0, 1)
+    return min(sleep, max_interval / 1000), False
+
+
 def retry_with_backoff(
     func,
     initial_interval=500,
     max_interval=60000,
     exponent=1.5,
     max_elapsed_time=3600000,
+    retry_budget: Optional[RetryBudget] = None,
 ):
     start = round(time.time() * 1000)
     retries = 0
@@ -178,13 +482,17 @@ def retry_with_backoff(
             raise exception.inner
         except Exception as exception:  # pylint: disable=broad-exception-caught
             now = round(time.time() * 1000)
-            if now - start > max_elapsed_time:
+            sleep, requested = _retry_delay(exception, retries, initial_interval, max_interval, exponent)
+            if (
+                now - start > max_elapsed_time
+                # don't wait for the server past the deadline
+                or (requested and now + sleep * 1000 - start > max_elapsed_time)
+                or (retry_budget is not None and not retry_budget.try_retry())
+            ):
                 if isinstance(exception, TemporaryError):
                     return exception.response
 
                 raise
-            sleep = (initial_interval / 1000) * exponent**retries + random.uniform(0, 1)
-            sleep = min(sleep, max_interval / 1000)
             time.sleep(sleep)
             retries += 1
 
@@ -195,6 +503,7 @@ async def retry_with_backoff_async(
     max_interval=60000,
     exponent=1.5,
     max_elapsed_time=3600000,
+    retry_budget: Optional[RetryBudget] = None,
 ):
     start = round(time.time() * 1000)
     retries = 0
@@ -206,12 +515,16 @@ async def retry_with_backoff_async(
             raise exception.inner
         except Exception as exception:  # pylint: disable=broad-exception-caught
             now = round(time.time() * 1000)
-            if now - start > max_elapsed_time:
+            sleep, requested = _retry_delay(exception, retries, initial_interval, max_interval, exponent)
+            if (
+                now - start > max_elapsed_time
+                # don't wait for the server past the deadline
+                or (requested and now + sleep * 1000 - start > max_elapsed_time)
+                or (retry_budget is not None and not retry_budget.try_retry())
+            ):
                 if isinstance(exception, TemporaryError):
                     return exception.response
 
                 raise
-            sleep = (initial_interval / 1000) * exponent**retries + random.uniform(0, 1)
-            sleep = min(sleep, max_interval / 1000)
             await asyncio.sleep(sleep)
             retries += 1
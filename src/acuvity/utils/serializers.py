@@ -1,12 +1,12 @@
-"""Code generated by Speakeasy (https://speakeasy.com). DO NOT EDIT."""
+"""Code originally generated by Speakeasy (https://speakeasy.com)."""
 
+from contextvars import ContextVar
 from decimal import Decimal
-import json
-from typing import Any, Dict, List, Union, get_args
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Union, get_args
 import httpx
 from typing_extensions import get_origin
-from pydantic import ConfigDict, create_model
-from pydantic_core import from_json
+from pydantic import ConfigDict, PydanticUserError, TypeAdapter
 from typing_inspection.typing_objects import is_union
 
 from ..types.basemodel import BaseModel, Nullable, OptionalNullable, Unset
@@ -133,41 +133,63 @@ def validate_const(v):
     return validate
 
 
-def unmarshal_json(raw, typ: Any) -> Any:
-    return unmarshal(from_json(raw), typ)
+_ADAPTER_CONFIG = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
+# process-wide cache of compiled type adapters, keyed by the target type
+# (e.g. models.Scanresponse or List[models.Analyzer])
+_type_adapters: Dict[Any, TypeAdapter] = {}
+
+
+# per-context replacements of unmarshal_json for some types, e.g. to parse scan responses lazily
+json_unmarshallers: ContextVar[Mapping[Any, Callable[[Any], Any]]] = ContextVar(
+    "acuvity_json_unmarshallers", default=MappingProxyType({})
+)
 
-def unmarshal(val, typ: Any) -> Any:
-    unmarshaller = create_model(
-        "Unmarshaller",
-        body=(typ, ...),
-        __config__=ConfigDict(populate_by_name=True, arbitrary_types_allowed=True),
-    )
 
-    m = unmarshaller(body=val)
+def _build_type_adapter(typ: Any) -> TypeAdapter:
+    try:
+        return TypeAdapter(typ, config=_ADAPTER_CONFIG)
+    except PydanticUserError:
+        # models, dataclasses and TypedDicts carry their own config
+        return TypeAdapter(typ)
 
-    # pyright: ignore[reportAttributeAccessIssue]
-    return m.body  # type: ignore
+
+def get_type_adapter(typ: Any) -> TypeAdapter:
+    try:
+        adapter = _type_adapters.get(typ)
+    except TypeError:
+        # unhashable type annotations cannot be cached
+        return _build_type_adapter(typ)
+
+    if adapter is None:
+        adapter = _build_type_adapter(typ)
+        _type_adapters[typ] = adapter
+
+    return adapter
+
+
+def unmarshal_json(raw, typ: Any) -> Any:
+    unmarshaller = json_unmarshallers.get().get(typ)
+    if unmarshaller is not None:
+        return unmarshaller(raw)
+    return get_type_adapter(typ).validate_json(raw)
+
+
+def unmarshal(val, typ: Any) -> Any:
+    return get_type_adapter(typ).validate_python(val)
 
 
 def marshal_json(val, typ):
     if is_nullable(typ) and val is None:
         return "null"
 
-    marshaller = create_model(
-        "Marshaller",
-        body=(typ, ...),
-        __config__=ConfigDict(populate_by_name=True, arbitrary_types_allowed=True),
-    )
-
-    m = marshaller(body=val)
-
-    d = m.model_dump(by_alias=True, mode="json", exclude_none=True)
+    adapter = get_type_adapter(typ)
 
-    if len(d) == 0:
+    body = adapter.validate_python(val)
+    if body is None:
         return ""
 
-    return json.dumps(d[next(iter(d))], separators=(",", ":"))
+    return adapter.dump_json(body, by_alias=True, exclude_none=True).decode("utf-8")
 
 
 def is_nullable(field):
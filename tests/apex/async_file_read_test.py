@@ -0,0 +1,123 @@
+import asyncio
+import base64
+import builtins
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from acuvity import apexextend
+
+
+async def echo_extractions(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    return httpx.Response(200, json={
+        "principal": {"type": "App"},
+        "extractions": [{"data": e["data"]} for e in body.get("extractions", [])],
+    })
+
+
+class SlowOpen:
+    """Opens files slowly, recording the threads reading them and the reads at once"""
+
+    def __init__(self, monkeypatch, delay: float = 0.05):
+        self.delay = delay
+        self.threads = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+        monkeypatch.setattr(apexextend, "open", self, raising=False)
+
+    def __call__(self, path, mode="r"):
+        with self.lock:
+            self.threads.append(threading.current_thread().name)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return builtins.open(path, mode)
+
+
+@pytest.fixture(name="files")
+def fixture_files(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"file{i}.txt"
+        path.write_bytes(f"content {i}".encode())
+        paths.append(path)
+    return paths
+
+
+def test_files_read_off_the_loop(make_acuvity, files, monkeypatch):
+    """The files are read in parallel in the file reading threads, while the loop keeps running"""
+    slow_open = SlowOpen(monkeypatch)
+    s = make_acuvity(async_handler=echo_extractions)
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.ensure_future(tick())
+        start = time.perf_counter()
+        res = await s.apex.scan_async(files=files)
+        elapsed = time.perf_counter() - start
+        ticker.cancel()
+        return res, elapsed, ticks
+
+    res, elapsed, ticks = asyncio.run(run())
+
+    assert [base64.b64decode(e.data) for e in res.scan_response.extractions] == [
+        f"content {i}".encode() for i in range(4)
+    ]
+    assert all(name.startswith("acuvity-file-read") for name in slow_open.threads)
+    assert slow_open.max_running == 4
+    assert elapsed < 0.15
+    assert ticks >= 5
+
+
+def test_bounded_file_reads(make_acuvity, files, monkeypatch):
+    """The reads at once are bounded across the concurrent scans"""
+    slow_open = SlowOpen(monkeypatch, delay=0.02)
+    s = make_acuvity(async_handler=echo_extractions, file_read_workers=2)
+
+    async def run():
+        return await asyncio.gather(*(s.apex.scan_async(files=files) for _ in range(3)))
+
+    results = asyncio.run(run())
+
+    assert len(slow_open.threads) == 12
+    assert slow_open.max_running == 2
+    assert all(len(r.scan_response.extractions) == 4 for r in results)
+
+
+def test_invalid_files(make_acuvity):
+    s = make_acuvity()
+    with pytest.raises(ValueError, match="files must be strings or paths"):
+        asyncio.run(s.apex.scan_async(files=[1]))
+
+
+
+def test_file_read_threads_stop_on_close(make_acuvity, files):
+    """Closing the SDK stops its file reading threads"""
+    s = make_acuvity(async_handler=echo_extractions)
+    before = set(threading.enumerate())
+
+    async def run():
+        async with s:
+            await s.apex.scan_async(files=files)
+            return [t for t in set(threading.enumerate()) - before if t.name.startswith("acuvity-file-read")]
+
+    threads = asyncio.run(run())
+
+    assert threads
+    for thread in threads:
+        thread.join(timeout=1)
+        assert not thread.is_alive()
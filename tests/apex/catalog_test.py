@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from acuvity import models
+from acuvity.catalog import AnalyzerCatalog, AnalyzerCatalogCache
+
+ANALYZERS = [
+    {
+        "name": "secrets-detector",
+        "group": "Secrets",
+        "detectors": [
+            {"name": "aws_key", "group": "Secrets"},
+            {"name": "github_token", "group": "Secrets"},
+        ],
+    },
+    {
+        "name": "pii-detector",
+        "group": "PIIs",
+        "detectors": [
+            {"name": "ssn", "group": "PIIs"},
+            {"name": "email", "group": "PIIs"},
+        ],
+    },
+    {
+        "name": "pii-detector-ml",
+        "group": "PIIs",
+        "detectors": [
+            {"name": "email", "group": "PIIs"},
+            {"name": "person", "group": "PIIs"},
+        ],
+    },
+]
+
+
+def analyzers_handler(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=ANALYZERS)
+    return handler
+
+
+@pytest.fixture
+def catalog_cache() -> AnalyzerCatalogCache:
+    return AnalyzerCatalogCache()
+
+
+def test_catalog_indexes():
+    """Detectors are indexed by group, name and analyzer"""
+    catalog = AnalyzerCatalog([models.Analyzer.model_validate(a) for a in ANALYZERS])
+
+    assert catalog.detector_names("PIIs") == ["email", "person", "ssn"]
+    assert catalog.detector_names("Secrets") == ["aws_key", "github_token"]
+    assert catalog.detector_names("Unknown") == []
+    assert catalog.groups() == ["PIIs", "Secrets"]
+    assert len(catalog.detectors("email")) == 2
+    assert catalog.has_detector("aws_key", group="Secrets")
+    assert not catalog.has_detector("aws_key", group="PIIs")
+    assert catalog.analyzer("pii-detector-ml").group == "PIIs"
+    assert [d.name for d in catalog.analyzer_detectors("secrets-detector")] == ["aws_key", "github_token"]
+
+
+def test_catalog_is_shared_between_sdk_instances(make_acuvity, catalog_cache):
+    """Instances talking to the same Apex with the same token fetch the analyzers once"""
+    calls = []
+    first = make_acuvity(analyzers_handler(calls))
+    second = make_acuvity(analyzers_handler(calls))
+    first.apex.analyzer_catalog_cache = catalog_cache
+    second.apex.analyzer_catalog_cache = catalog_cache
+
+    assert first.apex.list_detectable_secrets() == ["aws_key", "github_token"]
+    assert second.apex.list_detectable_piis() == ["email", "person", "ssn"]
+    assert len(calls) == 1
+
+
+def test_catalog_refreshes_in_background(catalog_cache):
+    """An expired catalog is served while a refresh runs"""
+    catalog_cache.ttl = 0.01
+    old = [models.Analyzer(name="old")]
+    new = [models.Analyzer(name="new")]
+    catalog_cache.get("k", lambda: old)
+    time.sleep(0.02)
+
+    assert catalog_cache.get("k", lambda: new).analyzer("old") is not None
+    for _ in range(100):
+        if catalog_cache.get("k", lambda: new).analyzer("new") is not None:
+            break
+        time.sleep(0.01)
+    assert catalog_cache.get("k", lambda: new).analyzer("new") is not None
+
+
+def test_catalog_refreshes_in_background_async(catalog_cache):
+    """Async callers refresh an expired catalog in a task and keep it on failure"""
+    catalog_cache.ttl = 0.01
+
+    async def failing():
+        raise ValueError("unavailable")
+
+    async def fetch():
+        return [models.Analyzer(name="new")]
+
+    async def run():
+        await catalog_cache.get_async("k", fetch)
+        await asyncio.sleep(0.02)
+        assert (await catalog_cache.get_async("k", failing)).analyzer("new") is not None
+        await asyncio.sleep(0)
+        assert (await catalog_cache.get_async("k", fetch)).analyzer("new") is not None
+
+    asyncio.run(run())
@@ -0,0 +1,121 @@
+import asyncio
+import base64
+import json
+
+import httpx
+import pytest
+from helpers import echo_scan_handler
+
+from acuvity import Acuvity, RequestCompression, Security
+from acuvity.compression import compress, decompress
+from acuvity.emulator import ApexEmulator, EmulatorConfig
+
+LONG_MESSAGE = "a long conversation " * 1000
+
+
+class Recorder:
+    """Records the headers of the scan requests, and echoes their decompressed messages"""
+
+    def __init__(self):
+        self.headers = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.headers.append(request.headers)
+        content = request.read()
+        if "Content-Encoding" in request.headers:
+            assert int(request.headers["Content-Length"]) == len(content)
+            content = decompress(content, request.headers["Content-Encoding"])
+        return echo_scan_handler(httpx.Request(request.method, request.url, content=content))
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return self.handler(request)
+
+
+def test_compressed_requests(make_acuvity):
+    """Bodies over the threshold are compressed, the others are sent as is"""
+    recorder = Recorder()
+    s = make_acuvity(handler=recorder.handler, request_compression=RequestCompression(threshold=1024))
+
+    assert s.apex.scan(LONG_MESSAGE).scan_response.extractions[0].data == LONG_MESSAGE
+    assert s.apex.scan("short").scan_response.extractions[0].data == "short"
+
+    assert recorder.headers[0]["Content-Encoding"] == "gzip"
+    assert int(recorder.headers[0]["Content-Length"]) < len(LONG_MESSAGE) // 10
+    assert "Content-Encoding" not in recorder.headers[1]
+
+
+def test_async_compressed_requests(make_acuvity):
+    recorder = Recorder()
+    s = make_acuvity(async_handler=recorder.async_handler, request_compression=RequestCompression(threshold=1024))
+
+    res = asyncio.run(s.apex.scan_async(LONG_MESSAGE))
+
+    assert res.scan_response.extractions[0].data == LONG_MESSAGE
+    assert recorder.headers[0]["Content-Encoding"] == "gzip"
+
+
+def test_accept_encodings(make_acuvity):
+    """The accepted response encodings are only set if given"""
+    recorder = Recorder()
+    s = make_acuvity(handler=recorder.handler, request_compression=RequestCompression(accept_encodings=["identity"]))
+    s.apex.scan("hello")
+    default = make_acuvity(handler=recorder.handler, request_compression=RequestCompression())
+    default.apex.scan("hello")
+
+    assert recorder.headers[0]["Accept-Encoding"] == "identity"
+    assert "gzip" in recorder.headers[1]["Accept-Encoding"]
+
+
+def test_invalid_encodings():
+    with pytest.raises(ValueError):
+        RequestCompression("lz4")
+    with pytest.raises(ValueError):
+        RequestCompression(accept_encodings=["gzip", "compress"])
+
+
+def test_zstd():
+    try:
+        compressed = compress(LONG_MESSAGE.encode(), "zstd")
+    except ImportError:
+        with pytest.raises(ImportError):
+            RequestCompression("zstd")
+        pytest.skip("no zstd implementation")
+    assert decompress(compressed, "zstd") == LONG_MESSAGE.encode()
+
+
+def test_streamed_files_are_not_compressed(make_acuvity, tmp_path):
+    """Files streamed from disk are still found in the request body, which is left uncompressed"""
+    path = tmp_path / "file.txt"
+    path.write_text(LONG_MESSAGE)
+    recorder = Recorder()
+    s = make_acuvity(
+        handler=recorder.handler,
+        file_streaming_threshold=0,
+        request_compression=RequestCompression(threshold=0),
+    )
+
+    res = s.apex.scan("hello", files=path)
+
+    assert "Content-Encoding" not in recorder.headers[0]
+    assert res.scan_response.extractions[0].data == "hello"
+
+
+def test_emulator_compression():
+    """The emulator decodes compressed requests, and compresses its responses"""
+    with ApexEmulator(EmulatorConfig(compress_responses=True)) as apex:
+        s = Acuvity(
+            security=Security(token="token"),
+            server_url=apex.url,
+            retry_config=None,
+            request_compression=RequestCompression(threshold=1024, accept_encodings=["gzip"]),
+        )
+        res = s.apex.scan(LONG_MESSAGE)
+        assert res.scan_response.extractions[0].data == LONG_MESSAGE
+
+        raw = httpx.post(f"{apex.url}/_acuvity/scan", json={"messages": [LONG_MESSAGE]}, headers={"Accept-Encoding": "gzip"})
+        assert raw.headers["Content-Encoding"] == "gzip"
+
+        body = compress(json.dumps({"messages": ["hello"]}).encode(), "gzip")
+        bad = httpx.post(f"{apex.url}/_acuvity/scan", content=base64.b64encode(body), headers={"Content-Encoding": "gzip"})
+        assert bad.status_code == 415
@@ -0,0 +1,32 @@
+from typing import Callable, Optional
+
+import httpx
+import pytest
+from helpers import SERVER_URL, async_echo_scan_handler, echo_scan_handler
+
+from acuvity import Acuvity, Security
+
+
+@pytest.fixture
+def make_acuvity() -> Callable[..., Acuvity]:
+    """Returns a factory for SDK instances talking to mocked Apex transports"""
+    def _make_acuvity(
+        handler: Callable[[httpx.Request], httpx.Response] = echo_scan_handler,
+        async_handler: Optional[Callable] = async_echo_scan_handler,
+        **kwargs,
+    ) -> Acuvity:
+        kwargs.setdefault("security", Security(token="token"))
+        kwargs.setdefault("server_url", SERVER_URL)
+        return Acuvity(
+            client=httpx.Client(transport=httpx.MockTransport(handler)),
+            async_client=httpx.AsyncClient(transport=httpx.MockTransport(async_handler)),
+            retry_config=None,
+            **kwargs,
+        )
+
+    return _make_acuvity
+
+
+@pytest.fixture
+def acuvity_client(make_acuvity) -> Acuvity:
+    return make_acuvity()
@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+from acuvity import Acuvity, ConnectionConfig, Security
+from acuvity.emulator import ApexEmulator
+
+
+def test_client_settings():
+    config = ConnectionConfig(max_connections=200, max_keepalive_connections=50, keepalive_expiry=30.0, connect_timeout=1.0, read_timeout=20.0)
+
+    for client in (config.client(), config.async_client()):
+        pool = client._transport._pool # pylint: disable=protected-access
+        assert (pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry) == (200, 50, 30.0) # pylint: disable=protected-access
+        assert client.timeout == httpx.Timeout(connect=1.0, read=20.0, write=5.0, pool=5.0)
+
+
+def test_http2():
+    pytest.importorskip("h2")
+    pool = ConnectionConfig(http2=True).client()._transport._pool # pylint: disable=protected-access
+    assert pool._http2 # pylint: disable=protected-access
+
+
+def test_sdk_owns_configured_clients():
+    config = ConnectionConfig(read_timeout=20.0)
+    with Acuvity(security=Security(token="token"), server_url="https://apex.test", connection_config=config) as s:
+        client = s.sdk_configuration.client
+        async_client = s.sdk_configuration.async_client
+        assert client.timeout.read == async_client.timeout.read == 20.0
+        assert not s.sdk_configuration.client_supplied
+        assert not s.sdk_configuration.async_client_supplied
+    assert client.is_closed
+
+
+def test_supplied_clients_are_kept():
+    client = httpx.Client()
+    s = Acuvity(security=Security(token="token"), server_url="https://apex.test", client=client, connection_config=ConnectionConfig())
+    assert s.sdk_configuration.client is client
+    assert s.sdk_configuration.client_supplied
+
+
+def test_prewarm():
+    """The connections are opened with the SDK, and the first scan reuses one of them"""
+    with ApexEmulator() as apex:
+        s = Acuvity(
+            security=Security(token="token"),
+            server_url=apex.url,
+            retry_config=None,
+            connection_config=ConnectionConfig(prewarm=2),
+        )
+        assert apex.stats[("/", 404)] == 2
+        connections = len(apex._connections) # pylint: disable=protected-access
+        assert connections >= 1
+
+        s.apex.scan("hello")
+        assert len(apex._connections) == connections # pylint: disable=protected-access
+
+
+def test_prewarm_async():
+    async def run(url: str) -> None:
+        async with await Acuvity.create_async(
+            security=Security(token="token"),
+            server_url=url,
+            retry_config=None,
+            connection_config=ConnectionConfig(prewarm=3),
+        ) as s:
+            await s.apex.scan_async("hello")
+
+    with ApexEmulator() as apex:
+        asyncio.run(run(apex.url))
+        assert apex.stats[("/", 404)] == 3
+        assert apex.stats[("/_acuvity/scan", 200)] == 1
+
+
+def test_prewarm_failure_is_ignored():
+    messages = []
+
+    class ListLogger:
+        def debug(self, msg, *args, **kwargs):
+            messages.append(msg % args)
+
+    Acuvity(
+        security=Security(token="token"),
+        server_url="http://127.0.0.1:1",
+        debug_logger=ListLogger(),
+        connection_config=ConnectionConfig(prewarm=1, connect_timeout=0.5),
+    )
+    assert messages[0].startswith("Failed to prewarm a connection to http://127.0.0.1:1")
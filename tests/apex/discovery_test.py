@@ -0,0 +1,89 @@
+import time
+
+import httpx
+import jwt
+import pytest
+
+from acuvity import Acuvity, Security
+from acuvity.apexdiscovery import ApexDiscoveryCache, discover_apex
+
+ISSUER = "https://api.acuvity.test"
+
+
+def make_token(**claims) -> str:
+    return jwt.encode({"iss": ISSUER, **claims}, "test-secret-key-of-at-least-32-bytes", algorithm="HS256")
+
+
+def well_known_client(calls, scan_error=None) -> httpx.Client:
+    """Returns a client serving the well-known endpoint, optionally failing all other requests"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path == "/.well-known/acuvity/my-apex.json":
+            return httpx.Response(200, json={"url": "https://apex.acuvity.test", "portNoMTLS": 8443})
+        if scan_error is not None:
+            raise scan_error
+        return httpx.Response(404)
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_discovery_is_cached():
+    """A second discovery for the same token does not call the well-known endpoint"""
+    calls = []
+    cache = ApexDiscoveryCache()
+    token = make_token()
+    client = well_known_client(calls)
+
+    first = discover_apex(client, security=Security(token=token), cache=cache)
+    second = discover_apex(client, security=Security(token=token), cache=cache)
+
+    assert first == second == ("apex.acuvity.test", "8443")
+    assert len(calls) == 1
+
+    discover_apex(client, security=Security(token=make_token(sub="other")), cache=cache)
+    assert len(calls) == 2
+
+
+def test_discovery_cache_expiry():
+    """Entries expire after the TTL or with the token, whichever is first"""
+    cache = ApexDiscoveryCache(ttl=60)
+    cache.set("a", "apex.acuvity.test", "443", expires_at=time.time() - 1)
+    cache.set("b", "apex.acuvity.test", "443")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == ("apex.acuvity.test", "443")
+
+    with pytest.raises(ValueError):
+        ApexDiscoveryCache(ttl=0)
+
+
+def test_discovery_cache_on_disk(tmp_path):
+    """Entries persisted to disk are seen by other cache instances"""
+    path = str(tmp_path / "apex.json")
+    calls = []
+    token = make_token()
+
+    discover_apex(well_known_client(calls), security=Security(token=token), cache=ApexDiscoveryCache(path=path))
+    result = discover_apex(well_known_client(calls), security=Security(token=token), cache=ApexDiscoveryCache(path=path))
+
+    assert result == ("apex.acuvity.test", "8443")
+    assert len(calls) == 1
+    assert token not in (tmp_path / "apex.json").read_text()
+
+    (tmp_path / "apex.json").write_text("not json")
+    assert ApexDiscoveryCache(path=path).get(ApexDiscoveryCache.key(ISSUER, token)) is None
+
+
+def test_sdk_construction_uses_cache_and_invalidates_on_connection_failure():
+    """The SDK skips discovery when cached, and forgets the Apex once it can't be connected to"""
+    calls = []
+    cache = ApexDiscoveryCache()
+    token = make_token()
+    client = well_known_client(calls, scan_error=httpx.ConnectError("connection refused"))
+
+    Acuvity(security=Security(token=token), client=client, retry_config=None, apex_discovery_cache=cache)
+    sdk = Acuvity(security=Security(token=token), client=client, retry_config=None, apex_discovery_cache=cache)
+    assert len(calls) == 1
+
+    with pytest.raises(httpx.ConnectError):
+        sdk.apex.scan("hello")
+    assert cache.get(ApexDiscoveryCache.key(ISSUER, token)) is None
@@ -0,0 +1,122 @@
+import asyncio
+import base64
+import json
+
+import httpx
+import pytest
+
+from acuvity.fileupload import CHUNK_SIZE, MARKER_PREFIX, FileStreamingHook, StreamedBody, StreamedFile
+from acuvity.models import Extractionrequest, Scanrequest
+from acuvity.scancache import scan_request_key
+
+
+@pytest.fixture(name="large_file")
+def fixture_large_file(tmp_path):
+    path = tmp_path / "large.bin"
+    # not a multiple of the chunk size, nor of 3
+    path.write_bytes(bytes(range(256)) * (CHUNK_SIZE // 128 + 1) + b"tail")
+    return path
+
+
+class Recorder:
+    """Records the scan requests, and the files streamed into them"""
+
+    def __init__(self, monkeypatch):
+        self.bodies = []
+        self.streamed = []
+        iter_encoded, aiter_encoded = StreamedFile.iter_encoded, StreamedFile.aiter_encoded
+
+        def record_iter(streamed):
+            self.streamed.append(streamed.path)
+            return iter_encoded(streamed)
+
+        def record_aiter(streamed):
+            self.streamed.append(streamed.path)
+            return aiter_encoded(streamed)
+
+        monkeypatch.setattr(StreamedFile, "iter_encoded", record_iter)
+        monkeypatch.setattr(StreamedFile, "aiter_encoded", record_aiter)
+
+    def record(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        assert int(request.headers["Content-Length"]) == len(request.content)
+        self.bodies.append(body)
+        return httpx.Response(200, json={
+            "principal": {"type": "App"},
+            "extractions": [{"data": e["data"]} for e in body.get("extractions", [])] + [{"data": m} for m in body.get("messages", [])],
+        })
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        return self.record(request)
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return self.record(request)
+
+
+def test_streamed_files(make_acuvity, monkeypatch, large_file, tmp_path):
+    """Files over the threshold are streamed, with the same body as when read into memory"""
+    small_file = tmp_path / "small.txt"
+    small_file.write_text("small")
+    recorder = Recorder(monkeypatch)
+    s = make_acuvity(handler=recorder.handler, file_streaming_threshold=1024)
+
+    res = s.apex.scan("hello", files=[large_file, small_file])
+
+    expected = base64.b64encode(large_file.read_bytes()).decode()
+    assert recorder.bodies[0]["extractions"] == [{"data": expected}, {"data": base64.b64encode(b"small").decode()}]
+    assert recorder.bodies[0]["messages"] == ["hello"]
+    assert recorder.streamed == [str(large_file)]
+    assert res.scan_response.extractions[0].data == expected
+
+
+def test_small_files_are_not_streamed(make_acuvity, monkeypatch, tmp_path):
+    small_file = tmp_path / "small.txt"
+    small_file.write_text("small")
+    recorder = Recorder(monkeypatch)
+    s = make_acuvity(handler=recorder.handler, file_streaming_threshold=1024)
+
+    s.apex.scan(files=small_file)
+
+    assert not recorder.streamed
+
+
+def test_async_streamed_files(make_acuvity, monkeypatch, large_file):
+    recorder = Recorder(monkeypatch)
+    s = make_acuvity(async_handler=recorder.async_handler, file_streaming_threshold=0)
+
+    asyncio.run(s.apex.scan_async(files=large_file))
+
+    assert recorder.bodies[0]["extractions"] == [{"data": base64.b64encode(large_file.read_bytes()).decode()}]
+    assert recorder.streamed == [str(large_file)]
+
+
+def test_markers_in_messages(make_acuvity, monkeypatch, large_file):
+    """Only the markers of the files being streamed are replaced"""
+    recorder = Recorder(monkeypatch)
+    s = make_acuvity(handler=recorder.handler, file_streaming_threshold=0)
+    message = MARKER_PREFIX + "0" * 32
+
+    s.apex.scan(message, files=large_file)
+
+    assert recorder.bodies[0]["messages"] == [message]
+
+
+def test_streamed_body_can_be_retried(large_file):
+    body = StreamedBody([b'{"data":"', StreamedFile(large_file), b'"}'])
+
+    first, second = b"".join(body), b"".join(body)
+
+    assert first == second
+    assert len(body) == len(first)
+    assert json.loads(first)["data"] == base64.b64encode(large_file.read_bytes()).decode()
+
+
+def test_cache_key(large_file):
+    """Streamed files get the same scan cache key as files read into memory"""
+    hook = FileStreamingHook(0)
+    streamed = Scanrequest.model_construct(extractions=[Extractionrequest.model_construct(data=hook.file(large_file))])
+    eager = Scanrequest.model_construct(extractions=[Extractionrequest(data=base64.b64encode(large_file.read_bytes()).decode())])
+
+    assert scan_request_key(streamed) == scan_request_key(eager)
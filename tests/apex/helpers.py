@@ -0,0 +1,31 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+SERVER_URL = "https://apex.test"
+
+
+def echo_scan_handler(request: httpx.Request) -> httpx.Response:
+    """Echo every message back as an extraction, flagging the ones containing 'ignore'"""
+    body = json.loads(request.content)
+    messages = body.get("messages", [])
+    if "boom" in messages:
+        return httpx.Response(400, json={"code": 400, "title": "bad", "description": "boom"})
+    if "slow" in messages:
+        time.sleep(0.05)
+    return httpx.Response(200, json={
+        "principal": {"type": "App"},
+        "extractions": [
+            {"data": m, "exploits": {"prompt_injection": 1.0 if "ignore" in m else 0.0}}
+            for m in messages
+        ],
+    })
+
+
+async def async_echo_scan_handler(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    if "slow" in body.get("messages", []):
+        await asyncio.sleep(0.05)
+    return echo_scan_handler(httpx.Request(request.method, request.url, content=request.content))
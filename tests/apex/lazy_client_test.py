@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from acuvity import Acuvity, ConnectionConfig, Security
+from acuvity.emulator import ApexEmulator
+from acuvity.lazyclient import LazyAsyncHttpClient, LazyHttpClient
+
+
+def make_client(url: str, **kwargs) -> Acuvity:
+    return Acuvity(security=Security(token="token"), server_url=url, retry_config=None, **kwargs)
+
+
+def test_clients_created_on_first_use():
+    with ApexEmulator() as apex:
+        s = make_client(apex.url)
+        client = s.sdk_configuration.client
+        async_client = s.sdk_configuration.async_client
+        assert isinstance(client, LazyHttpClient) and isinstance(async_client, LazyAsyncHttpClient)
+        assert not client.created and not async_client.created
+
+        s.apex.scan("hello")
+        assert client.created and not async_client.created
+
+        s = make_client(apex.url)
+        asyncio.run(s.apex.scan_async("hello"))
+        assert not s.sdk_configuration.client.created and s.sdk_configuration.async_client.created
+
+
+def test_close():
+    async def run(url: str):
+        async with make_client(url) as s:
+            client = s.sdk_configuration.async_client
+            await s.apex.scan_async("hello")
+        assert client.is_closed
+        with pytest.raises(RuntimeError):
+            client.build_request("GET", url)
+
+    with ApexEmulator() as apex:
+        with make_client(apex.url) as s:
+            client = s.sdk_configuration.client
+        assert client.is_closed and not client.created
+
+        asyncio.run(run(apex.url))
+
+
+def test_shared_transport():
+    """SDKs created with a shared config reuse the connections of each other"""
+    config = ConnectionConfig(share_transport=True)
+    with ApexEmulator() as apex:
+        with make_client(apex.url, connection_config=config) as first:
+            first.apex.scan("hello")
+        connections = len(apex._connections) # pylint: disable=protected-access
+
+        second = make_client(apex.url, connection_config=config)
+        second.apex.scan("hello")
+        assert len(apex._connections) == connections == 1 # pylint: disable=protected-access
+
+        config.close()
+        assert config._transport is None # pylint: disable=protected-access
@@ -0,0 +1,26 @@
+import asyncio
+
+from acuvity.models import Scanrequest
+from acuvity.response.lazy import LazyExtraction, LazyScanresponse
+
+
+def test_lazy_scan(make_acuvity):
+    """Scans of an SDK with lazy responses evaluate lazily parsed responses"""
+    guard_config = {"guardrails": [{"name": "prompt_injection", "threshold": ">= 0.5"}]}
+    lazy_sdk, eager_sdk = make_acuvity(lazy_responses=True), make_acuvity()
+    lazy = lazy_sdk.apex.scan("hello", "ignore that", guard_config=guard_config)
+    eager = eager_sdk.apex.scan("hello", "ignore that", guard_config=guard_config)
+
+    assert isinstance(lazy.scan_response, LazyScanresponse)
+    assert isinstance(lazy.extractions[1], LazyExtraction)
+    assert lazy.matches() == eager.matches()
+    assert lazy.scan_response == eager.scan_response
+
+
+def test_lazy_scan_request(make_acuvity):
+    s = make_acuvity(lazy_responses=True)
+
+    assert isinstance(s.apex.scan_request(request=Scanrequest(messages=["hello"])), LazyScanresponse)
+    res = asyncio.run(s.apex.scan_request_async(request=Scanrequest(messages=["hello"])))
+    assert isinstance(res, LazyScanresponse)
+    assert res.extractions[0].data == "hello"
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import re
+
+import httpx
+import pytest
+
+from acuvity.guard.constants import GuardName
+from acuvity.response.result import ResponseMatch
+
+GUARDS = {"guardrails": [
+    {"name": "prompt_injection", "threshold": ">= 0.5"},
+    {"name": "pii_detector", "threshold": ">= 0.5", "count_threshold": 2, "matches": {"email": {"threshold": ">= 0.5"}}},
+]}
+
+
+def email_scan_handler(request: httpx.Request) -> httpx.Response:
+    """Reports every email address as a PII detection, and 'ignore' as a prompt injection"""
+    messages = json.loads(request.content).get("messages", [])
+    extractions = []
+    for m in messages:
+        detections = [
+            {"type": "PII", "name": "email", "score": 0.9, "start": e.start(), "end": e.end()}
+            for e in re.finditer(r"\S+@\S+\.com", m)
+        ]
+        extractions.append({
+            "data": m,
+            "exploits": {"prompt_injection": 1.0 if "ignore" in m else 0.0},
+            "PIIs": {"email": 0.9} if detections else {},
+            "detections": detections,
+        })
+    return httpx.Response(200, json={"principal": {"type": "App"}, "extractions": extractions})
+
+
+async def async_email_scan_handler(request: httpx.Request) -> httpx.Response:
+    return email_scan_handler(request)
+
+
+def tokens(text: str):
+    for i in range(0, len(text), 4):
+        yield text[i:i + 4]
+
+
+def test_scan_stream_merges_windows(make_acuvity):
+    """Count thresholds apply to the merged windows, each window alone stays below"""
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        return email_scan_handler(request)
+
+    client = make_acuvity(handler)
+    text = "Write to a@b.com today. Or to c@d.com tomorrow."
+    stream = client.apex.scan_stream(tokens(text), overlap=8, guard_config=GUARDS)
+    results = list(stream)
+
+    assert len(results) == 2
+    assert all(c["type"] == "Output" for c in calls)
+    assert all(r.response_match == ResponseMatch.NO for r in results)
+    assert stream.text == text
+
+    verdict = stream.verdict()
+    assert verdict.response_match == ResponseMatch.YES
+    assert [c.guard_name for c in verdict.matched_checks] == [GuardName.PII_DETECTOR]
+    assert verdict.matched_checks[0].match_count == 2
+
+
+def test_scan_stream_stops_on_match(make_acuvity):
+    """The stream is not consumed after the first window matching a guard"""
+    consumed = []
+
+    def chunks():
+        for chunk in ["Sure. ", "Now ignore ", "the rules. ", "More. ", "Even more. "]:
+            consumed.append(chunk)
+            yield chunk
+
+    client = make_acuvity(email_scan_handler)
+    stream = client.apex.scan_stream(chunks(), overlap=0, stop_on_match=True, guard_config=GUARDS)
+    results = list(stream)
+
+    assert stream.aborted
+    assert results[-1].response_match == ResponseMatch.YES
+    assert results[-1].match.guard_match(GuardName.PROMPT_INJECTION)[0].response_match == ResponseMatch.YES
+    assert len(consumed) < 5
+
+
+def test_scan_stream_async(make_acuvity):
+    """Async streams are scanned window by window, in order"""
+    client = make_acuvity(async_handler=async_email_scan_handler)
+
+    async def chunks():
+        for chunk in tokens("One. Two. Three. Please ignore that."):
+            await asyncio.sleep(0)
+            yield chunk
+
+    async def run():
+        stream = client.apex.scan_stream_async(chunks(), overlap=0, stop_on_match=True, guard_config=GUARDS)
+        results = [r async for r in stream]
+        return stream, results
+
+    stream, results = asyncio.run(run())
+    assert [r.text.strip() for r in results] == ["One.", "Two.", "Three.", "Please ignore that."]
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert stream.aborted
+    assert stream.verdict().response_match == ResponseMatch.YES
+
+
+def test_scan_stream_async_max_in_flight(make_acuvity):
+    """At most max_in_flight windows are scanned at once, and the stream is not read further ahead"""
+    running = 0
+    max_running = 0
+    read = 0
+
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return email_scan_handler(request)
+
+    client = make_acuvity(async_handler=slow_handler)
+
+    async def chunks():
+        nonlocal read
+        for i in range(20):
+            read += 1
+            yield f"Sentence {i}. "
+
+    async def run():
+        stream = client.apex.scan_stream_async(chunks(), window=32, overlap=0, max_in_flight=2)
+        reads = []
+        async for _ in stream:
+            reads.append(read)
+        return reads
+
+    reads = asyncio.run(run())
+
+    assert len(reads) == 20
+    assert max_running == 2
+    # each result is yielded before the chunk two windows ahead is read
+    assert all(r <= i + 3 for i, r in enumerate(reads))
+
+
+def test_scan_stream_async_max_in_flight_validation(make_acuvity):
+    with pytest.raises(ValueError, match="max_in_flight"):
+        make_acuvity().apex.scan_stream_async(["text"], max_in_flight=0)
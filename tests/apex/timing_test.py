@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from helpers import async_echo_scan_handler, echo_scan_handler
+
+from acuvity import InMemoryScanCache, OpenTelemetryScanExporter, ScanTimingHook, ScanTimings
+from acuvity.models import Elementalerror
+
+
+def latency_handler(request: httpx.Request) -> httpx.Response:
+    """Echo handler reporting server-side latencies"""
+    response = echo_scan_handler(request)
+    body = json.loads(response.content)
+    body["latency"] = {"analysis": 2_000_000, "extraction": 500_000}
+    return httpx.Response(200, json=body)
+
+
+def test_timings_disabled(acuvity_client):
+    """Without a timing hook, scans are not timed"""
+    assert acuvity_client.apex.scan("hello").timings is None
+
+
+def test_scan_timings(make_acuvity):
+    """Every phase of a scan is timed and exported, along with the server latencies"""
+    exported = []
+    s = make_acuvity(handler=latency_handler, scan_timing_hook=ScanTimingHook([exported.append]))
+
+    res = s.apex.scan("hello")
+
+    timings = res.timings
+    assert exported == [timings]
+    assert timings.attempts == 1
+    assert all(duration >= 0 for duration in timings.phases().values())
+    assert sum(timings.phases().values()) == pytest.approx(timings.total, abs=1e-3)
+    assert timings.server_phases() == {"analysis": 0.002, "extraction": 0.0005}
+
+
+def test_cached_scan_timings(make_acuvity):
+    """A scan served from the cache sends no request"""
+    s = make_acuvity(scan_cache=InMemoryScanCache(), scan_timing_hook=ScanTimingHook())
+
+    assert s.apex.scan("hello").timings.attempts == 1
+    cached = s.apex.scan("hello").timings
+    assert cached.attempts == 0
+    assert cached.serialize == cached.unmarshal == 0.0
+
+
+def test_failed_scans_are_not_exported(make_acuvity):
+    exported = []
+    s = make_acuvity(scan_timing_hook=ScanTimingHook([exported.append]))
+
+    with pytest.raises(Elementalerror):
+        s.apex.scan("boom")
+    assert not exported
+
+
+def test_async_scan_timings(make_acuvity):
+    """Concurrent async scans are timed separately"""
+    exported = []
+
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.02)
+        return await async_echo_scan_handler(request)
+
+    s = make_acuvity(async_handler=slow_handler, scan_timing_hook=ScanTimingHook([exported.append]))
+
+    async def run():
+        return await asyncio.gather(*(s.apex.scan_async(f"message {i}") for i in range(4)))
+
+    results = asyncio.run(run())
+
+    assert len(exported) == 4
+    for res in results:
+        assert res.timings.attempts == 1
+        assert res.timings.network >= 0.02
+
+
+class FakeSpan:
+    def __init__(self, name, start_time, attributes):
+        self.name = name
+        self.start_time = start_time
+        self.attributes = attributes
+        self.events = []
+        self.end_time = None
+
+    def add_event(self, name, timestamp):
+        self.events.append((name, timestamp))
+
+    def end(self, end_time):
+        self.end_time = end_time
+
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, start_time, attributes):
+        span = FakeSpan(name, start_time, attributes)
+        self.spans.append(span)
+        return span
+
+
+class FakeMeter:
+    def __init__(self):
+        self.records = []
+
+    def create_histogram(self, name, unit, description):
+        meter = self
+
+        class Histogram:
+            def record(self, value, attributes):
+                meter.records.append((name, value, attributes["phase"]))
+
+        return Histogram()
+
+
+def test_open_telemetry_exporter():
+    """Timings become a span with an event per phase, and histogram records"""
+    tracer, meter = FakeTracer(), FakeMeter()
+    exporter = OpenTelemetryScanExporter(tracer, meter)
+    timings = ScanTimings(started_at_ns=1_000_000_000, build=0.001, serialize=0.001, network=0.01, unmarshal=0.001, evaluate=0.001, total=0.014, attempts=1)
+
+    exporter(timings)
+
+    span = tracer.spans[0]
+    assert span.name == "acuvity.scan"
+    assert span.attributes["acuvity.scan.network"] == 0.01
+    assert [name for name, _ in span.events] == ["build", "serialize", "network", "unmarshal", "evaluate"]
+    assert span.events[2][1] == 1_012_000_000
+    assert span.end_time == 1_014_000_000
+    assert ("acuvity.scan.duration", 0.014, "total") in meter.records
+    assert len(meter.records) == 6
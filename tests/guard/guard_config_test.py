@@ -1,3 +1,5 @@
+import dataclasses
+import os
 import tempfile
 from pathlib import Path
 from textwrap import dedent
@@ -160,3 +162,56 @@ def test_guard_with_pii_types():
 }
     gc = GuardConfig(guard_config)
     assert len(gc.redaction_keys) == 1
+
+def test_init_with_guard_config():
+    """Test initialization with an already parsed GuardConfig"""
+    parsed = GuardConfig(SAMPLE_CONFIG)
+    config = GuardConfig(parsed)
+
+    assert config.guards == parsed.guards
+
+def test_guard_config_is_immutable():
+    """Test that changing the guards of a parsed config fails instead of being lost"""
+    config = GuardConfig(SAMPLE_CONFIG)
+    with pytest.raises(AttributeError):
+        config.guards.append(config.guards[0])
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.guards[0].threshold = None
+    config.keywords.append("bluefin")
+
+    assert len(config.guards) == 1
+    assert config.keywords == []
+
+def test_load_yaml_is_memoized(tmp_path):
+    """Test that load() only re-parses a YAML file when it changes"""
+    config_path = create_test_config(tmp_path, """
+        name: prompt_injection
+        threshold: "> 0.5"
+    """)
+
+    first = GuardConfig.load(config_path)
+    assert GuardConfig.load(str(config_path)) is first
+
+    config_path.write_text(dedent("""
+        name: toxic
+        threshold: "> 0.7"
+    """))
+    os.utime(config_path, ns=(0, 0))
+
+    reloaded = GuardConfig.load(config_path)
+    assert reloaded is not first
+    assert reloaded.guard_names == [GuardName.TOXIC]
+
+def test_load_dict_is_memoized():
+    """Test that load() reuses parsed configs for dictionaries with the same content"""
+    first = GuardConfig.load({"name": "prompt_injection", "threshold": "> 0.5"})
+
+    assert GuardConfig.load({"threshold": "> 0.5", "name": "prompt_injection"}) is first
+    assert GuardConfig.load({"name": "prompt_injection", "threshold": "> 0.6"}) is not first
+    assert GuardConfig.load(first) is first
+    assert GuardConfig.load() is GuardConfig.load(None)
+
+def test_load_missing_file():
+    """Test that load() reports missing files like the parser does"""
+    with pytest.raises(GuardConfigError):
+        GuardConfig.load("/does/not/exist.yaml")
@@ -0,0 +1,95 @@
+import pytest
+
+from acuvity.models.alertevent import Alertevent
+from acuvity.models.extraction import Extraction
+from acuvity.models.principal import Principal, PrincipalType
+from acuvity.models.scanresponse import Decision, Scanresponse
+from acuvity.models.textualdetection import Textualdetection, TextualdetectionType
+from acuvity.response.chunk import ChunkedScan, split_text
+
+
+def response(*extractions: Extraction, **kwargs) -> Scanresponse:
+    return Scanresponse(principal=Principal(type=PrincipalType.APP), extractions=list(extractions), **kwargs)
+
+
+def email(start: int, end: int, score: float = 0.9) -> Textualdetection:
+    return Textualdetection(type=TextualdetectionType.PII, name="email", start=start, end=end, score=score)
+
+
+def test_split_text():
+    """Test that chunks cover the text, end with sentences, and carry the overlap of the previous chunk"""
+    text = ("One sentence here. " * 20).strip()
+    chunks = split_text(text, 100, 10)
+
+    assert len(chunks) > 1
+    for offset, chunk in chunks:
+        assert text[offset:offset + len(chunk)] == chunk
+        assert len(chunk) <= 110
+    assert all(chunk.endswith(".") for _, chunk in chunks[:-1])
+    assert "".join(c[10:] if i else c for i, (_, c) in enumerate(chunks)) == text
+
+
+def test_only_oversized_messages_are_chunked():
+    plan = ChunkedScan(["short", "x" * 250], chunk_size=100, overlap=10)
+
+    assert plan.chunked
+    assert plan.base_messages == ["short"]
+    assert {index for index, _, _ in plan.chunks} == {1}
+    assert not ChunkedScan(["short"], chunk_size=100).chunked
+
+
+@pytest.mark.parametrize("chunk_size,overlap", [(0, 0), (10, 10), (10, -1)])
+def test_validation(chunk_size, overlap):
+    with pytest.raises(ValueError):
+        ChunkedScan(["text"], chunk_size, overlap)
+
+
+def test_merge():
+    """Test that files and whole messages keep their places and chunked messages are merged"""
+    message = "a" * 150
+    plan = ChunkedScan(["short", message], chunk_size=100, overlap=20)
+    assert [offset for _, offset, _ in plan.chunks] == [0, 80]
+
+    merged = plan.merge(
+        response(Extraction(data="file"), Extraction(data="short"), decision=Decision.ALLOW, reasons=["a"]),
+        [
+            response(Extraction(pi_is={"email": 0.5}, detections=[email(10, 20, 0.5)]), decision=Decision.ALLOW, reasons=["a"]),
+            response(
+                Extraction(pi_is={"email": 0.9}, exploits={"prompt_injection": 1.0}, detections=[email(5, 15)]),
+                decision=Decision.DENY,
+                reasons=["b"],
+                alerts=[Alertevent(alert_definition="injection", principal=Principal(type=PrincipalType.APP))],
+            ),
+        ],
+    )
+
+    assert [e.data for e in merged.extractions] == ["file", "short", message]
+    assert merged.extractions[2].pi_is == {"email": 0.9}
+    assert merged.extractions[2].exploits == {"prompt_injection": 1.0}
+    assert [(d.start, d.end) for d in merged.extractions[2].detections] == [(10, 20), (85, 95)]
+    assert merged.decision == Decision.DENY
+    assert merged.reasons == ["a", "b"]
+    assert len(merged.alerts) == 1
+
+
+def test_merge_drops_truncated_detections():
+    """Test that a detection cut by a chunk edge is dropped when the next chunk saw it whole"""
+    message = "a" * 150
+    plan = ChunkedScan([message], chunk_size=100, overlap=20)
+
+    merged = plan.merge(None, [
+        # cut at the end of the first chunk, at 100
+        response(Extraction(detections=[email(90, 100)])),
+        # whole in the second chunk, starting at 80: 90 to 105, and the same one seen twice
+        response(Extraction(detections=[email(10, 25), email(10, 25, 0.8)])),
+    ])
+
+    assert [(d.start, d.end) for d in merged.extractions[0].detections] == [(90, 105)]
+
+
+def test_merge_checks_responses():
+    plan = ChunkedScan(["a" * 150], chunk_size=100, overlap=20)
+    with pytest.raises(ValueError):
+        plan.merge(None, [response(Extraction())])
+    with pytest.raises(ValueError):
+        plan.merge(None, [response(Extraction()), response()])
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from acuvity.guard.threshold import Threshold
+from acuvity.models.extraction import Extraction
+from acuvity.models.textualdetection import Textualdetection, TextualdetectionType
+from acuvity.response.index import ExtractionIndex
+
+
+@pytest.fixture
+def extraction() -> Extraction:
+    """Create an extraction with many PII and secret detections"""
+    rng = random.Random(42)
+    detections = [
+        Textualdetection(
+            type=rng.choice([TextualdetectionType.PII, TextualdetectionType.SECRET]),
+            name=rng.choice(["email", "ssn", "person"]),
+            score=rng.choice([0.1, 0.5, 0.8, 0.9, 1.0]),
+        )
+        for _ in range(500)
+    ]
+    detections.append(Textualdetection(type=TextualdetectionType.PII, name="email"))
+    return Extraction(detections=detections, data="test")
+
+def test_scores_are_grouped_and_sorted(extraction):
+    """Test that scores are grouped by type and name and sorted"""
+    index = ExtractionIndex(extraction)
+    scores = index.scores(TextualdetectionType.PII, "email")
+
+    assert scores == sorted(scores)
+    assert len(scores) == len([
+        d for d in extraction.detections
+        if d.type == TextualdetectionType.PII and d.name == "email" and d.score is not None
+    ])
+    assert index.scores(TextualdetectionType.KEYWORD, "email") == []
+
+@pytest.mark.parametrize("threshold", [">= 0.8", "> 0.8", "== 0.9", "<= 0.5", "< 0.5", "> 1.0", "0.0"])
+def test_matching_agrees_with_linear_scan(extraction, threshold):
+    """Test that the binary search gives the same count and max as comparing every detection"""
+    threshold = Threshold(threshold)
+    index = ExtractionIndex(extraction)
+
+    for detection_type in (TextualdetectionType.PII, TextualdetectionType.SECRET):
+        for name in ("email", "ssn", "person"):
+            expected = [
+                d.score for d in extraction.detections
+                if d.type == detection_type and d.name == name and d.score is not None and threshold.compare(d.score)
+            ]
+            count, score = index.matching(detection_type, name, threshold)
+
+            assert count == len(expected)
+            assert score == (max(expected) if expected else 0.0)
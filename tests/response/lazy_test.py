@@ -0,0 +1,95 @@
+import copy
+import json
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from acuvity.guard.config import GuardConfig
+from acuvity.models import Decision, Scanresponse
+from acuvity.response.lazy import LazyExtraction, LazyScanresponse, lazy_scan_responses
+from acuvity.response.match import ScanResponseMatch
+from acuvity.utils.serializers import unmarshal_json
+
+RESPONSE = {
+    "principal": {"type": "App", "authType": "Token"},
+    "decision": "Deny",
+    "clientVersion": "1.0",
+    "latency": {"analysis": 5},
+    "extractions": [
+        {
+            "data": "my ssn is 123-45-6789",
+            "PIIs": {"ssn": 0.9},
+            "exploits": {"prompt_injection": 0.1},
+            "detections": [{"type": "PII", "name": "ssn", "start": 10, "end": 21, "score": 0.9}],
+            "dataSets": {"a": {"b": 1.0}},
+        },
+        {"data": "hello", "languages": {"english": 1.0}},
+    ],
+}
+
+
+def pending(model):
+    return set(model.__pydantic_private__["_pending"])
+
+
+def test_fields_are_validated_on_access():
+    res = LazyScanresponse.from_json(json.dumps(RESPONSE))
+
+    assert pending(res) == {"principal", "decision", "client_version", "latency", "extractions"}
+    assert res.decision == Decision.DENY
+    assert res.client_version == "1.0"
+    assert res.hash is None
+
+    extraction = res.extractions[0]
+    assert isinstance(extraction, LazyExtraction)
+    assert extraction.pi_is == {"ssn": 0.9}
+    assert pending(extraction) == {"data", "exploits", "detections", "data_sets"}
+    assert extraction.detections[0].start == 10
+    assert pending(res) == {"principal", "latency"}
+
+
+def test_behaves_like_eager_response():
+    raw = json.dumps(RESPONSE)
+    eager = Scanresponse.model_validate_json(raw)
+
+    assert LazyScanresponse.from_json(raw) == eager
+    assert eager == LazyScanresponse.from_json(raw)
+    assert LazyScanresponse.from_json(raw).model_dump() == eager.model_dump()
+    assert LazyScanresponse.from_json(raw).model_dump_json() == eager.model_dump_json()
+    assert repr(LazyScanresponse.from_json(raw)) == repr(eager).replace("Scanresponse(", "LazyScanresponse(", 1).replace("Extraction(", "LazyExtraction(")
+    assert copy.deepcopy(LazyScanresponse.from_json(raw)) == eager
+    assert pickle.loads(pickle.dumps(LazyScanresponse.from_json(raw))) == eager
+
+    copied = LazyScanresponse.from_json(raw).model_copy(update={"extractions": []})
+    assert copied.extractions == [] and copied.decision == Decision.DENY
+
+
+def test_validation_errors():
+    """Missing required fields fail at once, invalid fields on access"""
+    with pytest.raises(ValidationError):
+        LazyScanresponse.from_json(json.dumps({"decision": "Deny"}))
+
+    res = LazyScanresponse.from_json(json.dumps({**RESPONSE, "decision": "Maybe"}))
+    with pytest.raises(ValidationError):
+        _ = res.decision
+
+
+def test_guard_evaluation():
+    raw = json.dumps(RESPONSE)
+    gconfig = GuardConfig.load({"guardrails": [{"name": "pii_detector", "matches": {"ssn": {}}}]})
+
+    lazy = ScanResponseMatch(LazyScanresponse.from_json(raw), gconfig)
+    eager = ScanResponseMatch(Scanresponse.model_validate_json(raw), gconfig)
+
+    assert lazy.matches() == eager.matches()
+    assert lazy.decision == Decision.DENY
+    assert "data_sets" in pending(lazy.extractions[0])
+
+
+def test_lazy_scan_responses_context():
+    raw = json.dumps(RESPONSE)
+
+    with lazy_scan_responses():
+        assert isinstance(unmarshal_json(raw, Scanresponse), LazyScanresponse)
+    assert type(unmarshal_json(raw, Scanresponse)) is Scanresponse
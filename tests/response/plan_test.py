@@ -0,0 +1,88 @@
+import pytest
+
+from acuvity.guard.config import Guard, GuardConfig, Match
+from acuvity.guard.constants import GuardName
+from acuvity.guard.threshold import Threshold
+from acuvity.models.extraction import Extraction
+from acuvity.models.modality import Modality
+from acuvity.models.textualdetection import Textualdetection, TextualdetectionType
+from acuvity.response.helper import ResponseHelper
+from acuvity.response.index import ExtractionIndex
+from acuvity.response.plan import EvaluationPlan
+
+
+@pytest.fixture
+def extraction() -> Extraction:
+    """Create an extraction covering every guard type"""
+    return Extraction(
+        data="test",
+        exploits={"prompt_injection": 0.9, "jailbreak": 0.2},
+        malcontents={"toxic": 0.7},
+        languages={"english": 0.99},
+        modalities=[Modality(group="image", type="png")],
+        pi_is={"email": 0.8, "ssn": 0.95},
+        secrets={"aws_key": 1.0},
+        keywords={"bluefin": 1.0},
+        detections=[
+            Textualdetection(type=TextualdetectionType.PII, name="email", score=0.8),
+            Textualdetection(type=TextualdetectionType.PII, name="email", score=0.6),
+            Textualdetection(type=TextualdetectionType.PII, name="ssn", score=0.95),
+            Textualdetection(type=TextualdetectionType.SECRET, name="aws_key", score=1.0),
+            Textualdetection(type=TextualdetectionType.KEYWORD, name="bluefin", score=1.0),
+        ],
+    )
+
+@pytest.fixture
+def guard_config() -> GuardConfig:
+    """Create a guard config with plain and match based guards"""
+    return GuardConfig([
+        Guard(name=GuardName.PROMPT_INJECTION, threshold=Threshold(">= 0.5"), matches={}),
+        Guard(name=GuardName.JAILBREAK, threshold=Threshold("> 0.5"), matches={}),
+        Guard(name=GuardName.TOXIC, threshold=Threshold("< 0.8"), matches={}),
+        Guard(name=GuardName.LANGUAGE, threshold=Threshold(">= 0.9"), matches={"english": Match(threshold=Threshold(">= 0.9"))}),
+        Guard(name=GuardName.MODALITY, threshold=Threshold(">= 0.0"), matches={"image": Match(threshold=Threshold(">= 0.0"))}),
+        Guard(name=GuardName.PII_DETECTOR, threshold=Threshold(">= 0.7"), matches={
+            "email": Match(threshold=Threshold(">= 0.7")),
+            "ssn": Match(threshold=Threshold(">= 0.7")),
+        }, count_threshold=2),
+        Guard(name=GuardName.SECRETS_DETECTOR, threshold=Threshold(">= 0.5"), matches={}),
+        Guard(name=GuardName.KEYWORD_DETECTOR, threshold=Threshold("== 1.0"), matches={"bluefin": Match(threshold=Threshold("== 1.0"))}),
+    ])
+
+@pytest.mark.parametrize("threshold", [">= 0.5", "> 0.5", "== 0.5", "<= 0.5", "< 0.5"])
+def test_threshold_comparator_agrees_with_compare(threshold):
+    """Test that the pre-bound comparator gives the same result as compare()"""
+    threshold = Threshold(threshold)
+    comparator = threshold.comparator()
+
+    for value in (0.0, 0.25, 0.5, 0.75, 1.0):
+        assert comparator(value) == threshold.compare(value)
+
+def test_plan_is_compiled_once_per_config(guard_config):
+    """Test that the plan of a config is compiled once and reused"""
+    plan = EvaluationPlan.compile(guard_config)
+
+    assert EvaluationPlan.compile(guard_config) is plan
+    assert EvaluationPlan.compile(GuardConfig(guard_config)) is not plan
+    assert len(plan.guards) == len(guard_config.guards)
+
+def test_plan_agrees_with_helper(extraction, guard_config):
+    """Test that the compiled plan gives the same results as evaluating guard by guard"""
+    index = ExtractionIndex(extraction)
+    matches = EvaluationPlan.compile(guard_config).run(extraction)
+
+    for guard, plan, result in zip(guard_config.guards, EvaluationPlan.compile(guard_config).guards, matches.all_checks):
+        if not guard.matches:
+            assert result == ResponseHelper.evaluate(extraction, guard, index=index)
+        for match_name in guard.matches:
+            assert plan.evaluate(extraction, index, match_name) == ResponseHelper.evaluate(extraction, guard, match_name, index)
+
+    assert [m.guard_name for m in matches.matched_checks] == [
+        GuardName.PROMPT_INJECTION,
+        GuardName.TOXIC,
+        GuardName.LANGUAGE,
+        GuardName.MODALITY,
+        GuardName.PII_DETECTOR,
+        GuardName.SECRETS_DETECTOR,
+        GuardName.KEYWORD_DETECTOR,
+    ]
@@ -0,0 +1,64 @@
+import pytest
+
+from acuvity.models.extraction import Extraction
+from acuvity.models.modality import Modality
+from acuvity.models.textualdetection import Textualdetection, TextualdetectionType
+from acuvity.response.merge import merge_extractions
+from acuvity.response.stream import TextWindower
+
+
+def feed_all(windower: TextWindower, chunks):
+    windows = []
+    for chunk in chunks:
+        windows.extend(windower.feed(chunk))
+    return windows + windower.flush()
+
+def test_windows_at_sentence_boundaries():
+    """Test that windows end with sentences and carry the overlap of the previous window"""
+    text = "Hello there. How are you? Fine.\nBye"
+    windows = feed_all(TextWindower(window=100, overlap=4), [text[i:i + 3] for i in range(0, len(text), 3)])
+
+    assert [w for _, w in windows] == ["Hello there.", "ere. How are you?", "you? Fine.\n", "ne.\nBye"]
+    for offset, window in windows:
+        assert text[offset:offset + len(window)] == window
+
+def test_windows_without_sentences():
+    """Test that full windows are emitted when not splitting on sentences"""
+    text = "abcdefghij" * 5
+    windows = feed_all(TextWindower(window=20, overlap=5, sentences=False), [text])
+
+    assert [len(w) for _, w in windows] == [20, 25, 15]
+    assert "".join(w[5:] if i else w for i, (_, w) in enumerate(windows)) == text
+
+@pytest.mark.parametrize("window,overlap", [(0, 0), (10, 10), (10, -1)])
+def test_windower_validation(window, overlap):
+    """Test that invalid window sizes are rejected"""
+    with pytest.raises(ValueError):
+        TextWindower(window=window, overlap=overlap)
+
+def test_merge_extractions():
+    """Test that scores keep their maximum and overlapping detections are deduplicated"""
+    first = Extraction(
+        pi_is={"email": 0.8},
+        exploits={"prompt_injection": 0.1},
+        modalities=[Modality(group="text", type="txt")],
+        detections=[Textualdetection(type=TextualdetectionType.PII, name="email", start=10, end=20, score=0.8)],
+    )
+    second = Extraction(
+        pi_is={"email": 0.9, "ssn": 0.5},
+        modalities=[Modality(group="text", type="txt")],
+        detections=[
+            Textualdetection(type=TextualdetectionType.PII, name="email", start=0, end=10, score=0.9),
+            Textualdetection(type=TextualdetectionType.PII, name="ssn", start=15, end=20, score=0.5),
+        ],
+    )
+    merged = merge_extractions([(0, first), (10, second)], data="whole")
+
+    assert merged.data == "whole"
+    assert merged.pi_is == {"email": 0.9, "ssn": 0.5}
+    assert merged.exploits == {"prompt_injection": 0.1}
+    assert len(merged.modalities) == 1
+    assert [(d.name, d.start, d.end, d.score) for d in merged.detections] == [
+        ("email", 10, 20, 0.9),
+        ("ssn", 25, 30, 0.5),
+    ]
@@ -0,0 +1,90 @@
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = str(Path(__file__).parents[2] / "src")
+MODELS = Path(SRC) / "acuvity" / "models"
+
+# modules that importing the package alone must not load
+HEAVY_MODULES = ["httpx", "pydantic", "yaml", "jwt", "acuvity.sdk", "acuvity.apexextend", "acuvity.response", "acuvity.models.scanresponse"]
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run([sys.executable, *args, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+
+def test_import_is_lazy():
+    """Importing acuvity loads none of the SDK, models, or optional dependencies"""
+    res = run_python(f"import sys, acuvity; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    assert res.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize("name", [
+    "Acuvity",
+    "SDKConfiguration",
+    "HttpClient",
+    "GuardConfig",
+    "GuardName",
+    "Threshold",
+    "ScanResponseMatch",
+    "StreamScan",
+    "Scanresponse",
+    "Security",
+    "Elementalerror",
+    "InMemoryScanCache",
+    "ApexDiscoveryCache",
+    "AnalyzerCatalog",
+    "ScanCoalescer",
+    "ScanTimingHook",
+])
+def test_public_names(name):
+    """The names the package used to import eagerly are still exported"""
+    res = run_python(f"import acuvity; print(acuvity.{name}.__name__)")
+    assert res.stdout.strip() == name
+
+
+def test_acuvity_is_patched():
+    """Acuvity has its extended APIs whichever module it is imported from"""
+    res = run_python("from acuvity.sdk import Acuvity; print(hasattr(Acuvity, 'create_async'))")
+    assert res.stdout.strip() == "True"
+
+
+def test_unknown_name():
+    import acuvity
+
+    with pytest.raises(AttributeError):
+        acuvity.NotAThing # pylint: disable=pointless-statement
+    with pytest.raises(AttributeError):
+        acuvity._private # pylint: disable=pointless-statement
+
+
+def model_names():
+    """The public classes and type aliases of the model modules, by name"""
+    names = {}
+    for path in sorted(MODELS.glob("*.py")):
+        if path.name == "__init__.py":
+            continue
+        for node in ast.parse(path.read_text(encoding="utf-8")).body:
+            if isinstance(node, ast.ClassDef):
+                targets = [node.name]
+            elif isinstance(node, ast.Assign):
+                targets = [t.id for t in node.targets if isinstance(t, ast.Name)]
+            elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+                targets = [node.target.id]
+            else:
+                continue
+            names.update({name: f".{path.stem}" for name in targets if not name.startswith("_")})
+    return names
+
+
+def test_lazy_models_table():
+    """acuvity.models, which is not regenerated, exports every model of the model modules"""
+    from acuvity import models
+
+    assert models._dynamic_imports == model_names() # pylint: disable=protected-access
+    assert sorted(models.__all__) == sorted(model_names())
@@ -0,0 +1,74 @@
+import logging
+
+import httpx
+import pytest
+
+from acuvity import Security, basesdk
+from acuvity.sdk import Acuvity
+from acuvity.utils.logger import NoOpLogger, get_body_content, get_response_content, is_debug_enabled
+
+SCAN_RESPONSE = {"principal": {"type": "App"}, "extractions": [{"data": "x" * 1000}]}
+
+
+def make_client(**kwargs) -> Acuvity:
+    return Acuvity(
+        security=Security(token="token"),
+        server_url="https://apex.test",
+        client=httpx.Client(transport=httpx.MockTransport(lambda _: httpx.Response(200, json=SCAN_RESPONSE))),
+        retry_config=None,
+        **kwargs,
+    )
+
+
+class ListLogger:
+    def __init__(self):
+        self.messages = []
+
+    def debug(self, msg, *args, **kwargs):
+        self.messages.append(msg % args if args else msg)
+
+
+def test_is_debug_enabled():
+    logger = logging.getLogger("acuvity.test.enabled")
+    logger.setLevel(logging.INFO)
+    assert not is_debug_enabled(logger)
+    logger.setLevel(logging.DEBUG)
+    assert is_debug_enabled(logger)
+    assert not is_debug_enabled(NoOpLogger())
+    assert is_debug_enabled(ListLogger())
+
+
+def test_truncated_bodies():
+    req = httpx.Request("POST", "https://apex.test", content=b"a" * 100)
+    res = httpx.Response(200, content="é" * 50)
+
+    assert get_body_content(req, 10) == "b'aaaaaaaaaa'... (90 more bytes)"
+    assert get_body_content(req) == str(b"a" * 100)
+    assert get_response_content(res, 10) == "ééééé... (90 more bytes)"
+    assert get_response_content(res, 1000) == "é" * 50
+
+
+def test_no_log_arguments_without_debug(monkeypatch):
+    """Bodies are not read for logging when debug messages go nowhere"""
+    def fail(*_, **__):
+        pytest.fail("body read for logging")
+
+    monkeypatch.setattr(basesdk, "get_body_content", fail)
+    monkeypatch.setattr(basesdk, "get_response_content", fail)
+    logger = logging.getLogger("acuvity.test.disabled")
+    logger.setLevel(logging.INFO)
+
+    for s in (make_client(), make_client(debug_logger=logger)):
+        s.apex.scan("hello", guard_config=[])
+
+
+def test_debug_body_limit():
+    logger = ListLogger()
+    s = make_client(debug_logger=logger, debug_body_limit=200)
+
+    s.apex.scan("hello", guard_config=[])
+
+    request, response = [m for m in logger.messages if m.startswith(("Request:", "Response:"))]
+    assert "more bytes)" not in request
+    assert response.endswith("more bytes)")
+    assert len(response.rsplit("Body: ", 1)[1]) < 250
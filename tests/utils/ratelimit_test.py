@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from acuvity import AdaptiveRateLimiter, Security
+from acuvity.sdk import Acuvity
+from acuvity.utils.retries import BackoffStrategy, RetryConfig
+
+
+def test_unlimited_until_backpressure():
+    limiter = AdaptiveRateLimiter()
+    start = time.perf_counter()
+    for _ in range(100):
+        limiter.acquire()
+        limiter.record_response(httpx.Response(200))
+
+    assert time.perf_counter() - start < 0.05
+    assert limiter.stats().rate is None
+
+
+def test_backpressure_decreases_rate():
+    """The rate is halved on backpressure, once per second, and grows back with successes"""
+    limiter = AdaptiveRateLimiter(decrease=0.5, increase=1.0, min_rate=1.0)
+    for _ in range(20):
+        limiter.acquire()
+
+    limiter.record_response(httpx.Response(429))
+    limiter.record_response(httpx.Response(503))
+    assert limiter.stats().rate == 10.0
+
+    limiter.record_response(httpx.Response(200))
+    limiter.record_response(httpx.Response(400))
+    stats = limiter.stats()
+    assert (stats.rate, stats.throttled) == (11.0, 2)
+
+
+def test_rate_is_enforced():
+    limiter = AdaptiveRateLimiter(min_rate=50.0)
+    limiter.record_response(httpx.Response(429))
+
+    start = time.perf_counter()
+    for _ in range(6):
+        limiter.acquire()
+
+    assert time.perf_counter() - start >= 0.09
+    assert limiter.stats().delayed >= 5
+
+
+def test_retry_after_pauses_requests():
+    limiter = AdaptiveRateLimiter(min_rate=1000.0)
+    limiter.record_response(httpx.Response(503, headers={"Retry-After": "0.05"}))
+
+    async def run():
+        start = time.perf_counter()
+        await limiter.acquire_async()
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) >= 0.04
+
+
+def test_recovery():
+    limiter = AdaptiveRateLimiter(recovery_time=0.01)
+    limiter.record_response(httpx.Response(429))
+    time.sleep(0.02)
+    limiter.record_response(httpx.Response(200))
+
+    assert limiter.stats().rate is None
+
+
+def test_sdk_rate_limiter():
+    """The limiter of the SDK sees every attempt, and delays the retries of rate limited scans"""
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "0.05"}),
+        httpx.Response(200, json={"principal": {"type": "App"}, "extractions": [{"data": "hello"}]}),
+    ])
+    times = []
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        times.append(time.perf_counter())
+        return next(responses)
+
+    limiter = AdaptiveRateLimiter()
+    s = Acuvity(
+        security=Security(token="token"),
+        server_url="https://apex.test",
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry_config=RetryConfig("backoff", BackoffStrategy(1, 1, 1.0, 10_000), False),
+        rate_limiter=limiter,
+    )
+
+    res = s.apex.scan("hello", guard_config=[])
+
+    assert res.scan_response.extractions[0].data == "hello"
+    assert times[1] - times[0] == pytest.approx(0.05, abs=0.04)
+    assert limiter.stats().throttled == 1
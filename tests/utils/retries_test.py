@@ -0,0 +1,275 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from acuvity import Acuvity, Security
+from acuvity.models import APIError
+from acuvity.utils import retries as retries_module
+from acuvity.utils.retries import (
+    BackoffStrategy,
+    CircuitBreaker,
+    CircuitOpenError,
+    Retries,
+    RetryBudget,
+    RetryConfig,
+    get_retry_after,
+    retry,
+    retry_async,
+)
+
+RETRY_CONFIG = RetryConfig("backoff", BackoffStrategy(1, 1, 1.0, 60_000), True)
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(retries_module.random, "uniform", lambda a, b: 0.0)
+
+
+class Server:
+    """Answers with the given status codes in turn, then with the last one"""
+
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self) -> httpx.Response:
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        return httpx.Response(status)
+
+    async def call_async(self) -> httpx.Response:
+        return self()
+
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+    stats = breaker.stats()
+    assert (stats.opened, stats.rejected) == (2, 2)
+
+
+def test_successes_reset_failures():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_retry_opens_circuit():
+    """Retries stop as soon as the circuit opens, and later requests fail fast"""
+    breaker = CircuitBreaker(failure_threshold=3, recovery_time=60)
+    server = Server(503)
+
+    with pytest.raises(CircuitOpenError):
+        retry(server, Retries(RETRY_CONFIG, ["503"], circuit_breaker=breaker))
+    assert server.calls == 3
+
+    with pytest.raises(CircuitOpenError):
+        retry(server, Retries(RETRY_CONFIG, ["503"], circuit_breaker=breaker))
+    assert server.calls == 3
+
+
+def test_non_retryable_statuses_are_successes():
+    breaker = CircuitBreaker(failure_threshold=1)
+    res = retry(Server(400), Retries(RETRY_CONFIG, ["503"], circuit_breaker=breaker))
+    assert res.status_code == 400
+    assert breaker.state == "closed"
+
+
+def test_probe_outcomes():
+    """A probe ending with a transport error reopens the circuit, one ending with another error is given back"""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    def protocol_error() -> httpx.Response:
+        raise httpx.RemoteProtocolError("server disconnected")
+
+    with pytest.raises(httpx.RemoteProtocolError):
+        retry(protocol_error, Retries(RETRY_CONFIG, ["503"], circuit_breaker=breaker))
+    assert breaker.state == "open"
+
+    time.sleep(0.02)
+
+    def hook_error() -> httpx.Response:
+        raise ValueError("hook failed")
+
+    with pytest.raises(ValueError):
+        retry(hook_error, Retries(RETRY_CONFIG, ["503"], circuit_breaker=breaker))
+    assert breaker.state == "half_open"
+
+    async def cancelled() -> httpx.Response:
+        raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(retry_async(cancelled, Retries(RETRY_CONFIG, ["503"], circuit_breaker=breaker)))
+    assert breaker.state == "half_open"
+
+    assert retry(Server(200), Retries(RETRY_CONFIG, ["503"], circuit_breaker=breaker)).status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_without_retries():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=60)
+    server = Server(503)
+    no_retries = RetryConfig("none", BackoffStrategy(1, 1, 1.0, 60_000), True)
+
+    assert retry(server, Retries(no_retries, ["503"], circuit_breaker=breaker)).status_code == 503
+    with pytest.raises(CircuitOpenError):
+        retry(server, Retries(no_retries, ["503"], circuit_breaker=breaker))
+    assert server.calls == 1
+
+
+def test_retry_budget():
+    """Retries beyond the budget are denied, returning the last response"""
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0.0, max_tokens=2)
+    server = Server(503)
+
+    res = retry(server, Retries(RETRY_CONFIG, ["503"], retry_budget=budget))
+
+    assert res.status_code == 503
+    assert server.calls == 3  # the first attempt, and two retries
+    stats = budget.stats()
+    assert (stats.requests, stats.retries, stats.denied) == (1, 2, 1)
+
+    # each request earns half a retry
+    server = Server(503, 200)
+    assert retry(server, Retries(RETRY_CONFIG, ["503"], retry_budget=budget)).status_code == 503
+    assert retry(server, Retries(RETRY_CONFIG, ["503"], retry_budget=budget)).status_code == 200
+
+
+def test_retry_budget_refills():
+    budget = RetryBudget(ratio=0.0, min_retries_per_second=100.0, max_tokens=1)
+    assert budget.try_retry()
+    assert not budget.try_retry()
+    time.sleep(0.02)
+    assert budget.try_retry()
+
+
+def test_retry_async():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=60)
+    budget = RetryBudget()
+    server = Server(503, 200)
+
+    res = asyncio.run(retry_async(server.call_async, Retries(RETRY_CONFIG, ["503"], breaker, budget)))
+
+    assert res.status_code == 200
+    assert breaker.state == "closed"
+    assert budget.stats().retries == 1
+
+
+def test_sdk_circuit_breaker():
+    """The circuit breaker of the SDK is shared by all its requests"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503, json={"code": 503})
+
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=60)
+    s = Acuvity(
+        security=Security(token="token"),
+        server_url="https://apex.test",
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry_config=RETRY_CONFIG,
+        circuit_breaker=breaker,
+        retry_budget=RetryBudget(),
+    )
+
+    with pytest.raises(CircuitOpenError):
+        s.apex.scan("hello")
+    with pytest.raises(CircuitOpenError):
+        s.apex.list_analyzers()
+    assert len(calls) == 2
+    assert s.sdk_configuration.retry_budget.stats().requests == 2
+
+    # closed again: sent, and retried until the circuit opens
+    breaker.record_success()
+    with pytest.raises(CircuitOpenError):
+        s.apex.scan("hello")
+    assert len(calls) == 4
+
+
+def test_sdk_circuit_breaker_without_retry_config():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503, json={"code": 503})
+
+    s = Acuvity(
+        security=Security(token="token"),
+        server_url="https://apex.test",
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry_config=None,
+        circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_time=60),
+    )
+
+    for _ in range(2):
+        with pytest.raises(APIError):
+            s.apex.list_analyzers()
+    with pytest.raises(CircuitOpenError):
+        s.apex.list_analyzers()
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("headers,expected", [
+    ({"Retry-After": "2"}, 2.0),
+    ({"Retry-After": "-1"}, 0.0),
+    ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),
+    ({"Retry-After": "soon"}, None),
+    ({"RateLimit-Remaining": "0", "RateLimit-Reset": "3"}, 3.0),
+    ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1.5"}, 1.5),
+    ({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "3"}, None),
+    ({}, None),
+])
+def test_get_retry_after(headers, expected):
+    assert get_retry_after(httpx.Response(429, headers=headers)) == expected
+
+
+def test_retry_after_is_honored(monkeypatch):
+    """The delay asked by the server replaces the backoff, even past max_interval"""
+    sleeps = []
+    monkeypatch.setattr(retries_module.time, "sleep", sleeps.append)
+    server = Server(429, 503, 200)
+    server_headers = iter([{"Retry-After": "3"}, {}, {}])
+
+    def call():
+        res = server()
+        return httpx.Response(res.status_code, headers=next(server_headers))
+
+    res = retry(call, Retries(RETRY_CONFIG, ["429", "503"]))
+
+    assert res.status_code == 200
+    assert sleeps == [3.0, 0.001]
+
+
+def test_retry_after_past_deadline(monkeypatch):
+    """A request isn't retried if the server asks to wait past max_elapsed_time"""
+    monkeypatch.setattr(retries_module.time, "sleep", pytest.fail)
+    config = RetryConfig("backoff", BackoffStrategy(1, 1, 1.0, 1000), True)
+
+    res = retry(lambda: httpx.Response(429, headers={"Retry-After": "5"}), Retries(config, ["429"]))
+
+    assert res.status_code == 429
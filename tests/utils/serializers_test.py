@@ -0,0 +1,52 @@
+import json
+from typing import List, Optional
+
+from acuvity import models
+from acuvity.utils.serializers import get_type_adapter, marshal_json, unmarshal, unmarshal_json
+
+SCAN_RESPONSE = {
+    "ID": "abc",
+    "principal": {"type": "App"},
+    "extractions": [
+        {
+            "data": "hello",
+            "PIIs": {"email": 0.9},
+            "detections": [{"type": "PII", "name": "email", "score": 0.9}],
+        }
+    ],
+}
+
+def test_type_adapter_is_cached():
+    """The same target type must always resolve to the same compiled adapter"""
+    assert get_type_adapter(models.Scanresponse) is get_type_adapter(models.Scanresponse)
+    assert get_type_adapter(List[models.Analyzer]) is get_type_adapter(List[models.Analyzer])
+
+def test_unmarshal_json_from_str_and_bytes():
+    """unmarshal_json validates straight from str or bytes"""
+    raw = json.dumps(SCAN_RESPONSE)
+    for payload in (raw, raw.encode("utf-8")):
+        resp = unmarshal_json(payload, models.Scanresponse)
+        assert isinstance(resp, models.Scanresponse)
+        assert resp.id == "abc"
+        assert resp.extractions[0].pi_is == {"email": 0.9}
+        assert resp.extractions[0].detections[0].type == models.TextualdetectionType.PII
+
+def test_unmarshal_list():
+    """unmarshal handles container types"""
+    analyzers = unmarshal([{"ID": "1", "name": "a"}, {"ID": "2", "name": "b"}], List[models.Analyzer])
+    assert [a.name for a in analyzers] == ["a", "b"]
+
+def test_marshal_json_by_alias_without_none():
+    """marshal_json serializes by alias and drops unset fields"""
+    request = models.Scanrequest(messages=["hi"], type=models.Type.INPUT, bypass_hash="h")
+    body = json.loads(marshal_json(request, Optional[models.Scanrequest]))
+    assert body == {"anonymization": "FixedSize", "bypassHash": "h", "messages": ["hi"], "type": "Input"}
+
+def test_marshal_json_from_typed_dict():
+    """marshal_json validates dictionaries into the target model first"""
+    body = json.loads(marshal_json({"messages": ["hi"]}, Optional[models.Scanrequest]))
+    assert body["messages"] == ["hi"]
+
+def test_marshal_json_none():
+    """A missing optional body serializes to an empty string"""
+    assert marshal_json(None, Optional[models.Scanrequest]) == ""